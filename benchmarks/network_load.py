@@ -0,0 +1,95 @@
+"""
+Network Ingest Load Generator
+
+Replays the rows of a CSV (header skipped) to a running NetworkInputProducer
+over TCP and/or UDP, as fast as possible or at a target rate, and prints the
+achieved send rate. Start the pipeline with pipeline_dynamics.network
+enabled first; the producer logs its own packets/s and UDP drops, so both
+sides can be compared.
+
+Usage:
+    python benchmarks/network_load.py --tcp-port 9000 --connections 8 --lines 200000
+    python benchmarks/network_load.py --udp-port 9001 --lines 100000 --rate 20000
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_lines(dataset: Path) -> list:
+    with open(dataset, "rb") as f:
+        lines = f.read().splitlines()[1:]
+    return [line + b"\n" for line in lines if line.strip()]
+
+
+async def tcp_client(host: str, port: int, lines: list, count: int, rate: float, batch: int) -> None:
+    _, writer = await asyncio.open_connection(host, port)
+    start = time.monotonic()
+    for sent in range(0, count, batch):
+        n = min(batch, count - sent)
+        writer.write(b"".join(lines[(sent + i) % len(lines)] for i in range(n)))
+        await writer.drain()  # blocks while the producer applies backpressure
+        if rate:
+            delay = start + (sent + n) / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_tcp(args, lines: list) -> None:
+    per_client = args.lines // args.connections
+    rate = args.rate / args.connections if args.rate else 0
+    await asyncio.gather(*(tcp_client(args.host, args.tcp_port, lines, per_client, rate, args.batch)
+                           for _ in range(args.connections)))
+
+
+def run_udp(args, lines: list) -> None:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.monotonic()
+    for sent in range(0, args.lines, args.batch):
+        n = min(args.batch, args.lines - sent)
+        sock.sendto(b"".join(lines[(sent + i) % len(lines)] for i in range(n)), (args.host, args.udp_port))
+        if args.rate:
+            delay = start + (sent + n) / args.rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    sock.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--tcp-port", type=int)
+    parser.add_argument("--udp-port", type=int)
+    parser.add_argument("--dataset", type=Path, default=REPO_ROOT / "data" / "sample_sensor_data.csv")
+    parser.add_argument("--lines", type=int, default=100000, help="Total lines to send (per protocol)")
+    parser.add_argument("--connections", type=int, default=4, help="Concurrent TCP connections")
+    parser.add_argument("--rate", type=float, default=0, help="Target lines/sec (0 = as fast as possible)")
+    parser.add_argument("--batch", type=int, default=16, help="Lines per write / datagram")
+    args = parser.parse_args()
+    if args.tcp_port is None and args.udp_port is None:
+        parser.error("give --tcp-port and/or --udp-port")
+
+    lines = load_lines(args.dataset)
+    for name, port in (("tcp", args.tcp_port), ("udp", args.udp_port)):
+        if port is None:
+            continue
+        start = time.monotonic()
+        if name == "tcp":
+            asyncio.run(run_tcp(args, lines))
+            sent = args.lines // args.connections * args.connections
+        else:
+            run_udp(args, lines)
+            sent = args.lines
+        elapsed = time.monotonic() - start
+        print(f"{name}: sent {sent} lines in {elapsed:.2f}s ({sent / elapsed:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main()
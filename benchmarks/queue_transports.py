@@ -0,0 +1,105 @@
+"""
+Queue Transport Benchmark
+
+Measures throughput (messages/sec) and delivery latency (p50/p99) of every
+queue transport in core/transport.py for a range of payload sizes, using one
+producer process and one consumer (this process) - the same shape as each
+hop of the pipeline.
+
+Each message is a packet-like dict whose security_hash field is padded to
+the requested payload size and which carries its send time, so latency is
+measured end to end (put -> get) on the shared monotonic clock. The
+producer runs flat out, so latency includes time spent waiting in a full
+queue - the same thing a saturated pipeline stage sees.
+
+Usage:
+    python benchmarks/queue_transports.py
+    python benchmarks/queue_transports.py --messages 20000 --payload-sizes 64 1024 16384
+    python benchmarks/queue_transports.py --transports pipe shared_memory --batch-size 32
+"""
+
+import argparse
+import multiprocessing as mp
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.transport import QueueFactory, TRANSPORTS, resolve_transport
+
+
+def make_packet(payload_size: int) -> dict:
+    return {
+        "entity_name": "Sensor_Alpha",
+        "time_period": 1773037623,
+        "metric_value": 24.99,
+        "security_hash": "f" * payload_size,
+        "_id": 0,
+    }
+
+
+def produce(q, messages: int, payload_size: int, batch_size: int) -> None:
+    packet = make_packet(payload_size)
+    sent = 0
+    while sent < messages:
+        n = min(batch_size, messages - sent)
+        stamp = time.perf_counter()
+        if batch_size > 1:
+            q.put([dict(packet, _id=sent + i, sent_at=stamp) for i in range(n)])
+        else:
+            q.put(dict(packet, _id=sent, sent_at=stamp))
+        sent += n
+    q.put(None)
+
+
+def run_case(transport: str, messages: int, payload_size: int, queue_size: int, batch_size: int) -> dict:
+    factory = QueueFactory(transport, shm_slot_bytes=max(65536, 2 * payload_size * batch_size + 4096))
+    q = factory.create(queue_size)
+    producer = mp.Process(target=produce, args=(q, messages, payload_size, batch_size))
+
+    latencies = []
+    start = time.perf_counter()
+    producer.start()
+    while True:
+        item = q.get()
+        now = time.perf_counter()
+        if item is None:
+            break
+        for packet in (item if isinstance(item, list) else [item]):
+            latencies.append(now - packet["sent_at"])
+    elapsed = time.perf_counter() - start
+    producer.join()
+    factory.close()
+
+    latencies.sort()
+    return {
+        "rate": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1e6,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1e6,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare pipeline queue transports")
+    parser.add_argument("--transports", nargs="+", default=list(TRANSPORTS), choices=list(TRANSPORTS))
+    parser.add_argument("--payload-sizes", nargs="+", type=int, default=[64, 1024, 16384])
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--queue-size", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=1, help="packets per queue message")
+    args = parser.parse_args()
+
+    print(f"start method: {mp.get_start_method()}, auto -> {resolve_transport('auto')}")
+    print(f"{'transport':>14} {'payload':>8} {'msgs/sec':>12} {'p50 us':>10} {'p99 us':>10}")
+    print("-" * 58)
+    for payload_size in args.payload_sizes:
+        for transport in args.transports:
+            result = run_case(transport, args.messages, payload_size, args.queue_size, args.batch_size)
+            print(f"{transport:>14} {payload_size:>8} {result['rate']:>12.0f} "
+                  f"{result['p50']:>10.1f} {result['p99']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Signature Algorithm Cost Benchmark
+
+Measures what each algorithm in core/signatures.py costs per packet and the
+verification throughput the core stage can reach with it on this machine.
+
+For every algorithm the benchmark verifies --packets distinct metric values
+(signed beforehand, so no cache can help) in this process to get the
+per-packet cost, then runs the same work on --workers processes at once -
+the shape of the core stage with core_parallelism workers - to get the
+throughput ceiling the pipeline would hit if verification were the only
+cost. Parameters come from config.json (processing.stateless_tasks) and can
+be overridden on the command line.
+
+Usage:
+    python benchmarks/signature_cost.py
+    python benchmarks/signature_cost.py --algorithms pbkdf2_hmac scrypt --workers 4
+    python benchmarks/signature_cost.py --iterations 10000 --scrypt-n 4096
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.signatures import ALGORITHMS, resolve_signer
+
+
+def make_values(packets: int, offset: int = 0) -> list:
+    return [f"{20 + (offset + i) * 0.001:.3f}" for i in range(packets)]
+
+
+def sign_all(stateless_config: dict, values: list) -> list:
+    signer = resolve_signer(stateless_config)
+    return [(value, signer.sign(value)) for value in values]
+
+
+def verify_all(stateless_config: dict, signed: list) -> float:
+    signer = resolve_signer(stateless_config)
+    start = time.perf_counter()
+    for value, hash_val in signed:
+        if not signer.verify(hash_val, value):
+            raise RuntimeError(f"{signer.name}: signature of {value} did not verify")
+    return time.perf_counter() - start
+
+
+def run_algorithm(stateless_config: dict, packets: int, workers: int) -> dict:
+    signed = sign_all(stateless_config, make_values(packets * workers))
+    cost = verify_all(stateless_config, signed[:packets]) / packets
+
+    with mp.Pool(workers) as pool:
+        chunks = [(stateless_config, signed[w * packets:(w + 1) * packets]) for w in range(workers)]
+        start = time.perf_counter()
+        pool.starmap(verify_all, chunks)
+        wall = time.perf_counter() - start
+
+    return {
+        "cost_us": cost * 1e6,
+        "single_rate": 1 / cost,
+        "parallel_rate": packets * workers / wall,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare signature algorithm costs")
+    parser.add_argument("--config", default=str(Path(__file__).resolve().parent.parent / "config.json"))
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument("--packets", type=int, default=200, help="packets verified per process")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel verifier processes")
+    parser.add_argument("--iterations", type=int, help="PBKDF2 iterations (default: from config)")
+    parser.add_argument("--scrypt-n", type=int, help="scrypt cost factor n (default: from config or 16384)")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        base = json.load(f)["processing"]["stateless_tasks"]
+    params = dict(base.get("algorithm_params", {}))
+    if args.iterations:
+        params["iterations"] = args.iterations
+    if args.scrypt_n:
+        params["n"] = args.scrypt_n
+
+    print(f"workers: {args.workers}, packets per worker: {args.packets}")
+    print(f"{'algorithm':>12} {'us/packet':>12} {'1 proc/sec':>12} {f'{args.workers} procs/sec':>14}")
+    print("-" * 54)
+    for algorithm in args.algorithms:
+        stateless_config = dict(base, algorithm=algorithm, algorithm_params=params)
+        # Cheap MACs need far more packets than PBKDF2 for a stable timing
+        packets = args.packets if algorithm in ("pbkdf2_hmac", "scrypt") else args.packets * 500
+        result = run_algorithm(stateless_config, packets, args.workers)
+        print(f"{algorithm:>12} {result['cost_us']:>12.1f} {result['single_rate']:>12.0f} "
+              f"{result['parallel_rate']:>14.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
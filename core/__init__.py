@@ -1,6 +1,18 @@
-from .core_logic import CoreLogic, Agregator
+from .core_logic import CoreLogic, Agregator, STATEFUL_OPERATIONS, UNORDERED_OPERATIONS, needs_ordering
+from .reorder import ReorderRing, ReorderStats
+from .window_stats import WindowStats, SlidingWindow
+from .event_windows import EventTimeWindows, EventWindowStats
+from .dealing import BlockDealer, ChannelMerge, block_owner
+from .partitioned import AggregationRouter, SensorAgregator, partition_of
 from .telemetry import Telemetry
 from .observer_strucutre import Observer
-from .core_manager import CoreManager
+from .core_manager import CoreManager, PoolStats
+from .batching import PacketBatcher, unpack
+from .shm_queue import SharedMemoryQueue
+from .transport import QueueFactory, resolve_transport
+from .columnar import ColumnarBatch, BatchLayout
+from .verify_cache import VerificationCache
+from .ledger import VerificationLedger, LedgerStats
+from .signatures import Signer, KeyRing, ALGORITHMS, resolve_signer
 
-__all__ = [CoreLogic, Agregator, Telemetry, CoreManager]
+__all__ = [CoreLogic, Agregator, STATEFUL_OPERATIONS, UNORDERED_OPERATIONS, needs_ordering, AggregationRouter, SensorAgregator, partition_of, ReorderRing, ReorderStats, WindowStats, SlidingWindow, EventTimeWindows, EventWindowStats, BlockDealer, ChannelMerge, block_owner, Telemetry, CoreManager, PoolStats, PacketBatcher, unpack, SharedMemoryQueue, QueueFactory, resolve_transport, ColumnarBatch, BatchLayout, VerificationCache, VerificationLedger, LedgerStats, Signer, KeyRing, ALGORITHMS, resolve_signer]
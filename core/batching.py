@@ -0,0 +1,88 @@
+import time
+import queue as queue_module
+
+
+def unpack(item):
+    """Returns the packets carried by one queue item (a single packet or a batch list)."""
+    if isinstance(item, list):
+        return item
+    return [item]
+
+
+class PacketBatcher:
+    """
+    Collects outgoing packets and puts them on a queue as lists.
+
+    A batch is flushed when it holds max_size packets or when its oldest
+    packet has waited linger_ms. With max_size <= 1 every packet is put on
+    its own, exactly like before batching existed.
+
+    pack, if given, turns the packet list into the object that is actually
+    queued (e.g. BatchLayout.pack for columnar batches).
+    """
+    def __init__(self, queue, max_size: int = 1, linger_ms: float = 0, pack=None) -> None:
+        self.queue = queue
+        self.pack = pack
+        self.max_size = max(1, int(max_size))
+        self.linger = max(0.0, float(linger_ms)) / 1000.0
+        self.batch = []
+        self.deadline = None
+        return
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 1
+
+    @property
+    def pending(self) -> int:
+        return len(self.batch)
+
+    def put(self, packet, timeout=None) -> None:
+        if not self.enabled:
+            self.queue.put(packet, timeout=timeout)
+            return
+        if not self.batch:
+            self.deadline = time.monotonic() + self.linger
+        self.batch.append(packet)
+        if len(self.batch) >= self.max_size or time.monotonic() >= self.deadline:
+            self.flush(timeout)
+
+    def poll(self, timeout=None) -> None:
+        """Flushes the pending batch if its linger deadline has passed."""
+        if self.batch and time.monotonic() >= self.deadline:
+            self.flush(timeout)
+
+    def flush(self, timeout=None) -> None:
+        if not self.batch:
+            return
+        batch, self.batch = self.batch, []
+        self.deadline = None
+        if self.pack is not None:
+            batch = self.pack(batch)
+        self.queue.put(batch, timeout=timeout)
+
+    def time_left(self):
+        """Seconds until the pending batch must go out, or None when nothing is pending."""
+        if not self.batch:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def get(self, source, timeout=None):
+        """
+        Blocking get on source that wakes up in time to honour the linger deadline.
+        Returns the received item, flushing (and retrying) whenever the deadline hits first.
+        With a timeout, raises queue.Empty when nothing arrived within it.
+        """
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.time_left()
+            if give_up is not None:
+                remaining = max(0.0, give_up - time.monotonic())
+                if wait is None or remaining < wait:
+                    return source.get(timeout=remaining)
+            if wait is None:
+                return source.get()
+            try:
+                return source.get(timeout=wait)
+            except queue_module.Empty:
+                self.flush()
@@ -0,0 +1,134 @@
+import numpy as np
+
+_NUMERIC_DTYPES = {"integer": np.int64, "float": np.float64, "boolean": np.bool_}
+_DEFAULTS = {"integer": 0, "float": 0.0, "boolean": False}
+
+
+class DictionaryColumn:
+    """Low-cardinality strings stored as int32 codes into a per-batch list of distinct values."""
+    def __init__(self, codes: np.ndarray, categories: list) -> None:
+        self.codes = codes
+        self.categories = categories
+        return
+
+    @classmethod
+    def encode(cls, values):
+        lookup = {}
+        codes = np.fromiter((lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=len(values))
+        return cls(codes, list(lookup))
+
+    def tolist(self) -> list:
+        categories = self.categories
+        return [categories[c] for c in self.codes.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index) -> "DictionaryColumn":
+        return DictionaryColumn(self.codes[index], self.categories)
+
+
+class ColumnarBatch:
+    """
+    A run of packets stored column-wise: numpy arrays for numeric columns,
+    DictionaryColumn for low-cardinality strings and fixed-width byte arrays
+    (dtype S<n>) for things like hex signatures. Pickles as a handful of
+    contiguous buffers instead of one dict per packet.
+
+    valid starts True for decoded rows and False for producer placeholders;
+    CoreLogic clears it for rows that fail verification.
+    """
+    def __init__(self, ids: np.ndarray, columns: dict, valid: np.ndarray) -> None:
+        self.ids = ids
+        self.columns = columns
+        self.valid = valid
+        return
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def first_id(self) -> int:
+        return int(self.ids[0])
+
+    def is_contiguous(self) -> bool:
+        """True when the ids are first_id, first_id + 1, ... so the batch can be reordered as one unit."""
+        return len(self.ids) > 0 and bool(np.all(np.diff(self.ids) == 1))
+
+    def slice(self, start: int, stop: int) -> "ColumnarBatch":
+        """Rows [start, stop) as a new batch (views on the same arrays)."""
+        columns = {name: col[start:stop] for name, col in self.columns.items()}
+        return ColumnarBatch(self.ids[start:stop], columns, self.valid[start:stop])
+
+    def valid_rows(self) -> "ColumnarBatch":
+        """Only the rows still marked valid, as a new batch."""
+        keep = self.valid
+        columns = {name: col[keep] for name, col in self.columns.items()}
+        return ColumnarBatch(self.ids[keep], columns, self.valid[keep])
+
+    def column(self, name: str) -> list:
+        """Values of one column as Python objects (str for string columns)."""
+        col = self.columns[name]
+        if isinstance(col, DictionaryColumn):
+            return col.tolist()
+        if col.dtype.kind == 'S':
+            return [v.decode('utf-8') for v in col.tolist()]
+        return col.tolist()
+
+    def rows(self):
+        """Yields the batch back as packet dicts, placeholders as {"_id", "isValid": False}."""
+        names = list(self.columns)
+        values = [self.column(name) for name in names]
+        for i, (packet_id, valid) in enumerate(zip(self.ids.tolist(), self.valid.tolist())):
+            if not valid:
+                yield {"_id": packet_id, "isValid": False}
+                continue
+            packet = {name: column[i] for name, column in zip(names, values)}
+            packet["_id"] = packet_id
+            packet["isValid"] = True
+            yield packet
+
+
+class BatchLayout:
+    """
+    Column layout of a ColumnarBatch derived from schema_mapping.
+
+    integer/float/boolean columns become int64/float64/bool arrays. string
+    columns are dictionary-encoded unless the schema entry has
+    "fixed_width": n, in which case they are stored as n-byte strings.
+    A row whose value is longer than n bytes is marked invalid instead of
+    being truncated (a truncated signature could match a valid one).
+    """
+    def __init__(self, schema_mapping: dict) -> None:
+        self.columns = []
+        for col in schema_mapping["columns"]:
+            dtype = col["data_type"]
+            if dtype in _NUMERIC_DTYPES:
+                kind = dtype
+            elif "fixed_width" in col:
+                kind = f"S{int(col['fixed_width'])}"
+            else:
+                kind = "dictionary"
+            self.columns.append((col["internal_mapping"], kind))
+        return
+
+    def pack(self, packets: list) -> ColumnarBatch:
+        """Converts a list of packet dicts (including invalid placeholders) into a ColumnarBatch."""
+        n = len(packets)
+        ids = np.fromiter((p["_id"] for p in packets), dtype=np.int64, count=n)
+        valid = np.fromiter((p.get("isValid", True) for p in packets), dtype=np.bool_, count=n)
+        columns = {}
+        for name, kind in self.columns:
+            if kind in _NUMERIC_DTYPES:
+                default = _DEFAULTS[kind]
+                columns[name] = np.fromiter((p.get(name, default) for p in packets), dtype=_NUMERIC_DTYPES[kind], count=n)
+            elif kind == "dictionary":
+                columns[name] = DictionaryColumn.encode([p.get(name, "") for p in packets])
+            else:
+                encoded = [p.get(name, "").encode('utf-8') for p in packets]
+                width = np.dtype(kind).itemsize
+                # numpy S<n> chup chaap kaat deta hai; lamba value row ko hi invalid kar deta hai
+                too_long = np.fromiter((len(v) > width for v in encoded), dtype=np.bool_, count=n)
+                valid &= ~too_long
+                columns[name] = np.array(encoded, dtype=kind)
+        return ColumnarBatch(ids, columns, valid)
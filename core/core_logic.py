@@ -1,82 +1,275 @@
-import heapq
-from collections import deque
-from .hash_function import validate_signature
+import queue as queue_module
+from concurrent.futures import ThreadPoolExecutor
+from .signatures import resolve_signer
+from .batching import PacketBatcher, unpack
+from .columnar import ColumnarBatch
+from .ledger import VerificationLedger, LedgerBusyError
+from .reorder import ReorderRing
+from .window_stats import WindowStats, DEFAULT_STATISTICS
 import json
 import multiprocessing as mp
 from typing import Protocol
 import time
 import signal
 
+STATEFUL_OPERATIONS = ("running_average", "running_total", "window_average")
+# Inka result packets ke order pe depend nahi karta: reorder ring aur invalid placeholders ki zaroorat nahi
+UNORDERED_OPERATIONS = ("running_total", "window_average")
+
+
+def needs_ordering(stateful_config: dict) -> bool:
+    """False when the stateful operation gives the same result in any packet order."""
+    return stateful_config.get("operation", "running_average") not in UNORDERED_OPERATIONS
+
+
 class CoreLogic:
-    def __init__(self, input_queue: mp.Queue, aggregator_queue: mp.Queue, config)-> None:
+    def __init__(self, input_queue: mp.Queue, aggregator_queue: mp.Queue, config, batch_size: int = 1, batch_linger_ms: float = 0, verify_cache=None, signer=None, ledger_stats=None)-> None:
         self.input_queue = input_queue
         self.output_queue = aggregator_queue
         self.config = config
+        self.batch_size = batch_size
+        self.batch_linger_ms = batch_linger_ms
+        # Sab workers ke beech shared VerificationCache (None = har packet pe PBKDF2)
+        self.verify_cache = verify_cache
+        # operation/algorithm config se; galat naam pe yahin (main process mein) ValueError.
+        # KeyRing ke counters shared hain, is liye main se ek hi signer aata hai
+        self.signer = signer if signer is not None else resolve_signer(config['stateless_tasks'])
+        self.key_field = config['stateless_tasks'].get('key_id_field', 'key_id')
+        self.ledger = None
+        self.ledger_stats = ledger_stats
+        self.pool = None
+        # Elastic pool mein CoreManager ye event set kar ke worker ko retire karta hai
+        self.retire = None
+        # Unordered operation: invalid packets yahin khatam, aggregator ko sequence bharne ki zaroorat nahi
+        self.drop_invalid = not needs_ordering(config.get('stateful_tasks', {}))
         return
+    def _open_ledger(self):
+        ledger_config = self.config['stateless_tasks'].get('verification_ledger', {})
+        if not ledger_config.get('enabled', False):
+            return None
+        # Har worker apna mmap kholta hai, file aur lock sab workers mein shared hain
+        try:
+            return VerificationLedger(ledger_config.get('path', 'data/verification.ledger'),
+                                      self.signer.key,
+                                      self.signer.variant(),
+                                      ledger_config.get('max_entries', 1_000_000),
+                                      stats=self.ledger_stats)
+        except LedgerBusyError as e:
+            # Doosri pipeline ka ledger hai - uski file chhor do, bina ledger ke verify karo
+            print(f"Ledger disabled: {e}")
+            return None
     def process(self):
+        self.ledger = self._open_ledger()
+        threads = self.config['stateless_tasks'].get('verify_threads', 1)
+        # pbkdf2_hmac GIL chhor deta hai, is liye threads se ek hi process poora CPU use kar leta hai
+        self.pool = ThreadPoolExecutor(threads) if threads > 1 else None
         try:
             queue = self.input_queue
+            batcher = PacketBatcher(self.output_queue, self.batch_size, self.batch_linger_ms)
             while True:
-                packet = queue.get() 
-                if packet is None:
-                    # Agle process ke liye EOF behj do
-                    queue.put(None)
+                if self.retire is not None and self.retire.is_set():
+                    # Haath mein jo tha wo pura ho chuka, bas pending batch bhej do
+                    batcher.flush()
                     return
+                try:
+                    item = batcher.get(queue, None if self.retire is None else 0.2)
+                except queue_module.Empty:
+                    continue
+                items = [item] if self.pool is None else self._drain(queue, item, threads * 4)
+                packets = []
+                for item in items:
+                    if item is None:
+                        break
+                    if isinstance(item, ColumnarBatch):
+                        # Poora batch ek saath aage jaata hai, sirf valid column update hota hai
+                        self._put_checked(packets, batcher)
+                        packets = []
+                        batcher.flush()
+                        batch = self._check_batch(item)
+                        if self.drop_invalid:
+                            batch = batch.valid_rows()
+                        if len(batch):
+                            self.output_queue.put(batch)
+                        continue
+                    packets.extend(unpack(item))
 
-                isPacketValid = self._validate(packet)
-                if (isPacketValid):
-                    packet["isValid"] = True
-                else:
-                    # ye issliye taake bara package na jaaye, aur thora kaam optimize ho jaaye
-                    print("Invalid Packet")
-                    packet = {
-                        "_id":packet["_id"],
-                        "isValid": False
-                    }
+                # Results usi order mein jaate hain jis mein packets aaye the
+                self._put_checked(packets, batcher)
 
-                self.output_queue.put(packet)
+                if items[-1] is None:
+                    batcher.flush()
+                    # Agle process ke liye EOF behj do
+                    queue.put(None)
+                    return
         except KeyboardInterrupt:
             pass
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            if self.ledger is not None:
+                # Bache hue results bhi disk pe likh do
+                self.ledger.close()
+                print(f"Ledger: {self.ledger.stats()}")
         return
+    def _drain(self, queue, first, limit):
+        """first ke saath jo items abhi ready hain (bina ruke) le lo, taake pool ke threads ke liye kaam ho."""
+        items = [first]
+        count = len(first) if isinstance(first, (list, ColumnarBatch)) else 1
+        while first is not None and count < limit:
+            try:
+                item = queue.get_nowait()
+            except queue_module.Empty:
+                break
+            items.append(item)
+            if item is None:
+                break
+            count += len(item) if isinstance(item, (list, ColumnarBatch)) else 1
+        return items
+    def _map(self, fn, values):
+        if self.pool is None:
+            return list(map(fn, values))
+        return list(self.pool.map(fn, values))
+    def _check_all(self, packets):
+        return self._map(self._check, packets)
+    def _put_checked(self, packets, batcher):
+        for packet in self._check_all(packets):
+            if packet["isValid"] or not self.drop_invalid:
+                batcher.put(packet)
+    def _check(self, packet):
+        if packet.get("isValid") is False:
+            # Producer ne pehle hi reject kar diya (bad row), sirf id ka sequence rakhna hai
+            return packet
+        isPacketValid = self._validate(packet)
+        if (isPacketValid):
+            packet["isValid"] = True
+        else:
+            # ye issliye taake bara package na jaaye, aur thora kaam optimize ho jaaye
+            print("Invalid Packet")
+            packet = {
+                "_id":packet["_id"],
+                "isValid": False
+            }
+        return packet
+    def _check_batch(self, batch: ColumnarBatch):
+        values = batch.column('metric_value')
+        hashes = batch.column('security_hash')
+        # Key hints sirf tab jab schema mein ye columns hon
+        key_ids = batch.column(self.key_field) if self.key_field in batch.columns else None
+        times = batch.column('time_period') if 'time_period' in batch.columns else None
+        rows = [i for i, valid in enumerate(batch.valid.tolist()) if valid]
+        verdicts = self._map(lambda i: self._verify(hashes[i], str(values[i]),
+                                                    key_ids[i] if key_ids is not None else None,
+                                                    times[i] if times is not None else None), rows)
+        for i, verdict in zip(rows, verdicts):
+            if not verdict:
+                print("Invalid Packet")
+                batch.valid[i] = False
+        return batch
     def _validate(self,packet):
-        key = self.config['stateless_tasks']['secret_key']
-        iterations = self.config['stateless_tasks']['iterations']
-
         hash_val = packet.get('security_hash')
         raw_val = str(packet.get("metric_value"))
-        return validate_signature(hash_val,raw_val,key,iterations)
+        return self._verify(hash_val,raw_val,packet.get(self.key_field),packet.get('time_period'))
+    def _verify(self, hash_val, raw_val, key_id=None, time_period=None):
+        if self.ledger is not None:
+            # Pichle runs mein yehi check ho chuka ho to derivation ki zaroorat nahi
+            verdict = self.ledger.lookup(raw_val, hash_val)
+            if verdict is not None:
+                return verdict
+        verdict = self.signer.verify(hash_val,raw_val,self.verify_cache,key_id,time_period)
+        if self.ledger is not None:
+            self.ledger.record(raw_val, hash_val, verdict)
+        return verdict
 
 class Agregator:
-    def __init__(self, queue: mp.Queue, output_queue: mp.Queue, maxLen: int) -> None:
+    def __init__(self, queue: mp.Queue, output_queue: mp.Queue, maxLen: int, batch_size: int = 1, batch_linger_ms: float = 0, start_id: int = 0, reorder=None, reorder_stats=None, windows=None, statistics=None, event_windows=None, operation: str = "running_average") -> None:
         self.queue = queue
-        self.expected_id = 0
-        self.pq = []
-        self.deque = deque(maxlen=maxLen)
+        # Follow mode resume hone par ids checkpoint wale next_id se shuru hoti hain.
+        # Ring ka size aur gap timeout stateful_tasks.reorder se
+        reorder = reorder or {}
+        self.ring = ReorderRing(start_id, reorder.get('max_window', 1 << 20), reorder.get('gap_timeout_s', 30.0), reorder_stats)
+        # Running sums, O(1) per packet; windows diye hon to sab sizes ek hi pass mein
+        self.maxLen = maxLen
+        self.windows = windows
+        self.stats = WindowStats([maxLen] + list(windows or []), statistics or DEFAULT_STATISTICS)
+        # operation "window_average": event-time windows (EventTimeWindows) instead of the running average
+        self.event_windows = event_windows
+        self.operation = operation
+        self.ordered = operation not in UNORDERED_OPERATIONS
+        self.count = 0
+        self.total = 0.0
         self.output = output_queue
+        self.batch_size = batch_size
+        self.batch_linger_ms = batch_linger_ms
         return
     def agregate(self):
         try:
+            batcher = PacketBatcher(self.output, self.batch_size, self.batch_linger_ms)
             while True:
-                received_packet = self.queue.get()
-                if received_packet is None:
-                    # POISON PILL
+                try:
+                    # Gap ho to sirf uske timeout tak ruko
+                    item = batcher.get(self.queue, self.ring.time_left())
+                except queue_module.Empty:
+                    self._emit(self.ring.expire(), batcher)
+                    continue
+                if item is None:
+                    # POISON PILL: gaps ke peeche ruke packets bhi nikaal do
+                    self._emit(self.ring.drain(), batcher)
+                    if self.event_windows is not None:
+                        # Stream khatam: watermark infinity, sab khuli windows fire
+                        for result in self.event_windows.flush():
+                            batcher.put(result)
+                    batcher.flush()
                     self.output.put(None)
                     return
 
-                heapq.heappush(self.pq,(received_packet["_id"],received_packet))
-                while self.pq and self.pq[0][0] == self.expected_id:
-                    _, packet_to_process = heapq.heappop(self.pq)
-                    avg = self._generate_output(packet_to_process)
-                    if avg is not None:
-                        self.output.put(avg)
-                    self.expected_id +=1
+                if not self.ordered:
+                    # Order se farq nahi parta: jo aaya foran process, kisi purane packet ka intezar nahi
+                    self._emit([item] if isinstance(item, ColumnarBatch) else unpack(item), batcher)
+                elif isinstance(item, ColumnarBatch) and item.is_contiguous():
+                    # Contiguous batch ko ek unit ki tarah order karo
+                    self._emit(self.ring.push(item.first_id, item, len(item)), batcher)
+                else:
+                    packets = item.rows() if isinstance(item, ColumnarBatch) else unpack(item)
+                    for received_packet in packets:
+                        self._emit(self.ring.push(received_packet["_id"], received_packet), batcher)
         except KeyboardInterrupt:
             pass
 
+    def _emit(self, units, batcher):
+        for unit in units:
+            if self.event_windows is not None:
+                packets = unit.rows() if isinstance(unit, ColumnarBatch) else (unit,)
+                for packet in packets:
+                    if packet["isValid"]:
+                        for result in self.event_windows.add(packet):
+                            batcher.put(result)
+                continue
+            if isinstance(unit, ColumnarBatch):
+                for avg in self._generate_batch_output(unit):
+                    batcher.put(avg)
+                continue
+            avg = self._generate_output(unit)
+            if avg is not None:
+                batcher.put(avg)
+
     def _generate_output(self,packet):
         if (packet["isValid"]):
-            self.deque.append(float(packet['metric_value']))
-            running_avg = sum(self.deque)/len(self.deque)
+            return self._update(float(packet['metric_value']))
+
+    def _generate_batch_output(self, batch: ColumnarBatch):
+        values = batch.columns['metric_value'][batch.valid].tolist()
+        for value in values:
+            yield self._update(value)
+
+    def _update(self, value):
+        if self.operation == "running_total":
+            self.count += 1
+            self.total += value
+            return {"count": self.count, "sum": self.total, "value": self.total / self.count}
+        self.stats.push(value)
+        running_avg = self.stats.mean(self.maxLen)
+        if self.windows is None:
             return running_avg
+        return {"value": running_avg, "windows": self.stats.record(self.windows)}
 
 
@@ -1,27 +1,138 @@
+import time
+import threading
 import multiprocessing as mp
 from . import CoreLogic
+from .dealing import BlockDealer
+
+
+class PoolStats:
+    """
+    Scaling counters of the elastic core pool in shared memory, so the
+    Telemetry process can report them: current workers, scale-ups,
+    scale-downs and the direction and input queue depth of the last event.
+    """
+    def __init__(self) -> None:
+        self.values = mp.Array('q', 5)
+        return
+
+    def record(self, workers, direction=0, depth=0) -> None:
+        values = self.values
+        with values.get_lock():
+            values[0] = workers
+            if direction:
+                values[1 if direction > 0 else 2] += 1
+                values[3] = direction
+                values[4] = depth
+        return
+
+    def stats(self) -> dict:
+        workers, scale_ups, scale_downs, last_event, last_depth = self.values[:]
+        return {
+            "workers": workers,
+            "scale_ups": scale_ups,
+            "scale_downs": scale_downs,
+            "last_event": {1: "up", -1: "down"}.get(last_event),
+            "last_event_queue_depth": last_depth,
+        }
 
 
 class CoreManager:
-    def __init__(self, input_queue, agregator_queue, workers, core_config):
+    def __init__(self, input_queue, agregator_queue, workers, core_config, batch_size=1, batch_linger_ms=0, verify_cache=None, signer=None, elastic=None, queue_size=None, ledger_stats=None):
         self.workers = workers
         self.input_queue = input_queue
         self.agg_queue = agregator_queue
         self.config = core_config
+        self.batch_size = batch_size
+        self.batch_linger_ms = batch_linger_ms
+        self.verify_cache = verify_cache
+        self.signer = signer
+        self.ledger_stats = ledger_stats
         self.processes_arr = []
+        # Elastic pool (None = fixed `workers` processes, jaisa pehle tha)
+        self.elastic = elastic
+        self.queue_size = queue_size
+        self.active = []  # (process, retire event) of workers that are not retiring
+        self.stopping = threading.Event()
+        self.monitor = None
+        self.pool_stats = PoolStats()
 
     def initialize_multiprocessing(self):
-        self.processes_arr = [self.generate_worker() for _ in range(self.workers)]
+        if isinstance(self.input_queue, BlockDealer):
+            # Dealt scheduling: har worker ki apni input queue aur output channel, ginti fixed
+            self.processes_arr = [self.generate_worker(index=i) for i in range(len(self.input_queue.queues))]
+            return
+        if self.elastic is None:
+            self.processes_arr = [self.generate_worker() for _ in range(self.workers)]
+            return
+        self.min_workers = self.elastic.get("min_workers", 1)
+        self.max_workers = self.elastic.get("max_workers", max(self.min_workers, 2 * self.workers))
+        start = min(max(self.workers, self.min_workers), self.max_workers)
+        for _ in range(start):
+            self._add_worker()
+        self.pool_stats.record(len(self.active))
+        self.monitor = threading.Thread(target=self._watch, name="core-pool", daemon=True)
+        self.monitor.start()
 
-    def generate_worker(self):
-        core = CoreLogic(self.input_queue, self.agg_queue, self.config)
+    def generate_worker(self, retire=None, index=None):
+        input_queue, agg_queue = self.input_queue, self.agg_queue
+        if index is not None:
+            input_queue, agg_queue = input_queue.queues[index], agg_queue.channels[index]
+        core = CoreLogic(input_queue, agg_queue, self.config, self.batch_size, self.batch_linger_ms, self.verify_cache, self.signer, self.ledger_stats)
+        core.retire = retire
         process=mp.Process(target=core.process)
         process.start()
         return process
 
-    def shutdown_core(self):
-        for worker in self.processes_arr:
-            worker.join()
+    def _add_worker(self):
+        retire = mp.Event()
+        process = self.generate_worker(retire)
+        self.processes_arr.append(process)
+        self.active.append((process, retire))
 
+    def _retire_worker(self):
+        # Sab se naya worker retire hota hai; wo apna current item pura kar ke nikal jaata hai
+        _, retire = self.active.pop()
+        retire.set()
 
+    def _record(self, direction, depth):
+        self.pool_stats.record(len(self.active), direction, depth)
+        print(f"Core pool: {'+1' if direction > 0 else '-1'} worker -> {len(self.active)} (input queue {depth})")
 
+    def _depth(self):
+        try:
+            return self.input_queue.qsize()
+        except (NotImplementedError, AttributeError):
+            return -1
+
+    def _watch(self):
+        """Samples the input queue and grows/shrinks the pool until shutdown_core."""
+        interval = self.elastic.get("check_interval_s", 0.1)
+        high_water = self.elastic.get("high_water", 0.8) * self.queue_size
+        scale_up_after = self.elastic.get("scale_up_after_s", 1.0)
+        idle_after = self.elastic.get("idle_after_s", 5.0)
+        busy_since = idle_since = None
+        while not self.stopping.wait(interval):
+            # Jo workers khud nikal gaye (poison pill) unko ginti se hata do
+            self.active = [(p, r) for p, r in self.active if p.is_alive()]
+            self.processes_arr = [p for p in self.processes_arr if p.is_alive()]
+            depth = self._depth()
+            now = time.monotonic()
+            busy_since = (busy_since or now) if depth >= high_water else None
+            idle_since = (idle_since or now) if depth == 0 else None
+
+            if busy_since is not None and now - busy_since >= scale_up_after and len(self.active) < self.max_workers:
+                self._add_worker()
+                self._record(+1, depth)
+                busy_since = None  # naya worker ko bhi scale_up_after ka waqt do
+            elif idle_since is not None and now - idle_since >= idle_after and len(self.active) > self.min_workers:
+                self._retire_worker()
+                self._record(-1, depth)
+                idle_since = None
+
+    def shutdown_core(self):
+        # Pehle monitor band, taake shutdown ke dauran naye workers na banein
+        self.stopping.set()
+        if self.monitor is not None:
+            self.monitor.join()
+        for worker in self.processes_arr:
+            worker.join()
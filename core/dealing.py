@@ -0,0 +1,197 @@
+import time
+import queue as queue_module
+from collections import deque
+from .batching import unpack
+from .columnar import ColumnarBatch
+
+# Idle feed par owner channel ko itne second baad dobara dekho (gap timer tab chalta hi nahi)
+_IDLE_POLL = 0.1
+
+
+def block_owner(packet_id: int, block_ids: int, workers: int) -> int:
+    """Core worker that owns an _id when ids are dealt in blocks of block_ids."""
+    return (packet_id // block_ids) % workers
+
+
+class BlockDealer:
+    """
+    Stands in for the input queue when pipeline_dynamics.scheduling is
+    "dealt". Ids are dealt to the core workers in contiguous blocks of
+    block_ids, round-robin: block b goes to worker b % workers. Items are
+    split at block boundaries, so every worker sees its ids in increasing
+    order and emits an already sorted stream. Needs a single writer (one
+    producer process) so each worker queue is filled in _id order.
+    """
+    def __init__(self, queues: list, block_ids: int) -> None:
+        self.queues = queues
+        self.block_ids = max(1, int(block_ids))
+        return
+
+    def _split(self, item):
+        """Yields (worker, part) pieces of item that each stay inside one block."""
+        if isinstance(item, ColumnarBatch):
+            ids = item.ids.tolist()
+            get_id = ids.__getitem__
+            take = item.slice
+        else:
+            packets = unpack(item)
+            get_id = lambda i: packets[i]["_id"]
+            take = lambda start, stop: packets[start:stop] if isinstance(item, list) else packets[start]
+        n = len(item) if isinstance(item, (list, ColumnarBatch)) else 1
+        start = 0
+        while start < n:
+            block = get_id(start) // self.block_ids
+            stop = start + 1
+            while stop < n and get_id(stop) // self.block_ids == block:
+                stop += 1
+            yield block % len(self.queues), take(start, stop)
+            start = stop
+
+    def put(self, item, block: bool = True, timeout=None) -> None:
+        if item is None:
+            # Poison pill har worker ko
+            for q in self.queues:
+                q.put(None, block, timeout)
+            return
+        for worker, part in self._split(item):
+            self.queues[worker].put(part, block, timeout)
+
+    def put_nowait(self, item) -> None:
+        self.put(item, block=False)
+
+    def qsize(self) -> int:
+        return sum(q.qsize() for q in self.queues)
+
+    def close(self) -> None:
+        return
+
+
+class ChannelMerge:
+    """
+    Stands in for the aggregator queue in "dealt" scheduling: one output
+    channel per core worker, each sorted by _id. Because the owner of every
+    id is known (block_owner), the merge reads the next run straight from
+    the channel that owns expected_id - no heap, no buffering of other
+    channels. get() returns runs of packets (or whole columnar batches) in
+    _id order, and None once every channel has ended.
+
+    If the owning channel stays silent for gap_timeout seconds while
+    another channel already holds later ids (a worker died), the rest of
+    that block is given up and the Agregator's ReorderRing accounts for the
+    missing ids. An idle feed (nothing waiting anywhere) never starts the
+    timer, so blocks that have not been produced yet are not skipped. After a channel has ended,
+    the remaining channels are merged by their smallest head id.
+    """
+    def __init__(self, channels: list, block_ids: int, start_id: int = 0, gap_timeout=None) -> None:
+        self.channels = channels
+        self.block_ids = max(1, int(block_ids))
+        self.expected_id = start_id
+        self.gap_timeout = gap_timeout
+        self.heads = [None] * len(channels)  # deque of packets or a ColumnarBatch per channel
+        self.ended = [False] * len(channels)
+        self.waiting_since = None
+        return
+
+    def put(self, item, block: bool = True, timeout=None) -> None:
+        # Shutdown ka None har channel mein, merge tab khatam jab sab khatam
+        if item is None:
+            for channel in self.channels:
+                channel.put(None, block, timeout)
+            return
+        raise TypeError("core workers put to their own channel, not to the merge")
+
+    def qsize(self) -> int:
+        return sum(channel.qsize() for channel in self.channels)
+
+    def close(self) -> None:
+        return
+
+    def _fill(self, c: int, timeout) -> bool:
+        """Makes sure channel c has a head; False if nothing arrived within timeout."""
+        while not self.heads[c] and not self.ended[c]:
+            try:
+                item = self.channels[c].get(timeout=timeout)
+            except queue_module.Empty:
+                return False
+            if item is None:
+                self.ended[c] = True
+            elif isinstance(item, ColumnarBatch):
+                if len(item):
+                    self.heads[c] = item
+            else:
+                self.heads[c] = deque(unpack(item))
+        return bool(self.heads[c])
+
+    def _head_id(self, c: int) -> int:
+        head = self.heads[c]
+        return head.first_id if isinstance(head, ColumnarBatch) else head[0]["_id"]
+
+    def _take(self, c: int):
+        head = self.heads[c]
+        if isinstance(head, ColumnarBatch):
+            self.heads[c] = None
+            last_id = int(head.ids[-1])
+            run = head
+        else:
+            # Ek hi block ke lagataar packets ek run mein
+            run = [head.popleft()]
+            block = run[0]["_id"] // self.block_ids
+            while head and head[0]["_id"] == run[-1]["_id"] + 1 and head[0]["_id"] // self.block_ids == block:
+                run.append(head.popleft())
+            last_id = run[-1]["_id"]
+        self.expected_id = max(self.expected_id, last_id + 1)
+        self.waiting_since = None
+        return run
+
+    def _others_ahead(self, owner: int) -> bool:
+        """True when some other channel already holds ids past expected_id (checked without waiting)."""
+        for c in range(len(self.channels)):
+            if c != owner and self._fill(c, 0) and self._head_id(c) > self.expected_id:
+                return True
+        return False
+
+    def _smallest_head(self):
+        """k-way step over the channels that still have data (used once a channel has ended)."""
+        best = None
+        for c in range(len(self.channels)):
+            # Khatam hone wale channel ke baad baaki sab ke None bhi aa chuke ya aa rahe hain
+            if self._fill(c, None) and (best is None or self._head_id(c) < self._head_id(best)):
+                best = c
+        return best
+
+    def get(self, block: bool = True, timeout=None):
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            owner = block_owner(self.expected_id, self.block_ids, len(self.channels))
+            if self.ended[owner] and not self.heads[owner]:
+                c = self._smallest_head()
+                if c is None:
+                    return None
+                return self._take(c)
+
+            wait = None
+            now = time.monotonic()
+            if self.gap_timeout is not None:
+                # Timer sirf tab jab baad wale ids kisi aur channel mein ruke hon, ReorderRing ki tarah
+                if self.waiting_since is None:
+                    if self._fill(owner, 0):
+                        return self._take(owner)
+                    if self._others_ahead(owner):
+                        self.waiting_since = now
+                if self.waiting_since is not None:
+                    wait = max(0.0, self.waiting_since + self.gap_timeout - now)
+                else:
+                    wait = min(self.gap_timeout, _IDLE_POLL)
+            if give_up is not None:
+                wait = max(0.0, give_up - now) if wait is None else min(wait, max(0.0, give_up - now))
+            if self._fill(owner, wait):
+                return self._take(owner)
+            if self.ended[owner]:
+                continue
+            if give_up is not None and time.monotonic() >= give_up:
+                raise queue_module.Empty
+            if self.waiting_since is None or time.monotonic() < self.waiting_since + self.gap_timeout:
+                continue
+            # Owner worker itni der chup raha: is block ke baaki ids chhor do, ReorderRing unhe skipped ginega
+            self.expected_id = (self.expected_id // self.block_ids + 1) * self.block_ids
+            self.waiting_since = None
@@ -0,0 +1,169 @@
+import heapq
+import math
+import multiprocessing as mp
+
+
+class EventWindowStats:
+    """
+    Counters of the event-time windows in shared memory, so the Telemetry
+    process can report them: windows fired, late updates re-emitted, late
+    packets dropped and windows currently holding state.
+    """
+    def __init__(self) -> None:
+        self.values = mp.Array('q', 4)
+        return
+
+    def add(self, fired=0, updates=0, dropped=0, opened=0) -> None:
+        # opened is a delta: partitions share one counter of open windows
+        values = self.values
+        with values.get_lock():
+            values[0] += fired
+            values[1] += updates
+            values[2] += dropped
+            values[3] += opened
+        return
+
+    def stats(self) -> dict:
+        fired, updates, dropped, open_windows = self.values[:]
+        return {"windows_fired": fired, "late_updates": updates, "late_dropped": dropped, "open_windows": open_windows}
+
+
+class EventTimeWindows:
+    """
+    Tumbling (slide == size) or sliding windows over an event-time field,
+    optionally one set per group_by value. Times are in the units of the
+    time field (seconds for time_period).
+
+    State is kept in panes of gcd(size, slide) time units holding count,
+    sum, min and max, so a packet updates one pane in O(1); a window is
+    combined from its size / pane panes when it fires.
+
+    The watermark is the largest event time seen minus max_out_of_orderness.
+    A window [start, end) fires once the watermark reaches end. It keeps its
+    state for allowed_lateness more: a packet for it arriving in that time
+    updates it and the window is emitted again with "late_update": true.
+    Packets later than that are dropped and counted. Windows and panes are
+    evicted as soon as the watermark passes end + allowed_lateness, so
+    memory follows the open windows, not the stream length.
+    """
+    def __init__(self, size, slide=None, allowed_lateness=0, max_out_of_orderness=0, time_field="time_period", group_by=None, stats=None) -> None:
+        slide = size if slide is None else slide
+        for name, value, minimum in (("size", size, 1), ("slide", slide, 1), ("allowed_lateness", allowed_lateness, 0), ("max_out_of_orderness", max_out_of_orderness, 0)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+                raise ValueError(f"event_windows.{name} must be an integer >= {minimum}, got {value!r}")
+        if slide > size:
+            raise ValueError(f"event_windows.slide must be <= size, got slide {slide} and size {size}")
+        self.size = size
+        self.slide = slide
+        self.pane = math.gcd(size, slide)
+        self.allowed_lateness = allowed_lateness
+        self.max_out_of_orderness = max_out_of_orderness
+        self.time_field = time_field
+        self.group_by = group_by
+        self.stats = stats
+        self.panes = {}        # (group, pane_start) -> [count, sum, min, max]
+        self.windows = {}      # (group, window_start) -> fired yet
+        self.pending = []      # heap (end, start, group) of windows waiting to fire
+        self.expiry = []       # heap (end + allowed_lateness, start, group) of fired windows
+        self.pane_expiry = []  # heap (evict_at, pane_start, group)
+        self.max_time = None
+        self.watermark = -math.inf
+        self.reported_open = 0
+        return
+
+    @classmethod
+    def from_config(cls, config: dict, stats=None) -> "EventTimeWindows":
+        return cls(config.get("size", 60), config.get("slide"), config.get("allowed_lateness", 0),
+                   config.get("max_out_of_orderness", 0), config.get("time_field", "time_period"),
+                   config.get("group_by"), stats)
+
+    def add(self, packet: dict) -> list:
+        """Adds a valid packet; returns late updates and the windows its watermark step fired."""
+        t = packet[self.time_field]
+        group = packet.get(self.group_by) if self.group_by else ""
+        last_start = t // self.slide * self.slide
+        if last_start + self.size + self.allowed_lateness <= self.watermark:
+            # Is packet ki har window band ho chuki
+            if self.stats is not None:
+                self.stats.add(dropped=1)
+            return []
+
+        value = float(packet['metric_value'])
+        pane_start = t // self.pane * self.pane
+        pane = self.panes.get((group, pane_start))
+        if pane is None:
+            self.panes[(group, pane_start)] = [1, value, value, value]
+            heapq.heappush(self.pane_expiry, (last_start + self.size + self.allowed_lateness, pane_start, group))
+        else:
+            pane[0] += 1
+            pane[1] += value
+            pane[2] = min(pane[2], value)
+            pane[3] = max(pane[3], value)
+
+        results = []
+        start = last_start
+        while start + self.size > t:
+            end = start + self.size
+            if end + self.allowed_lateness > self.watermark:
+                fired = self.windows.get((group, start))
+                if fired is None:
+                    self.windows[(group, start)] = False
+                    heapq.heappush(self.pending, (end, start, group))
+                elif fired:
+                    results.append(self._result(group, start, True))
+            start -= self.slide
+        if results and self.stats is not None:
+            self.stats.add(updates=len(results))
+
+        watermark = self.watermark
+        if self.max_time is None or t > self.max_time:
+            self.max_time = t
+            self.watermark = max(watermark, t - self.max_out_of_orderness)
+        if self.watermark > watermark or (self.pending and self.pending[0][0] <= watermark):
+            # Watermark aage gaya, ya late packet ne pehle se guzri hui window kholi
+            results.extend(self._advance())
+        return results
+
+    def flush(self) -> list:
+        """End of stream: fires every window still waiting and drops all state."""
+        self.watermark = math.inf
+        return self._advance()
+
+    def _advance(self) -> list:
+        watermark = self.watermark
+        fired = []
+        while self.pending and self.pending[0][0] <= watermark:
+            end, start, group = heapq.heappop(self.pending)
+            fired.append(self._result(group, start, False))
+            self.windows[(group, start)] = True
+            heapq.heappush(self.expiry, (end + self.allowed_lateness, start, group))
+        # Lateness bhi guzar gayi: window aur uske panes ki state hata do
+        expired = 0
+        while self.expiry and self.expiry[0][0] <= watermark:
+            _, start, group = heapq.heappop(self.expiry)
+            del self.windows[(group, start)]
+            expired += 1
+        while self.pane_expiry and self.pane_expiry[0][0] <= watermark:
+            _, pane_start, group = heapq.heappop(self.pane_expiry)
+            del self.panes[(group, pane_start)]
+        if (fired or expired) and self.stats is not None:
+            self.stats.add(fired=len(fired), opened=len(self.windows) - self.reported_open)
+            self.reported_open = len(self.windows)
+        return fired
+
+    def _result(self, group, start: int, update: bool) -> dict:
+        count, total, low, high = 0, 0.0, math.inf, -math.inf
+        for pane_start in range(start, start + self.size, self.pane):
+            pane = self.panes.get((group, pane_start))
+            if pane is not None:
+                count += pane[0]
+                total += pane[1]
+                low = min(low, pane[2])
+                high = max(high, pane[3])
+        result = {"window_start": start, "window_end": start + self.size}
+        if self.group_by:
+            result[self.group_by] = group
+        result.update({"value": total / count, "count": count, "min": low, "max": high})
+        if update:
+            result["late_update"] = True
+        return result
@@ -1,26 +1,40 @@
 import hashlib
 import hmac
 
-def generate_signature(raw_value_str: str, key: str, iterations: int) -> str:
+def derive_signature(raw_value_str: str, key: str, iterations: int) -> bytes:
     """
-    Generates a PBKDF2 HMAC SHA-256 signature for the given value.
+    Runs PBKDF2 HMAC SHA-256 for the given value and returns the raw digest.
     Treats the secret key as the password and the raw value as the salt.
     """
     password_bytes = key.encode('utf-8')
     salt_bytes = raw_value_str.encode('utf-8')
 
     # Generate the hash
-    hash_bytes = hashlib.pbkdf2_hmac(
+    return hashlib.pbkdf2_hmac(
         hash_name='sha256', 
         password=password_bytes, 
         salt=salt_bytes, 
         iterations=iterations
     )
-    return hash_bytes.hex()
 
-# ye signature validate kr ke deta 
-def validate_signature(hash_val: str, sensor_data: str, key: str, iterations: int) -> bool:
-    sig = generate_signature(sensor_data, key, iterations)
+def generate_signature(raw_value_str: str, key: str, iterations: int) -> str:
+    """
+    Generates a PBKDF2 HMAC SHA-256 signature for the given value.
+    Treats the secret key as the password and the raw value as the salt.
+    """
+    return derive_signature(raw_value_str, key, iterations).hex()
+
+# ye signature validate kr ke deta (PBKDF2 only; pipeline signatures.resolve_signer use karti hai)
+def validate_signature(hash_val: str, sensor_data: str, key: str, iterations: int, cache=None) -> bool:
+    if cache is None:
+        sig = generate_signature(sensor_data, key, iterations)
+    else:
+        # Same value ka PBKDF2 dobara na chalao, shared cache se utha lo
+        digest = cache.get(sensor_data, key, iterations)
+        if digest is None:
+            digest = derive_signature(sensor_data, key, iterations)
+            cache.put(sensor_data, key, iterations, digest)
+        sig = digest.hex()
 
     return hmac.compare_digest(sig, hash_val)
 
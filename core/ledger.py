@@ -0,0 +1,274 @@
+import os
+import mmap
+import fcntl
+import struct
+import hashlib
+import threading
+import multiprocessing as mp
+from contextlib import contextmanager
+
+_MAGIC = b"SDALEDG1"
+# magic, fingerprint (key + algorithm variant), capacity, used slots, next sequence number
+_HEADER = struct.Struct("8s16sQQQ")
+_HEADER_SIZE = 64
+# tag (16) + insertion sequence (4)
+_SLOT = struct.Struct("16sI")
+_EMPTY = bytes(16)
+# Compact when this full, keeping the newest _KEEP share of capacity
+_MAX_LOAD = 0.7
+_KEEP = 0.35
+
+
+class LedgerBusyError(RuntimeError):
+    """The ledger file belongs to a different key, algorithm or capacity and another process is using it."""
+
+
+class LedgerStats:
+    """
+    Ledger counters of all core workers in shared memory, so the Telemetry
+    process can report them: lookups answered by the ledger, lookups it
+    had no entry for, entries appended and compactions.
+    """
+    def __init__(self) -> None:
+        self.values = mp.Array('q', 4)
+        return
+
+    def add(self, hits=0, misses=0, appended=0, compactions=0) -> None:
+        values = self.values
+        with values.get_lock():
+            values[0] += hits
+            values[1] += misses
+            values[2] += appended
+            values[3] += compactions
+        return
+
+    def stats(self) -> dict:
+        hits, misses, appended, compactions = self.values[:]
+        return {"hits": hits, "misses": misses, "appended": appended, "compactions": compactions}
+
+
+class VerificationLedger:
+    """
+    On-disk, memory-mapped record of signature checks that survives restarts.
+
+    Maps (value string, signature) - under one secret key fingerprint and
+    algorithm variant (Signer.variant()) - to verified/rejected, so replaying a dataset skips
+    PBKDF2 for every row it has already seen.
+
+    The file is an open-addressing hash table of 16-byte tags. The verdict
+    is not stored next to the tag: a verified check stores
+    blake2b(..., person="verified") and a rejected one blake2b(...,
+    person="rejected"), and a lookup compares against both. Readers never
+    lock, and a slot read while it is being rewritten can only produce a
+    tag that matches nothing - a miss, never a wrong verdict.
+
+    Writers buffer results and insert them in bulk under an exclusive
+    flock, so several workers (or pipelines) can share one ledger. The
+    table has a fixed capacity; past 70% load it is compacted in place,
+    keeping the most recently added entries. A different secret_key,
+    algorithm or parameter set swaps in a fresh file (built aside and
+    renamed over the path); processes still mapping the old file keep their
+    copy instead of seeing it truncated under them.
+
+    Every open ledger holds a shared POSIX record lock (lockf, independent
+    of the flock above) on its file. The fresh-file swap only happens when
+    nobody holds one; while another pipeline with different settings still
+    uses the file, LedgerBusyError is raised instead, so two configurations
+    on one path can't keep replacing each other's ledger.
+
+    Counters are kept per process (stats()) and, when a LedgerStats is
+    given, added to it every flush_every lookups and on close.
+    """
+    def __init__(self, path: str, key: str, variant, capacity: int = 1_000_000, flush_every: int = 256, stats=None) -> None:
+        self.path = path
+        self.capacity = max(16, int(capacity))
+        self.flush_every = flush_every
+        self.fingerprint = hashlib.blake2b(f"{variant}\0{key}".encode('utf-8'), digest_size=16).digest()
+        self.size = _HEADER_SIZE + self.capacity * _SLOT.size
+        self.pending = []
+        self.thread_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.appended = 0
+        self.compactions = 0
+        self.shared_stats = stats
+        self.reported = (0, 0, 0, 0)
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        while True:
+            self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            busy = False
+            with self._locked():
+                if self._header_matches():
+                    # "Ye file istemaal mein hai" - jab tak ye lock hai koi file replace nahi karega
+                    fcntl.lockf(self.fd, fcntl.LOCK_SH)
+                    break
+                if os.fstat(self.fd).st_ino == os.stat(path).st_ino:
+                    # Naya file, ya key/algorithm/capacity badal gaye - purana ledger bekaar hai,
+                    # lekin sirf tab jab koi aur pipeline use na kar rahi ho
+                    busy = not self._unused()
+                    if not busy:
+                        self._replace_file()
+            # Path ab naye file ki taraf hai, wahi dobara kholo
+            os.close(self.fd)
+            if busy:
+                raise LedgerBusyError(
+                    f"Ledger {path} is in use by a pipeline with a different key, algorithm or capacity; "
+                    f"give this one its own verification_ledger.path")
+        self.mm = mmap.mmap(self.fd, self.size)
+        return
+
+    def _replace_file(self) -> None:
+        """Builds an empty ledger next to path and renames it over path (caller holds the lock)."""
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, self.size)
+            os.pwrite(fd, _HEADER.pack(_MAGIC, self.fingerprint, self.capacity, 0, 1), 0)
+        finally:
+            os.close(fd)
+        # ftruncate nahi: doosre processes ka mmap purane inode pe salamat rehta hai
+        os.replace(tmp_path, self.path)
+
+    def _unused(self) -> bool:
+        """True when no other process holds the in-use lock of the open file (caller holds the flock)."""
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        fcntl.lockf(self.fd, fcntl.LOCK_UN)
+        return True
+
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def _header_matches(self) -> bool:
+        if os.fstat(self.fd).st_size != self.size:
+            return False
+        magic, fingerprint, capacity, _, _ = _HEADER.unpack(os.pread(self.fd, _HEADER.size, 0))
+        return magic == _MAGIC and fingerprint == self.fingerprint and capacity == self.capacity
+
+    def _tag(self, value: str, signature: str, verdict: bool) -> bytes:
+        data = self.fingerprint + f"{value}\0{signature}".encode('utf-8')
+        return hashlib.blake2b(data, digest_size=16, person=b"verified" if verdict else b"rejected").digest()
+
+    def _home(self, tag: bytes) -> int:
+        # Probing tag se shuru hoti hai, taake compaction har entry ki jagah dobara nikal sake
+        return int.from_bytes(tag[:8], 'little') % self.capacity
+
+    def _find(self, tag: bytes) -> bool:
+        mm = self.mm
+        home = self._home(tag)
+        for probe in range(self.capacity):
+            offset = _HEADER_SIZE + ((home + probe) % self.capacity) * _SLOT.size
+            current = mm[offset:offset + 16]
+            if current == tag:
+                return True
+            if current == _EMPTY:
+                return False
+        return False
+
+    def lookup(self, value: str, signature: str):
+        """Returns True (verified), False (rejected) or None when the ledger has no entry."""
+        for verdict in (True, False):
+            if self._find(self._tag(value, signature, verdict)):
+                self.hits += 1
+                self._count()
+                return verdict
+        self.misses += 1
+        self._count()
+        return None
+
+    def _count(self) -> None:
+        if self.shared_stats is not None and (self.hits + self.misses) % self.flush_every == 0:
+            self._publish()
+        return
+
+    def _publish(self) -> None:
+        """Adds what changed since the last call to the shared LedgerStats."""
+        # Pool ke threads ek saath yahan pahunch sakte hain
+        with self.thread_lock:
+            current = (self.hits, self.misses, self.appended, self.compactions)
+            hits, misses, appended, compactions = (now - before for now, before in zip(current, self.reported))
+            self.reported = current
+        self.shared_stats.add(hits, misses, appended, compactions)
+        return
+
+    def record(self, value: str, signature: str, verdict: bool) -> None:
+        """Buffers a new result; written to disk every flush_every results and on flush()."""
+        tag = self._tag(value, signature, verdict)
+        with self.thread_lock:
+            self.pending.append(tag)
+            full = len(self.pending) >= self.flush_every
+        if full:
+            self.flush()
+        return
+
+    def flush(self) -> None:
+        # flock sirf processes ko rokta hai; ek hi process ke threads ke liye thread_lock
+        with self.thread_lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, []
+            self._write(pending)
+        return
+
+    def _write(self, pending) -> None:
+        with self._locked():
+            magic, fingerprint, capacity, used, seq = _HEADER.unpack_from(self.mm, 0)
+            if used + len(pending) > self.capacity * _MAX_LOAD:
+                used = self._compact()
+            for tag in pending:
+                if self._insert(tag, seq):
+                    used += 1
+                    seq += 1
+                    self.appended += 1
+            _HEADER.pack_into(self.mm, 0, magic, fingerprint, capacity, used, seq)
+
+    def _insert(self, tag: bytes, seq: int) -> bool:
+        mm = self.mm
+        home = self._home(tag)
+        for probe in range(self.capacity):
+            offset = _HEADER_SIZE + ((home + probe) % self.capacity) * _SLOT.size
+            current = mm[offset:offset + 16]
+            if current == tag:
+                # Kisi aur worker ne pehle hi likh diya
+                return False
+            if current == _EMPTY:
+                # Sequence pehle, tag baad mein: tag likhte hi entry dikhne lagti hai
+                struct.pack_into("I", mm, offset + 16, seq & 0xFFFFFFFF)
+                mm[offset:offset + 16] = tag
+                return True
+        return False
+
+    def _compact(self) -> int:
+        """Drops all but the newest entries and re-inserts them (caller holds the lock)."""
+        entries = []
+        for slot in range(self.capacity):
+            tag, seq = _SLOT.unpack_from(self.mm, _HEADER_SIZE + slot * _SLOT.size)
+            if tag != _EMPTY:
+                entries.append((seq, tag))
+        entries.sort(reverse=True)
+        keep = entries[:int(self.capacity * _KEEP)]
+
+        self.mm[_HEADER_SIZE:self.size] = bytes(self.size - _HEADER_SIZE)
+        for seq, tag in keep:
+            self._insert(tag, seq)
+        self.compactions += 1
+        return len(keep)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "appended": self.appended, "compactions": self.compactions}
+
+    def close(self) -> None:
+        self.flush()
+        if self.shared_stats is not None:
+            self._publish()
+        self.mm.close()
+        os.close(self.fd)
+        return
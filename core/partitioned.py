@@ -0,0 +1,191 @@
+import heapq
+import zlib
+import queue as queue_module
+from .batching import PacketBatcher, unpack
+from .columnar import ColumnarBatch
+from .reorder import ReorderRing
+from .window_stats import WindowStats, DEFAULT_STATISTICS
+
+
+def partition_of(key, partitions: int) -> int:
+    # crc32, hash() nahi: hash har process mein alag seed se chalta hai
+    return zlib.crc32(str(key).encode('utf-8')) % partitions
+
+
+class AggregationRouter:
+    """
+    Front of the partitioned stateful stage. Packets arrive from the core
+    workers in any order; the router only tracks the id frontier (every id
+    below it has arrived or was skipped as lost) in a ReorderRing, O(1) per
+    packet, drops invalid placeholders
+    and forwards valid packets straight away to partition
+    crc32(partition_by) % N. Each message to a partition is (frontier,
+    packets), so a partition knows it already holds all of its packets
+    below frontier and can release them in order.
+
+    With ordered=False (an operation that does not care about order) there
+    is no frontier: packets are forwarded as (None, packets) on arrival.
+    """
+    def __init__(self, queue, partition_queues: list, partition_by: str = 'entity_name', start_id: int = 0, reorder=None, reorder_stats=None, ordered: bool = True) -> None:
+        self.queue = queue
+        self.ordered = ordered
+        self.partition_queues = partition_queues
+        self.partition_by = partition_by
+        # Ring sirf "aa gaya" marker rakhta hai, packets seedha partitions ko jaate hain
+        reorder = reorder or {}
+        self.ring = ReorderRing(start_id, reorder.get('max_window', 1 << 20), reorder.get('gap_timeout_s', 30.0), reorder_stats)
+        n = len(partition_queues)
+        # Har partition ko bheja gaya sab se bara id aur aakhri frontier
+        self.last_sent = [start_id - 1] * n
+        self.last_frontier = [start_id] * n
+        return
+
+    @property
+    def frontier(self) -> int:
+        return self.ring.expected_id
+
+    def route(self):
+        try:
+            n = len(self.partition_queues)
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.ring.time_left())
+                except queue_module.Empty:
+                    # Gap timeout: frontier aage badha, partitions ko bata do
+                    self.ring.expire()
+                    self._send([[] for _ in range(n)])
+                    continue
+                if item is None:
+                    for queue in self.partition_queues:
+                        queue.put(None)
+                    return
+
+                if not self.ordered:
+                    self._forward(item.rows() if isinstance(item, ColumnarBatch) else unpack(item))
+                    continue
+
+                contiguous = isinstance(item, ColumnarBatch) and item.is_contiguous()
+                if contiguous:
+                    late = item.first_id < self.frontier
+                    self.ring.push(item.first_id, True, len(item))
+                    if late:
+                        continue
+                packets = item.rows() if isinstance(item, ColumnarBatch) else unpack(item)
+
+                outgoing = [[] for _ in range(n)]
+                for packet in packets:
+                    if not contiguous:
+                        # Jis id ko gap timeout skip kar chuka, partition use order mein nahi rakh sakta (ring late ginta hai)
+                        late = packet["_id"] < self.frontier
+                        self.ring.push(packet["_id"], True)
+                        if late:
+                            continue
+                    # Invalid packet sirf sequence bharta tha, frontier mein gin liya, aage nahi jaata
+                    if packet.get("isValid"):
+                        outgoing[partition_of(packet.get(self.partition_by), n)].append(packet)
+                self._send(outgoing)
+        except KeyboardInterrupt:
+            pass
+
+    def _forward(self, packets) -> None:
+        n = len(self.partition_queues)
+        outgoing = [[] for _ in range(n)]
+        for packet in packets:
+            if packet.get("isValid"):
+                outgoing[partition_of(packet.get(self.partition_by), n)].append(packet)
+        for p, packets in enumerate(outgoing):
+            if packets:
+                self.partition_queues[p].put((None, packets))
+
+    def _send(self, outgoing: list) -> None:
+        for p, packets in enumerate(outgoing):
+            if packets:
+                self.last_sent[p] = max(self.last_sent[p], max(packet["_id"] for packet in packets))
+            elif self.frontier == self.last_frontier[p] or self.last_sent[p] < self.last_frontier[p]:
+                # Partition ke paas kuch ruka hua nahi, naya frontier bhejne ki zaroorat nahi
+                continue
+            self.last_frontier[p] = self.frontier
+            self.partition_queues[p].put((self.frontier, packets))
+
+
+class SensorAgregator:
+    """
+    One partition of the stateful stage: a reorder heap for its own packets
+    and a WindowStats engine per sensor. Outputs
+    {"entity_name": ..., "value": running average of that sensor}, plus
+    "windows" with the per-window statistics when windows are configured.
+    With event_windows the packets feed per-sensor event-time windows
+    instead, and each fired window is one output; "running_total" keeps a
+    count and sum per sensor. Messages with frontier None (unordered
+    operations) are processed on arrival.
+    """
+    def __init__(self, queue, output_queue, maxLen: int, partition_by: str = 'entity_name', batch_size: int = 1, batch_linger_ms: float = 0, windows=None, statistics=None, event_windows=None, operation: str = "running_average") -> None:
+        self.queue = queue
+        self.output = output_queue
+        self.maxLen = maxLen
+        self.partition_by = partition_by
+        self.batch_size = batch_size
+        self.batch_linger_ms = batch_linger_ms
+        self.pq = []
+        self.windows = windows
+        self.statistics = statistics or DEFAULT_STATISTICS
+        self.engines = {}
+        # Event-time windows grouped by partition_by; watermark is per partition
+        self.event_windows = event_windows
+        self.operation = operation
+        self.totals = {}
+        return
+
+    def agregate(self):
+        try:
+            batcher = PacketBatcher(self.output, self.batch_size, self.batch_linger_ms)
+            while True:
+                message = batcher.get(self.queue)
+                if message is None:
+                    # Stream khatam: jo bacha hai (gaps ke peeche) order mein nikaal do
+                    while self.pq:
+                        _, packet = heapq.heappop(self.pq)
+                        self._emit(packet, batcher)
+                    if self.event_windows is not None:
+                        for result in self.event_windows.flush():
+                            batcher.put(result)
+                    batcher.flush()
+                    # Output worker har partition ka None ginta hai
+                    self.output.put(None)
+                    return
+                frontier, packets = message
+                if frontier is None:
+                    # Unordered operation: heap ki zaroorat nahi
+                    for packet in packets:
+                        self._emit(packet, batcher)
+                    continue
+                for packet in packets:
+                    heapq.heappush(self.pq, (packet["_id"], packet))
+                while self.pq and self.pq[0][0] < frontier:
+                    _, packet = heapq.heappop(self.pq)
+                    self._emit(packet, batcher)
+        except KeyboardInterrupt:
+            pass
+
+    def _emit(self, packet, batcher) -> None:
+        if self.event_windows is None:
+            batcher.put(self._generate_output(packet))
+            return
+        for result in self.event_windows.add(packet):
+            batcher.put(result)
+
+    def _generate_output(self, packet):
+        entity = packet.get(self.partition_by)
+        if self.operation == "running_total":
+            count, total = self.totals.get(entity, (0, 0.0))
+            count, total = count + 1, total + float(packet['metric_value'])
+            self.totals[entity] = (count, total)
+            return {self.partition_by: entity, "count": count, "sum": total, "value": total / count}
+        engine = self.engines.get(entity)
+        if engine is None:
+            engine = self.engines[entity] = WindowStats([self.maxLen] + list(self.windows or []), self.statistics)
+        engine.push(float(packet['metric_value']))
+        output = {self.partition_by: entity, "value": engine.mean(self.maxLen)}
+        if self.windows is not None:
+            output["windows"] = engine.record(self.windows)
+        return output
@@ -0,0 +1,151 @@
+import heapq
+import time
+import multiprocessing as mp
+
+
+class ReorderStats:
+    """
+    Loss counters of the reorder buffers in shared memory, so the Telemetry
+    process can report them: ids skipped as lost, packets that arrived after
+    their id was skipped, gap timeouts and window overflows.
+    """
+    def __init__(self) -> None:
+        self.values = mp.Array('q', 4)
+        return
+
+    def add(self, skipped=0, late=0, timeouts=0, overflows=0) -> None:
+        values = self.values
+        with values.get_lock():
+            values[0] += skipped
+            values[1] += late
+            values[2] += timeouts
+            values[3] += overflows
+        return
+
+    def stats(self) -> dict:
+        skipped, late, timeouts, overflows = self.values[:]
+        return {"skipped_ids": skipped, "late_packets": late, "gap_timeouts": timeouts, "window_overflows": overflows}
+
+
+class ReorderRing:
+    """
+    Releases units (a packet, or a contiguous batch spanning several ids) in
+    _id order. A unit waits in slot _id % capacity, so insert and release
+    are O(1) and memory is fixed at capacity slots.
+
+    A missing id no longer blocks forever:
+    - a unit more than capacity ids ahead of expected_id pushes the window
+      forward, skipping the missing ids it passes (window overflow)
+    - when expected_id has been missing for gap_timeout seconds while later
+      units wait, it and the ids up to the next waiting unit are skipped
+    Skipped ids are counted in stats; a unit that arrives after its id was
+    skipped, or a second unit for an id already waiting, is dropped and
+    counted as late.
+
+    Units that have to wait are also kept in a min-heap of their ids, so a
+    skip finds the next waiting unit in O(log n) instead of scanning the
+    (by default million-slot) window.
+    """
+    def __init__(self, start_id: int = 0, capacity: int = 1 << 20, gap_timeout=None, stats=None) -> None:
+        self.expected_id = start_id
+        self.capacity = max(1, int(capacity))
+        self.gap_timeout = gap_timeout
+        self.stats = stats
+        self.slots = [None] * self.capacity
+        self.spans = [1] * self.capacity
+        self.count = 0
+        self.waiting = []  # heap of first_ids of waiting units, stale ones popped lazily
+        self.waiting_since = None
+        return
+
+    def push(self, first_id: int, unit, span: int = 1) -> list:
+        """Stores a unit and returns every unit that can now be released, in order."""
+        offset = first_id - self.expected_id
+        if offset < 0:
+            if self.stats is not None:
+                self.stats.add(late=span)
+            return []
+        released = []
+        if offset + span > self.capacity:
+            # Window se bahar: expected ko itna aage karo ke ye unit fit ho jaaye
+            released = self._skip_to(first_id + span - self.capacity)
+            if self.stats is not None:
+                self.stats.add(overflows=1)
+        slot = first_id % self.capacity
+        if self.slots[slot] is not None:
+            # Duplicate _id: pehla wala rehne do, warna count kabhi 0 nahi hoga
+            if self.stats is not None:
+                self.stats.add(late=span)
+            return released
+        self.slots[slot] = unit
+        self.spans[slot] = span
+        self.count += 1
+        if first_id != self.expected_id:
+            heapq.heappush(self.waiting, first_id)
+        released.extend(self._release())
+        return released
+
+    def _release(self) -> list:
+        released = []
+        slots = self.slots
+        while self.count:
+            slot = self.expected_id % self.capacity
+            unit = slots[slot]
+            if unit is None:
+                break
+            slots[slot] = None
+            self.count -= 1
+            self.expected_id += self.spans[slot]
+            released.append(unit)
+        waiting = self.waiting
+        while waiting and waiting[0] < self.expected_id:
+            heapq.heappop(waiting)
+        if not self.count:
+            self.waiting_since = None
+        elif released or self.waiting_since is None:
+            # Naya gap shuru hua: expected_id abhi se missing hai
+            self.waiting_since = time.monotonic()
+        return released
+
+    def _skip_to(self, target: int) -> list:
+        """Moves expected_id up to target, releasing waiting units on the way and skipping the rest."""
+        released = []
+        skipped = 0
+        while self.count and self.expected_id < target:
+            ready = self._release()
+            if ready:
+                released.extend(ready)
+                continue
+            # Seedha agle waiting unit (ya target) tak chhalaang
+            step = min(self.waiting[0], target) - self.expected_id
+            self.expected_id += step
+            skipped += step
+        if self.expected_id < target:
+            skipped += target - self.expected_id
+            self.expected_id = target
+        if skipped and self.stats is not None:
+            self.stats.add(skipped=skipped)
+        return released
+
+    def time_left(self):
+        """Seconds until the current gap times out, or None when nothing is waiting on one."""
+        if self.gap_timeout is None or self.waiting_since is None:
+            return None
+        return max(0.0, self.waiting_since + self.gap_timeout - time.monotonic())
+
+    def expire(self) -> list:
+        """Skips the missing ids in front of the next waiting unit if the gap has timed out."""
+        wait = self.time_left()
+        if wait is None or wait > 0:
+            return []
+        if self.stats is not None:
+            self.stats.add(timeouts=1)
+        return self._skip_to(self.waiting[0]) + self._release()
+
+    def drain(self) -> list:
+        """End of stream: releases everything still waiting, skipping the gaps in between."""
+        released = []
+        while self.count:
+            released.extend(self._skip_to(self.waiting[0]))
+            released.extend(self._release())
+        return released
@@ -0,0 +1,87 @@
+import os
+import pickle
+import struct
+import queue as queue_module
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+# head (next slot to read) and tail (next slot to write), both monotonically increasing
+_HEADER = struct.Struct("QQ")
+_LENGTH = struct.Struct("I")
+
+
+class SharedMemoryQueue:
+    """
+    Bounded multi-producer / multi-consumer queue backed by a shared-memory ring buffer.
+
+    Every item is pickled straight into a fixed-size slot, so a put/get is a
+    pickle, one memcpy and a couple of futex-backed semaphore operations -
+    no manager process and no socket round trip. The slot count is the queue
+    capacity, which keeps the same backpressure as a Queue(maxsize=...).
+    The API mirrors queue.Queue (put/get with block and timeout, qsize) so
+    the pipeline stages can use it without changes.
+    """
+    def __init__(self, maxsize: int, slot_size: int = 65536) -> None:
+        if maxsize <= 0:
+            raise ValueError("SharedMemoryQueue needs a bounded maxsize")
+        self.capacity = maxsize
+        self.slot_size = slot_size
+        self.stride = _LENGTH.size + slot_size
+        self.shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + maxsize * self.stride)
+        _HEADER.pack_into(self.shm.buf, 0, 0, 0)
+        self.free_slots = mp.Semaphore(maxsize)
+        self.used_slots = mp.Semaphore(0)
+        self.put_lock = mp.Lock()
+        self.get_lock = mp.Lock()
+        self.owner_pid = os.getpid()
+        return
+
+    def put(self, obj, block: bool = True, timeout=None) -> None:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.slot_size:
+            raise ValueError(f"Item of {len(data)} bytes does not fit a {self.slot_size} byte slot (raise shm_slot_bytes)")
+        if not self.free_slots.acquire(block, timeout):
+            raise queue_module.Full
+        buf = self.shm.buf
+        with self.put_lock:
+            head, tail = _HEADER.unpack_from(buf, 0)
+            offset = _HEADER.size + (tail % self.capacity) * self.stride
+            _LENGTH.pack_into(buf, offset, len(data))
+            buf[offset + _LENGTH.size:offset + _LENGTH.size + len(data)] = data
+            struct.pack_into("Q", buf, 8, tail + 1)
+        self.used_slots.release()
+
+    def get(self, block: bool = True, timeout=None):
+        if not self.used_slots.acquire(block, timeout):
+            raise queue_module.Empty
+        buf = self.shm.buf
+        with self.get_lock:
+            head = struct.unpack_from("Q", buf, 0)[0]
+            offset = _HEADER.size + (head % self.capacity) * self.stride
+            (length,) = _LENGTH.unpack_from(buf, offset)
+            data = bytes(buf[offset + _LENGTH.size:offset + _LENGTH.size + length])
+            struct.pack_into("Q", buf, 0, head + 1)
+        self.free_slots.release()
+        return pickle.loads(data)
+
+    def put_nowait(self, obj) -> None:
+        self.put(obj, block=False)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        head, tail = _HEADER.unpack_from(self.shm.buf, 0)
+        return tail - head
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        return self.qsize() >= self.capacity
+
+    def close(self) -> None:
+        """Detaches this process from the ring; the creating process also frees the segment."""
+        self.shm.close()
+        if os.getpid() == self.owner_pid:
+            self.shm.unlink()
@@ -0,0 +1,225 @@
+import hmac
+import hashlib
+import multiprocessing as mp
+from abc import ABC, abstractmethod
+from .hash_function import derive_signature
+
+
+class Signer(ABC):
+    """
+    One signature algorithm with its parameters. derive() returns the raw
+    digest of a value, and variant() names the algorithm + parameters so the
+    verification cache and ledger never mix results of different settings.
+    A subclass that doesn't implement derive() can't be instantiated.
+    """
+    name = None
+
+    def __init__(self, key: str, params: dict) -> None:
+        self.key = key
+        self.key_bytes = key.encode('utf-8')
+        self.params = params
+        return
+
+    @abstractmethod
+    def derive(self, value: str) -> bytes:
+        """Raw digest of value under this key and parameters."""
+
+    def variant(self):
+        return self.name
+
+    def sign(self, value: str) -> str:
+        return self.derive(value).hex()
+
+    def verify(self, hash_val: str, value: str, cache=None, key_id=None, time_period=None) -> bool:
+        # key_id/time_period sirf KeyRing ke liye hain, ek key ke saath koi choice nahi
+        if cache is None:
+            digest = self.derive(value)
+        else:
+            # Same value ka derivation dobara na chalao, shared cache se utha lo
+            digest = cache.get(value, self.key, self.variant())
+            if digest is None:
+                digest = self.derive(value)
+                cache.put(value, self.key, self.variant(), digest)
+        return hmac.compare_digest(digest.hex(), hash_val)
+
+
+class Pbkdf2Signer(Signer):
+    """PBKDF2-HMAC-SHA256, key as password and value as salt (the original scheme)."""
+    name = "pbkdf2_hmac"
+
+    def __init__(self, key: str, params: dict) -> None:
+        super().__init__(key, params)
+        self.iterations = int(params.get('iterations', 100000))
+        return
+
+    def derive(self, value: str) -> bytes:
+        return derive_signature(value, self.key, self.iterations)
+
+    def variant(self):
+        # Sirf iterations, taake purane ledger files ka fingerprint na badle
+        return self.iterations
+
+
+class HmacSha256Signer(Signer):
+    """Single HMAC-SHA256 pass over the value."""
+    name = "hmac_sha256"
+
+    def derive(self, value: str) -> bytes:
+        return hmac.new(self.key_bytes, value.encode('utf-8'), hashlib.sha256).digest()
+
+
+class Blake2bSigner(Signer):
+    """Keyed BLAKE2b (a MAC by itself, no HMAC wrapper), 32-byte digest unless digest_size says otherwise."""
+    name = "blake2b"
+
+    def __init__(self, key: str, params: dict) -> None:
+        super().__init__(key, params)
+        if len(self.key_bytes) > hashlib.blake2b.MAX_KEY_SIZE:
+            raise ValueError(f"blake2b secret_key must be at most {hashlib.blake2b.MAX_KEY_SIZE} bytes")
+        self.digest_size = int(params.get('digest_size', 32))
+        if not 1 <= self.digest_size <= hashlib.blake2b.MAX_DIGEST_SIZE:
+            raise ValueError(f"blake2b digest_size must be between 1 and {hashlib.blake2b.MAX_DIGEST_SIZE}")
+        return
+
+    def derive(self, value: str) -> bytes:
+        return hashlib.blake2b(value.encode('utf-8'), key=self.key_bytes, digest_size=self.digest_size).digest()
+
+    def variant(self):
+        return f"blake2b:{self.digest_size}"
+
+
+class ScryptSigner(Signer):
+    """scrypt, key as password and value as salt; memory-hard, cost set by n, r and p."""
+    name = "scrypt"
+
+    def __init__(self, key: str, params: dict) -> None:
+        super().__init__(key, params)
+        self.n = int(params.get('n', 16384))
+        self.r = int(params.get('r', 8))
+        self.p = int(params.get('p', 1))
+        # scrypt ko 128*n*r bytes chahiye, default maxmem (32 MiB) bade n pe fail ho jaata hai
+        self.maxmem = 2 * 128 * self.n * self.r * self.p + 1024 * 1024
+        return
+
+    def derive(self, value: str) -> bytes:
+        return hashlib.scrypt(self.key_bytes, salt=value.encode('utf-8'), n=self.n, r=self.r, p=self.p,
+                              maxmem=self.maxmem, dklen=32)
+
+    def variant(self):
+        return f"scrypt:{self.n}:{self.r}:{self.p}"
+
+
+class KeyRing:
+    """
+    Several secret keys of one algorithm, for key rotation. Each key has an
+    id and an optional validity period [valid_from, valid_until) in
+    time_period units.
+
+    A packet is checked first against its hinted key - the one named in its
+    key id field, or else the keys valid at its time_period, newest first -
+    and only then against the remaining keys, so a rotation window costs
+    about one derivation per packet instead of one per key. A signature is
+    accepted if any key matches; the validity period only orders the tries.
+
+    Per-key counters (matched on the first try, matched after a fallback,
+    tries) live in shared memory, so one KeyRing created before the workers
+    start reports totals over all of them.
+    """
+    def __init__(self, algorithm: str, params: dict, keys: list) -> None:
+        self.ids = []
+        self.signers = []
+        self.periods = []
+        for entry in sorted(keys, key=lambda k: k.get('valid_from') or 0, reverse=True):
+            if entry['id'] in self.ids:
+                raise ValueError(f"Duplicate key id '{entry['id']}'")
+            self.ids.append(entry['id'])
+            self.signers.append(ALGORITHMS[algorithm](entry['secret_key'], params))
+            self.periods.append((entry.get('valid_from'), entry.get('valid_until')))
+        if not self.signers:
+            raise ValueError("keys must list at least one key")
+        self.index = {key_id: i for i, key_id in enumerate(self.ids)}
+        # Ledger fingerprint poore key set ka, kisi bhi key ke badalne pe ledger reset
+        self.key = "\0".join(f"{key_id}={signer.key}" for key_id, signer in zip(self.ids, self.signers))
+        # Har key ke liye: first-try hits, fallback hits, tries; aakhir mein rejected packets
+        self.counters = mp.Array('Q', 3 * len(self.signers) + 1)
+        return
+
+    def variant(self):
+        return self.signers[0].variant()
+
+    def sign(self, value: str, key_id=None) -> str:
+        return self.signers[self.index[key_id] if key_id is not None else 0].sign(value)
+
+    def _valid_at(self, i: int, time_period) -> bool:
+        valid_from, valid_until = self.periods[i]
+        return (valid_from is None or time_period >= valid_from) and (valid_until is None or time_period < valid_until)
+
+    def candidates(self, key_id=None, time_period=None) -> list:
+        """Key indexes in the order they are tried for a packet with these hints."""
+        if key_id is not None and key_id in self.index:
+            hinted = [self.index[key_id]]
+        elif time_period is not None:
+            hinted = [i for i in range(len(self.signers)) if self._valid_at(i, time_period)]
+        else:
+            hinted = []
+        return hinted + [i for i in range(len(self.signers)) if i not in hinted]
+
+    def verify(self, hash_val: str, value: str, cache=None, key_id=None, time_period=None) -> bool:
+        order = self.candidates(key_id, time_period)
+        for tries, i in enumerate(order, start=1):
+            if self.signers[i].verify(hash_val, value, cache):
+                self._count(i, tries)
+                return True
+        self._count(None, len(order))
+        return False
+
+    def _count(self, matched, tries: int) -> None:
+        counters = self.counters
+        with counters.get_lock():
+            if matched is None:
+                counters[-1] += 1
+            else:
+                counters[3 * matched + (0 if tries == 1 else 1)] += 1
+                counters[3 * matched + 2] += tries
+
+    def stats(self) -> dict:
+        """Per-key hits and the average number of derivations per packet."""
+        counters = self.counters[:]
+        keys = {}
+        packets = counters[-1]
+        tries = 0
+        for i, key_id in enumerate(self.ids):
+            first, fallback, key_tries = counters[3 * i:3 * i + 3]
+            keys[key_id] = {"hits": first + fallback, "fallback_hits": fallback}
+            packets += first + fallback
+            tries += key_tries
+        # Rejected packets ne har key try ki
+        tries += counters[-1] * len(self.ids)
+        return {
+            "keys": keys,
+            "rejected": counters[-1],
+            "tries_per_packet": tries / packets if packets else 0.0,
+        }
+
+
+ALGORITHMS = {signer.name: signer for signer in (Pbkdf2Signer, HmacSha256Signer, Blake2bSigner, ScryptSigner)}
+OPERATIONS = ("verify_signature",)
+
+
+def resolve_signer(stateless_config: dict):
+    """
+    Builds the Signer that processing.stateless_tasks asks for, or a KeyRing
+    when it lists "keys". Parameters come from "algorithm_params"; PBKDF2
+    still reads the top-level "iterations" unless algorithm_params overrides it.
+    """
+    operation = stateless_config.get('operation', 'verify_signature')
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown stateless operation '{operation}', expected one of {OPERATIONS}")
+    algorithm = stateless_config.get('algorithm', 'pbkdf2_hmac')
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown signature algorithm '{algorithm}', expected one of {tuple(ALGORITHMS)}")
+    params = dict(stateless_config.get('algorithm_params', {}))
+    params.setdefault('iterations', stateless_config.get('iterations', 100000))
+    if stateless_config.get('keys'):
+        return KeyRing(algorithm, params, stateless_config['keys'])
+    return ALGORITHMS[algorithm](stateless_config['secret_key'], params)
@@ -6,9 +6,25 @@ class Telemetry:
         self.agregate = agregate_queue
         self.output = output_queue
         self.observers = []
+        self.sources = {}
         self.stop_event = mp.Event()   
     def get_data(self):
-        return self.input.qsize(), self.agregate.qsize(), self.output.qsize()
+        sizes = (self._size(self.input), self._size(self.agregate), self._size(self.output))
+        if not self.sources:
+            return sizes
+        # Extra stats (e.g. verification cache hits) go as a dict after the queue sizes
+        return sizes + ({name: source() for name, source in self.sources.items()},)
+
+    def add_source(self, name, source):
+        """Registers a callable whose return value is reported under name with every poll."""
+        self.sources[name] = source
+
+    def _size(self, queue):
+        # Every transport in core.transport reports a size, but a bare queue may not (macOS mp.Queue)
+        try:
+            return queue.qsize()
+        except (NotImplementedError, AttributeError):
+            return -1
 
     def subscribe(self, observer):
         self.observers.append(observer)
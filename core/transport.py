@@ -0,0 +1,201 @@
+import sys
+import time
+import pickle
+import queue as queue_module
+import multiprocessing as mp
+from .shm_queue import SharedMemoryQueue
+
+
+class CountedTransport:
+    """
+    Base for the lightweight transports whose own qsize() is missing or unreliable
+    (SimpleQueue and Pipe have none, mp.Queue raises NotImplementedError on macOS).
+    A shared counter is bumped on every put/get so Telemetry can always read a size.
+    It is raised before the item goes in and lowered after it came out, so a
+    consumer that gets an item right away can never drive it below 0.
+    """
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.count = mp.Value('l', 0)
+        return
+
+    def put(self, obj, block: bool = True, timeout=None) -> None:
+        with self.count.get_lock():
+            self.count.value += 1
+        try:
+            self._put(obj, block, timeout)
+        except Exception:
+            # Full (or a broken pipe): the item never went in
+            with self.count.get_lock():
+                self.count.value -= 1
+            raise
+
+    def get(self, block: bool = True, timeout=None):
+        obj = self._get(block, timeout)
+        with self.count.get_lock():
+            self.count.value -= 1
+        return obj
+
+    def put_nowait(self, obj) -> None:
+        self.put(obj, block=False)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def qsize(self) -> int:
+        return self.count.value
+
+    def empty(self) -> bool:
+        return self.qsize() <= 0
+
+    def full(self) -> bool:
+        return self.qsize() >= self.maxsize
+
+    def close(self) -> None:
+        return
+
+    def _put(self, obj, block, timeout):
+        raise NotImplementedError
+
+    def _get(self, block, timeout):
+        raise NotImplementedError
+
+
+class MpQueueTransport(CountedTransport):
+    """Plain multiprocessing.Queue: a pipe plus a feeder thread, natively bounded."""
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.queue = mp.Queue(maxsize=maxsize)
+        return
+
+    def _put(self, obj, block, timeout):
+        self.queue.put(obj, block, timeout)
+
+    def _get(self, block, timeout):
+        return self.queue.get(block, timeout)
+
+
+class PipeTransport(CountedTransport):
+    """
+    One-way Pipe shared by all producers and consumers. Locks serialise the two
+    ends and a semaphore of free slots restores the maxsize backpressure that
+    a bare pipe doesn't have. Items are sent as pickled bytes straight from the
+    calling thread, with no feeder thread in between.
+    """
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.reader, self.writer = mp.Pipe(duplex=False)
+        self.read_lock = mp.Lock()
+        self.write_lock = mp.Lock()
+        self.free_slots = mp.Semaphore(maxsize)
+        return
+
+    def _put(self, obj, block, timeout):
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        if not self.free_slots.acquire(block, timeout):
+            raise queue_module.Full
+        with self.write_lock:
+            self.writer.send_bytes(data)
+
+    def _get(self, block, timeout):
+        data = _recv_bytes(self.reader, self.read_lock, block, timeout)
+        self.free_slots.release()
+        return pickle.loads(data)
+
+
+class SimpleQueueTransport(CountedTransport):
+    """multiprocessing.SimpleQueue, bounded by a semaphore of free slots."""
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.queue = mp.SimpleQueue()
+        self.free_slots = mp.Semaphore(maxsize)
+        return
+
+    def _put(self, obj, block, timeout):
+        if not self.free_slots.acquire(block, timeout):
+            raise queue_module.Full
+        self.queue.put(obj)
+
+    def _get(self, block, timeout):
+        if block and timeout is None:
+            obj = self.queue.get()
+        else:
+            # SimpleQueue.get() can't time out, so wait on its reader end ourselves
+            obj = pickle.loads(_recv_bytes(self.queue._reader, self.queue._rlock, block, timeout))
+        self.free_slots.release()
+        return obj
+
+
+def _recv_bytes(reader, lock, block, timeout):
+    deadline = None if timeout is None else time.monotonic() + timeout
+    if not lock.acquire(block, timeout):
+        raise queue_module.Empty
+    try:
+        if not block:
+            ready = reader.poll()
+        elif deadline is None:
+            ready = True
+        else:
+            ready = reader.poll(max(0.0, deadline - time.monotonic()))
+        if not ready:
+            raise queue_module.Empty
+        return reader.recv_bytes()
+    finally:
+        lock.release()
+
+
+TRANSPORTS = ("manager", "mp_queue", "simple_queue", "pipe", "shared_memory")
+
+
+def resolve_transport(name: str = "auto", start_method: str = None) -> str:
+    """
+    Maps "auto" to the cheapest transport for this platform and start method.
+    Everything but the Manager needs the queues handed to child processes at
+    creation time, which all start methods do for Process arguments; the
+    Manager stays the fallback off Linux, where it is the tested path.
+    """
+    if name != "auto":
+        if name not in TRANSPORTS:
+            raise ValueError(f"Unknown queue transport '{name}', expected one of {TRANSPORTS + ('auto',)}")
+        return name
+    if not sys.platform.startswith("linux"):
+        return "manager"
+    start_method = start_method or mp.get_start_method()
+    if start_method == "fork":
+        return "shared_memory"
+    # Under spawn/forkserver every child re-attaches the segments; a pipe is cheaper to hand over
+    return "pipe"
+
+
+class QueueFactory:
+    """Creates the pipeline queues for one transport and owns their cleanup."""
+    def __init__(self, transport: str = "manager", shm_slot_bytes: int = 65536) -> None:
+        self.transport = resolve_transport(transport)
+        self.shm_slot_bytes = shm_slot_bytes
+        self.manager = None
+        self.queues = []
+        return
+
+    def create(self, maxsize: int):
+        if self.transport == "manager":
+            if self.manager is None:
+                self.manager = mp.Manager()
+            q = self.manager.Queue(maxsize=maxsize)
+        elif self.transport == "shared_memory":
+            q = SharedMemoryQueue(maxsize, self.shm_slot_bytes)
+        elif self.transport == "mp_queue":
+            q = MpQueueTransport(maxsize)
+        elif self.transport == "simple_queue":
+            q = SimpleQueueTransport(maxsize)
+        else:
+            q = PipeTransport(maxsize)
+        self.queues.append(q)
+        return q
+
+    def close(self) -> None:
+        for q in self.queues:
+            if hasattr(q, "close") and self.transport != "manager":
+                q.close()
+        if self.manager is not None:
+            self.manager.shutdown()
+        self.queues = []
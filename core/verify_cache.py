@@ -0,0 +1,125 @@
+import os
+import struct
+import hashlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+# Ek entry: tag (16) + derived digest (64 tak) + digest length + reference bit + used flag, 96 bytes tak padded.
+# Length zaroori hai: blake2b ka digest_size 1-64 bytes ho sakta hai
+_ENTRY = struct.Struct("16s64sBBB13x")
+_COUNTERS = struct.Struct("QQQ")  # hits, misses, evictions
+_WAYS = 8
+_MAX_STRIPES = 64
+
+
+class VerificationCache:
+    """
+    Fixed-size hash table in shared memory that remembers PBKDF2 results
+    across all CoreLogic processes.
+
+    Keyed on (value string, secret key, variant) - stored as a 16-byte
+    blake2b tag - and holding the derived digest (up to 64 bytes, stored
+    with its length), so a repeated
+    metric_value costs a lookup instead of a full key derivation. The
+    variant names the algorithm and its parameters (Signer.variant(); the
+    iteration count for PBKDF2).
+
+    The table is 8-way set associative: a tag can only live in one set of 8
+    slots, and each set evicts with its own CLOCK hand (a slot whose
+    reference bit is set gets a second chance). Sets are guarded by a fixed
+    number of lock stripes, and hit/miss/eviction counters are kept per
+    stripe under the same lock, so workers never contend on one counter.
+    """
+    def __init__(self, capacity: int = 65536) -> None:
+        self.sets = max(1, -(-capacity // _WAYS))
+        self.capacity = self.sets * _WAYS
+        self.stripes = min(_MAX_STRIPES, self.sets)
+        self.entries_offset = self.stripes * _COUNTERS.size
+        self.hands_offset = self.entries_offset + self.capacity * _ENTRY.size
+        size = self.hands_offset + self.sets
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.shm.buf[:size] = bytes(size)
+        self.locks = [mp.Lock() for _ in range(self.stripes)]
+        self.owner_pid = os.getpid()
+        return
+
+    @staticmethod
+    def _tag(value: str, key: str, variant) -> bytes:
+        return hashlib.blake2b(f"{variant}\0{key}\0{value}".encode('utf-8'), digest_size=16).digest()
+
+    def _locate(self, tag: bytes):
+        set_index = int.from_bytes(tag[:8], 'little') % self.sets
+        return set_index, self.locks[set_index % self.stripes], (set_index % self.stripes) * _COUNTERS.size
+
+    def _count(self, counter_offset: int, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        buf = self.shm.buf
+        h, m, e = _COUNTERS.unpack_from(buf, counter_offset)
+        _COUNTERS.pack_into(buf, counter_offset, h + hits, m + misses, e + evictions)
+
+    def get(self, value: str, key: str, variant):
+        """Returns the cached digest, or None on a miss."""
+        tag = self._tag(value, key, variant)
+        set_index, lock, counter_offset = self._locate(tag)
+        buf = self.shm.buf
+        base = self.entries_offset + set_index * _WAYS * _ENTRY.size
+        with lock:
+            for way in range(_WAYS):
+                offset = base + way * _ENTRY.size
+                entry_tag, digest, length, _, used = _ENTRY.unpack_from(buf, offset)
+                if used and entry_tag == tag:
+                    _ENTRY.pack_into(buf, offset, entry_tag, digest, length, 1, 1)
+                    self._count(counter_offset, hits=1)
+                    return digest[:length]
+            self._count(counter_offset, misses=1)
+        return None
+
+    def put(self, value: str, key: str, variant, digest: bytes) -> None:
+        tag = self._tag(value, key, variant)
+        set_index, lock, counter_offset = self._locate(tag)
+        buf = self.shm.buf
+        base = self.entries_offset + set_index * _WAYS * _ENTRY.size
+        hand_offset = self.hands_offset + set_index
+        with lock:
+            free = None
+            for way in range(_WAYS):
+                entry_tag, _, _, _, used = _ENTRY.unpack_from(buf, base + way * _ENTRY.size)
+                if used and entry_tag == tag:
+                    # Doosre worker ne beech mein hi daal diya
+                    return
+                if not used and free is None:
+                    free = way
+            if free is None:
+                # CLOCK: reference bit wale slot ko ek aur chance, warna nikal do
+                hand = buf[hand_offset]
+                while True:
+                    offset = base + hand * _ENTRY.size
+                    entry_tag, old_digest, old_length, ref, used = _ENTRY.unpack_from(buf, offset)
+                    if not ref:
+                        break
+                    _ENTRY.pack_into(buf, offset, entry_tag, old_digest, old_length, 0, used)
+                    hand = (hand + 1) % _WAYS
+                free = hand
+                buf[hand_offset] = (hand + 1) % _WAYS
+                self._count(counter_offset, evictions=1)
+            _ENTRY.pack_into(buf, base + free * _ENTRY.size, tag, digest, len(digest), 1, 1)
+        return
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction totals over all stripes (read without locking, good enough for telemetry)."""
+        hits = misses = evictions = 0
+        for stripe in range(self.stripes):
+            h, m, e = _COUNTERS.unpack_from(self.shm.buf, stripe * _COUNTERS.size)
+            hits, misses, evictions = hits + h, misses + m, evictions + e
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self.shm.close()
+        if os.getpid() == self.owner_pid:
+            self.shm.unlink()
+        return
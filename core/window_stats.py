@@ -0,0 +1,128 @@
+import math
+from collections import deque
+
+STATISTICS = ("mean", "variance", "std", "min", "max", "count")
+DEFAULT_STATISTICS = ("mean", "std", "min", "max")
+
+
+class SlidingWindow:
+    """
+    Statistics over the last `size` values, updated in O(1) per value:
+    - sum with Neumaier compensation, recomputed exactly with math.fsum
+      every `size` evictions so rounding error can't build up
+    - Welford mean/M2 with the reverse update for the value that leaves
+      (M2 is re-based at the same time as the sum)
+    - monotonic deques of (index, value) for min and max
+    """
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.count = 0
+        self.sum = 0.0
+        self.comp = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.evictions = 0
+        self.minq = deque()
+        self.maxq = deque()
+        return
+
+    def _add_sum(self, x: float) -> None:
+        t = self.sum + x
+        if abs(self.sum) >= abs(x):
+            self.comp += (self.sum - t) + x
+        else:
+            self.comp += (x - t) + self.sum
+        self.sum = t
+
+    def push(self, index: int, x: float, leaving, history) -> None:
+        """Adds value number `index`; `leaving` is the value that drops out (None while filling)."""
+        self.count += 1
+        self._add_sum(x)
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+        while self.maxq and self.maxq[-1][1] <= x:
+            self.maxq.pop()
+        self.maxq.append((index, x))
+        while self.minq and self.minq[-1][1] >= x:
+            self.minq.pop()
+        self.minq.append((index, x))
+
+        if leaving is not None:
+            self.count -= 1
+            self._add_sum(-leaving)
+            delta = leaving - self.mean
+            self.mean -= delta / self.count
+            self.m2 -= delta * (leaving - self.mean)
+            oldest = index - self.size
+            if self.maxq[0][0] <= oldest:
+                self.maxq.popleft()
+            if self.minq[0][0] <= oldest:
+                self.minq.popleft()
+            self.evictions += 1
+            if self.evictions >= self.size:
+                # Har `size` evictions ke baad exact dobara gino, drift wahin khatam
+                self._recompute(history.last(self.size))
+
+    def _recompute(self, window: list) -> None:
+        self.evictions = 0
+        self.sum = math.fsum(window)
+        self.comp = 0.0
+        self.mean = self.sum / len(window)
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in window)
+
+    def stats(self, names) -> dict:
+        n = self.count
+        variance = max(self.m2, 0.0) / (n - 1) if n > 1 else 0.0
+        values = {
+            "mean": (self.sum + self.comp) / n,
+            "variance": variance,
+            "std": math.sqrt(variance),
+            "min": self.minq[0][1],
+            "max": self.maxq[0][1],
+            "count": n,
+        }
+        return {name: values[name] for name in names}
+
+
+class WindowStats:
+    """
+    Several SlidingWindows (e.g. 10, 100 and 1000 values) fed in one pass
+    from a shared ring of the last max(sizes) values, so every new value is
+    O(1) per window no matter how large the windows are.
+    """
+    def __init__(self, sizes, statistics=DEFAULT_STATISTICS) -> None:
+        self.sizes = sorted(set(sizes))
+        if not self.sizes or any(not isinstance(s, int) or isinstance(s, bool) or s < 1 for s in self.sizes):
+            raise ValueError(f"window sizes must be integers >= 1, got {list(sizes)}")
+        unknown = [name for name in statistics if name not in STATISTICS]
+        if unknown:
+            raise ValueError(f"unknown statistics {unknown}, expected some of {list(STATISTICS)}")
+        self.statistics = tuple(statistics)
+        self.capacity = self.sizes[-1] + 1
+        self.ring = [0.0] * self.capacity
+        self.index = 0
+        self.windows = [SlidingWindow(size) for size in self.sizes]
+        return
+
+    def last(self, size: int) -> list:
+        """The newest `size` values, oldest first."""
+        end = self.index + 1
+        return [self.ring[i % self.capacity] for i in range(end - size, end)]
+
+    def push(self, x: float) -> None:
+        index = self.index
+        self.ring[index % self.capacity] = x
+        for window in self.windows:
+            leaving = self.ring[(index - window.size) % self.capacity] if index >= window.size else None
+            window.push(index, x, leaving, self)
+        self.index += 1
+
+    def mean(self, size: int) -> float:
+        window = self.windows[self.sizes.index(size)]
+        return (window.sum + window.comp) / window.count
+
+    def record(self, sizes=None) -> dict:
+        """All requested statistics of every window (or just `sizes`), keyed by window size."""
+        return {str(window.size): window.stats(self.statistics) for window in self.windows if sizes is None or window.size in sizes}
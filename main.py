@@ -9,29 +9,49 @@ import json
 import multiprocessing as mp
 from core import Observer,Telemetry
 from core import CoreManager
-from core import Agregator
+from core import Agregator, needs_ordering
+from core import AggregationRouter, SensorAgregator
+from core import ReorderStats
+from core import EventTimeWindows, EventWindowStats
+from core import BlockDealer, ChannelMerge
+from core import unpack
+from core import QueueFactory
+from core import VerificationCache, LedgerStats
+from core import resolve_signer, KeyRing
 # from plugins.outputs import ConsoleConsumer, GUIConsumer
 from plugins.inputs.input_validator import InputValidator
-from plugins.inputs.generic_producer import GenericInputProducer
+from plugins.inputs.generic_producer import GenericInputProducer, ProducerError
+from plugins.inputs.sharded_producer import ShardedInputProducer
+from plugins.inputs.network_producer import NetworkInputProducer
+from plugins.inputs.dataset_files import resolve_dataset_files
+from plugins.inputs.compression import detect_compression
+from plugins.inputs.follow import FollowCheckpoint
 from multiprocessing.managers import BaseManager
 import subprocess
 import time
 import socket
 
+logger = logging.getLogger(__name__)
+
 # Create UDP sockets for sensor data and telemetry
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 UDP_IP = "127.0.0.1"
 UDP_PORT = 5005
 TELEMETRY_PORT = 5006
 
-def worker(output_queue):
+def worker(output_queue, sentinels=1):
+    # Partitioned aggregation mein har partition apna None bhejta hai
     while True:
         data = output_queue.get()
         if data is None:
-            return
+            sentinels -= 1
+            if sentinels <= 0:
+                return
+            continue
         time.sleep(0.01)
-        message = json.dumps(data).encode('utf-8')
-        sock.sendto(message, (UDP_IP, UDP_PORT))
+        for value in unpack(data):
+            message = json.dumps(value).encode('utf-8')
+            sock.sendto(message, (UDP_IP, UDP_PORT))
 
 class Observer_Telemetry(Observer):
     def __init__(self, telemetry_socket=None):
@@ -42,12 +62,16 @@ class Observer_Telemetry(Observer):
 
         if self.telemetry_socket:
             try:
-                telemetry_packet = json.dumps({
+                telemetry = {
                     "input_queue_size": data[0],
                     "agregator_queue_size": data[1],
                     "output_queue_size": data[2],
                     "timestamp": time.time()
-                }).encode('utf-8')
+                }
+                if len(data) > 3:
+                    # Extra Telemetry sources, e.g. verify_cache hit/miss counters
+                    telemetry.update(data[3])
+                telemetry_packet = json.dumps(telemetry).encode('utf-8')
                 self.telemetry_socket.sendto(telemetry_packet, (UDP_IP, TELEMETRY_PORT))
             except Exception as e:
                 print(f"[Telemetry] Error sending UDP packet: {e}")
@@ -55,7 +79,10 @@ class Observer_Telemetry(Observer):
 class Pipeline:
     def __init__(self,config):
         self.config = config
-        self.manager = None  # Will be initialized in bootstrap
+        self.queue_factory = None  # Created by init_queues
+        self.verify_cache = None  # Created by run_core when enabled
+        self.ledger_stats = None  # Created by run_core when the verification ledger is enabled
+        self.signer = None  # Created by run_core, shared by all core workers
 
     def validate_config(self):
         validator = InputValidator(self.config)
@@ -68,12 +95,33 @@ class Pipeline:
         return True
 
     def bootstrap(self):
-        # Initialize Manager FIRST for queue support on macOS
-        self.manager = mp.Manager()
-
         self.validate_config()
         self.queue_size = self.config["pipeline_dynamics"]["stream_queue_max_size"]
+        self.transport = self.config["pipeline_dynamics"].get("queue_transport", "manager")
         self.workers = self.config["pipeline_dynamics"]["core_parallelism"]
+        self.batch_size = self.config["pipeline_dynamics"].get("batch_max_size", 1)
+        self.batch_linger_ms = self.config["pipeline_dynamics"].get("batch_linger_ms", 0)
+        self.packet_format = self.config["pipeline_dynamics"].get("packet_format", "dict")
+        self.follow = self.config["pipeline_dynamics"].get("follow")
+        self.network = self.config["pipeline_dynamics"].get("network")
+        if self.network and not self.network.get("enabled", False):
+            self.network = None
+        self.start_id = 0
+        self.partitions = self.config["processing"]["stateful_tasks"].get("partitions", 1)
+        self.scheduling = self.config["pipeline_dynamics"].get("scheduling", "shared")
+        # Order-independent operation (window_average, running_total): koi reorder nahi, invalid packets core pe drop
+        self.ordered = needs_ordering(self.config["processing"]["stateful_tasks"])
+        if not self.ordered and self.scheduling == "dealt":
+            # Dealt scheduling sirf order wapas jorne ke liye hai
+            self.scheduling = "shared"
+        if self.follow and not self.follow.get("enabled", False):
+            self.follow = None
+        elif self.follow:
+            self.follow = dict(self.follow)
+            self.follow.setdefault("checkpoint_path", f"{self.config['dataset_path']}.checkpoint.json")
+            # A resumed follow run continues the id sequence where the checkpoint left it;
+            # read it before the producer starts moving it forward
+            self.start_id = FollowCheckpoint(self.follow["checkpoint_path"]).load()[2]
 
         self.init_queues()
         self.run_input()
@@ -95,17 +143,46 @@ class Pipeline:
 
 
     def init_queues(self):
-        # Use Manager queues instead of mp.Queue for macOS compatibility
-        self.input_queue = self.manager.Queue(maxsize=self.queue_size)
-        self.agregator_queue = self.manager.Queue(maxsize=self.queue_size)
-        self.output_queue = self.manager.Queue(maxsize=self.queue_size)
+        # "manager" keeps the old Manager proxy queues; the others skip the manager process
+        self.queue_factory = QueueFactory(self.transport, self.config["pipeline_dynamics"].get("shm_slot_bytes", 65536))
+        print(f"Queue transport: {self.queue_factory.transport}")
+        if self.scheduling == "dealt":
+            # Har worker ki apni input queue aur sorted output channel; producer/aggregator ko ek hi queue dikhti hai
+            block_ids = self.config["pipeline_dynamics"].get("deal_block_ids", max(64, 4 * self.batch_size))
+            gap_timeout = self.config["processing"]["stateful_tasks"].get("reorder", {}).get("gap_timeout_s", 30.0)
+            self.input_queue = BlockDealer([self.queue_factory.create(self.queue_size) for _ in range(self.workers)], block_ids)
+            self.agregator_queue = ChannelMerge([self.queue_factory.create(self.queue_size) for _ in range(self.workers)], block_ids, self.start_id, gap_timeout)
+            print(f"Scheduling: {block_ids}-id blocks dealt to {self.workers} workers")
+        else:
+            self.input_queue = self.queue_factory.create(self.queue_size)
+            self.agregator_queue = self.queue_factory.create(self.queue_size)
+        self.output_queue = self.queue_factory.create(self.queue_size)
+
+    def close_queues(self):
+        self.queue_factory.close()
 
     def run_input(self):
 
         # Start input producer
         print("Starting Input Producer...")
         input_delay = self.config["pipeline_dynamics"]["input_delay_seconds"]
-        producer = GenericInputProducer(self.input_queue,self.config["schema_mapping"], input_delay)
+        pacing = self.config["pipeline_dynamics"].get("pacing")
+        read_ahead = self.config["pipeline_dynamics"].get("read_ahead")
+        reader_processes = int(self.config["pipeline_dynamics"].get("reader_processes", 1))
+        if self.network:
+            # Live sensor feed instead of a file, runs until Ctrl+C
+            producer = NetworkInputProducer(self.input_queue, self.config["schema_mapping"], self.network, self.batch_size, self.batch_linger_ms, self.packet_format)
+            self.input_producer = mp.Process(target=producer.run)
+            self.input_producer.start()
+            return
+        # The sharded reader memory-maps the files, so compressed datasets use the streaming reader
+        compressed = any(detect_compression(f) for f in resolve_dataset_files(self.config["dataset_path"]))
+        if reader_processes > 1 and not self.follow and not compressed:
+            chunk_bytes = self.config["pipeline_dynamics"].get("reader_chunk_bytes", 8 * 1024 * 1024)
+            producer = ShardedInputProducer(self.input_queue, self.config["schema_mapping"], input_delay, reader_processes, chunk_bytes, self.batch_size, self.batch_linger_ms, self.packet_format, pacing, read_ahead)
+        else:
+            use_cache = self.config["pipeline_dynamics"].get("dataset_cache", False)
+            producer = GenericInputProducer(self.input_queue,self.config["schema_mapping"], input_delay, self.batch_size, self.batch_linger_ms, self.packet_format, use_cache, pacing, self.follow, read_ahead)
         self.input_producer = mp.Process(target=producer.run, args=(self.config["dataset_path"],))
         self.input_producer.start()
         return
@@ -120,6 +197,17 @@ class Pipeline:
         self.see = Observer_Telemetry(telemetry_socket=telemetry_socket)
         self.telemetry = Telemetry(self.input_queue, self.agregator_queue, self.output_queue)
         self.telemetry.subscribe(self.see)
+        if self.verify_cache is not None:
+            self.telemetry.add_source("verify_cache", self.verify_cache.stats)
+        if self.ledger_stats is not None:
+            self.telemetry.add_source("ledger", self.ledger_stats.stats)
+        if isinstance(self.signer, KeyRing):
+            self.telemetry.add_source("keys", self.signer.stats)
+        if self.core.elastic is not None:
+            self.telemetry.add_source("core_pool", self.core.pool_stats.stats)
+        self.telemetry.add_source("reorder", self.reorder_stats.stats)
+        if self.event_window_stats is not None:
+            self.telemetry.add_source("event_windows", self.event_window_stats.stats)
         self.telemetry_proc = mp.Process(target=self.telemetry.poll, args=(0.01,))
         self.telemetry_proc.start()
         return
@@ -130,22 +218,80 @@ class Pipeline:
     def run_core(self):
         # Start core workers
         print("Starting Core Workers...")
-        self.core = CoreManager(self.input_queue, self.agregator_queue, self.workers, self.config["processing"])
+        cache_config = self.config["processing"]["stateless_tasks"].get("verification_cache", {})
+        if cache_config.get("enabled", False):
+            self.verify_cache = VerificationCache(cache_config.get("capacity", 65536))
+            print(f"Verification cache: {self.verify_cache.capacity} entries shared by all workers")
+        if self.config["processing"]["stateless_tasks"].get("verification_ledger", {}).get("enabled", False):
+            self.ledger_stats = LedgerStats()
+        self.signer = resolve_signer(self.config["processing"]["stateless_tasks"])
+        if isinstance(self.signer, KeyRing):
+            print(f"Key ring: {', '.join(self.signer.ids)}")
+        elastic = self.config["pipeline_dynamics"].get("elastic_pool")
+        if elastic and (not elastic.get("enabled", False) or self.scheduling == "dealt"):
+            # Dealt scheduling mein workers ki ginti block dealing ka hissa hai, badal nahi sakti
+            elastic = None
+        self.core = CoreManager(self.input_queue, self.agregator_queue, self.workers, self.config["processing"], self.batch_size, self.batch_linger_ms, self.verify_cache, self.signer, elastic, self.queue_size, self.ledger_stats)
         self.core.initialize_multiprocessing()
         return
     def shutdown_core(self):
         self.core.shutdown_core()
         return
+    def close_verify_cache(self):
+        if self.verify_cache is not None:
+            print(f"Verification cache: {self.verify_cache.stats()}")
+            self.verify_cache.close()
+        if self.ledger_stats is not None:
+            print(f"Ledger: {self.ledger_stats.stats()}")
+        if isinstance(self.signer, KeyRing):
+            print(f"Key ring: {self.signer.stats()}")
+        return
     def run_agregate(self):
         # Start aggregator
         print("Starting Aggregator...")
-        agg = Agregator(self.agregator_queue, self.output_queue, self.config["processing"]["stateful_tasks"]["running_average_window_size"])
+        stateful = self.config["processing"]["stateful_tasks"]
+        self.reorder_stats = ReorderStats()
+        self.event_window_stats = None
+        if stateful.get("operation", "running_average") == "window_average":
+            self.event_window_stats = EventWindowStats()
+        if not self.ordered:
+            print(f"Aggregation: '{stateful['operation']}' does not need packet order, reordering skipped")
+        if self.partitions > 1:
+            self.run_partitioned_agregate(stateful)
+            return
+        agg = Agregator(self.agregator_queue, self.output_queue, stateful["running_average_window_size"], self.batch_size, self.batch_linger_ms, self.start_id, stateful.get("reorder"), self.reorder_stats, stateful.get("windows"), stateful.get("statistics"), self.event_windows(stateful), stateful.get("operation", "running_average"))
         self.agg_process = mp.Process(target=agg.agregate)
         self.agg_process.start()
+        self.partition_processes = []
+        return
+    def run_partitioned_agregate(self, stateful):
+        # Router frontier track karta hai, har partition apne sensors ki windows rakhta hai
+        partition_by = stateful.get("partition_by", "entity_name")
+        self.partition_queues = [self.queue_factory.create(self.queue_size) for _ in range(self.partitions)]
+        router = AggregationRouter(self.agregator_queue, self.partition_queues, partition_by, self.start_id, stateful.get("reorder"), self.reorder_stats, self.ordered)
+        self.agg_process = mp.Process(target=router.route)
+        self.agg_process.start()
+        self.partition_processes = []
+        for queue in self.partition_queues:
+            agg = SensorAgregator(queue, self.output_queue, stateful["running_average_window_size"], partition_by, self.batch_size, self.batch_linger_ms, stateful.get("windows"), stateful.get("statistics"), self.event_windows(stateful, partition_by), stateful.get("operation", "running_average"))
+            process = mp.Process(target=agg.agregate)
+            process.start()
+            self.partition_processes.append(process)
+        print(f"Aggregation: {self.partitions} partitions by {partition_by}")
         return
+    def event_windows(self, stateful, group_by=None):
+        # Partitions mein har sensor ki apni windows, group_by = partition_by
+        if self.event_window_stats is None:
+            return None
+        config = dict(stateful.get("event_windows", {}))
+        if group_by is not None:
+            config["group_by"] = group_by
+        return EventTimeWindows.from_config(config, self.event_window_stats)
     def shutdown_agregate(self):
         self.agregator_queue.put(None)
         self.agg_process.join()
+        for process in self.partition_processes:
+            process.join()
 
     def shutdown_all(self):
         def shutdown(self):
@@ -154,6 +300,8 @@ class Pipeline:
             self.shutdown_agregate()
             self.shutdown_telemetry()
             self.shutdown_output()
+            self.close_queues()
+            self.close_verify_cache()
             return
         shutdown_manager = threading.Thread(target=shutdown, args=(self,))
         shutdown_manager.daemon = True
@@ -163,7 +311,7 @@ class Pipeline:
 
     def run_output(self):
 
-        self.gui_process = mp.Process(target=worker, args=(self.output_queue,))
+        self.gui_process = mp.Process(target=worker, args=(self.output_queue, self.partitions))
         self.gui_process.start()
         return
 
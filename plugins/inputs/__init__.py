@@ -14,6 +14,10 @@ All behavior is driven by config.json - same code works with ANY CSV dataset.
 from .schema_mapper import SchemaMapper, InvalidSchemaError, TypeCastError, ColumnMappingError
 from .input_validator import InputValidator, InputValidatorError, validate_input_config
 from .generic_producer import GenericInputProducer, ProducerError
+from .sharded_producer import ShardedInputProducer, plan_chunks
+from .dataset_cache import DatasetCache
+from .dataset_files import resolve_dataset_files
+from .network_producer import NetworkInputProducer
 
 __all__ = [
     'SchemaMapper',
@@ -25,4 +29,9 @@ __all__ = [
     'validate_input_config',
     'GenericInputProducer',
     'ProducerError',
+    'ShardedInputProducer',
+    'plan_chunks',
+    'DatasetCache',
+    'resolve_dataset_files',
+    'NetworkInputProducer',
 ]
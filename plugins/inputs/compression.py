@@ -0,0 +1,123 @@
+"""
+Compressed Dataset Support for Phase 3 - Streaming gzip/bz2/xz Ingest
+
+Archived datasets can be read without decompressing them to disk first:
+
+- detect_compression() recognises gzip, bz2 and xz by file extension or,
+  failing that, by the magic bytes at the start of the file
+- decompress_chunks() feeds the raw zlib/bz2/lzma decompressor large
+  input blocks and yields the decompressed data; read_ahead.ReadAheadStream
+  runs it in a background thread, so decompression overlaps with CSV
+  parsing (zlib, bz2 and lzma release the GIL while they work)
+
+Example:
+    compression = detect_compression("data/2024-05.csv.gz")   # "gzip"
+"""
+
+import bz2
+import lzma
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+# Compressed bytes fed to the decompressor per call (one chunk is ~5-10x this for CSV)
+INPUT_BYTES = 256 * 1024
+
+
+def detect_compression(path: Union[str, Path]) -> Optional[str]:
+    """
+    Detect the compression format of a dataset file.
+
+    Args:
+        path: Dataset file
+
+    Returns:
+        "gzip", "bz2", "xz" or None for an uncompressed file
+    """
+    path = Path(path)
+    by_extension = _EXTENSIONS.get(path.suffix.lower())
+    if by_extension is not None:
+        return by_extension
+    try:
+        with open(path, "rb") as f:
+            head = f.read(6)
+    except OSError:
+        return None
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def data_suffix(path: Union[str, Path]) -> str:
+    """
+    Extension of the data inside a possibly compressed file ("data.csv.gz" -> ".csv").
+
+    Args:
+        path: Dataset file
+
+    Returns:
+        Lower-case suffix without the compression extension
+    """
+    path = Path(path)
+    if path.suffix.lower() in _EXTENSIONS:
+        path = path.with_suffix("")
+    return path.suffix.lower()
+
+
+def new_decompressor(compression: str):
+    """
+    Create an incremental decompressor for one member/stream of the format.
+
+    Args:
+        compression: "gzip", "bz2" or "xz"
+
+    Returns:
+        zlib/bz2/lzma decompressor object (decompress(), eof, unused_data)
+    """
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    if compression == "bz2":
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor()
+
+
+def decompress_chunks(source: BinaryIO, compression: str) -> Iterator[bytes]:
+    """
+    Decompress a whole file, INPUT_BYTES of compressed input at a time.
+
+    Feeding the decompressor large blocks (instead of the small ones
+    gzip/bz2/lzma.open use) keeps it outside the GIL most of the time.
+    Concatenated members (gzip -c a >> f, pbzip2, ...) each get a new
+    decompressor.
+
+    Args:
+        source: Binary file object positioned at the start of the data
+        compression: "gzip", "bz2" or "xz"
+
+    Yields:
+        Non-empty chunks of decompressed bytes
+
+    Raises:
+        EOFError: If the file ends before the end-of-stream marker
+    """
+    decompressor = None  # created when a stream starts
+    while True:
+        data = source.read(INPUT_BYTES)
+        if not data:
+            if decompressor is not None and not decompressor.eof:
+                raise EOFError("Compressed file ended before the end-of-stream marker")
+            return
+        while data:
+            if decompressor is None or decompressor.eof:
+                decompressor = new_decompressor(compression)
+            chunk = decompressor.decompress(data)
+            if chunk:
+                yield chunk
+            data = decompressor.unused_data if decompressor.eof else b""
@@ -0,0 +1,255 @@
+"""
+Binary Dataset Cache for Phase 3 - Skip CSV Parsing on Replays
+
+This module provides a DatasetCache that stores the decoded rows of a CSV
+as typed per-column binary files next to the dataset:
+
+    data/sample_sensor_data.csv
+    data/sample_sensor_data.csv.cache/
+        meta.json               (key + column layout + row count)
+        entity_name.bin         (int32 dictionary codes)
+        time_period.bin         (int64)
+        metric_value.bin        (float64)
+        security_hash.bin       (fixed-width bytes)
+
+The column layout is the same one used for columnar batches
+(core.columnar.BatchLayout). The cache is keyed by the source file's size,
+mtime and a hash of schema_mapping - if any of them changes the cache is
+considered stale and rebuilt on the next read.
+
+A replay yields exactly the packets the CSV would. Datasets the column
+files can't hold exactly are never cached: a schema with
+passthrough_extra_columns (the _raw_ columns aren't stored) or a value
+longer than its column's fixed_width (it would have to be truncated).
+
+The first run builds the cache while it streams the CSV; later runs
+memory-map the column files and produce packets straight from them.
+
+Example:
+    cache = DatasetCache("data/sample_sensor_data.csv", config["schema_mapping"])
+    if cache.is_valid():
+        for packet in cache.read_packets():
+            ...
+"""
+
+from core.columnar import BatchLayout, DictionaryColumn
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Any, List, Generator
+import numpy as np
+
+CACHE_VERSION = 3
+
+# Rows buffered in memory before they are appended to the column files
+_WRITE_ROWS = 65536
+# Rows converted back to Python objects at a time when reading
+_READ_ROWS = 4096
+# On-disk dtype per BatchLayout kind (S<n> kinds are already numpy dtypes)
+_DTYPES = {"integer": "<i8", "float": "<f8", "boolean": "|b1", "dictionary": "<i4"}
+
+
+class DatasetCache:
+    """
+    Typed binary cache of one CSV dataset for one schema_mapping.
+
+    Attributes:
+        dataset_path: Path of the source CSV
+        cache_dir: Directory holding the column files
+        layout: BatchLayout describing the columns
+    """
+
+    def __init__(self, dataset_path: str, schema_mapping: Dict[str, Any]):
+        """
+        Initialize the cache handle (nothing is read or written yet).
+
+        Args:
+            dataset_path: Path of the source CSV
+            schema_mapping: The 'schema_mapping' dict from config.json
+        """
+        self.dataset_path = Path(dataset_path)
+        self.cache_dir = self.dataset_path.with_name(self.dataset_path.name + ".cache")
+        self.layout = BatchLayout(schema_mapping)
+        self.passthrough = bool(schema_mapping.get("passthrough_extra_columns", False))
+        self.schema_hash = hashlib.sha256(
+            json.dumps(schema_mapping, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def can_store(self) -> bool:
+        """
+        Check whether this schema's packets fit the column files.
+
+        Returns:
+            False when passthrough_extra_columns is set (the cache has no
+            place for the _raw_ columns, so a replay would differ)
+        """
+        return not self.passthrough
+
+    def _key(self) -> Dict[str, Any]:
+        """Build the key the cache must match: source size, mtime and schema hash."""
+        stat = self.dataset_path.stat()
+        return {
+            "version": CACHE_VERSION,
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "schema_hash": self.schema_hash,
+        }
+
+    def _read_meta(self) -> Dict[str, Any]:
+        with open(self.cache_dir / "meta.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def is_valid(self) -> bool:
+        """
+        Check whether a usable cache exists for the current source and schema.
+
+        Returns:
+            True if the cache can be read instead of the CSV
+        """
+        try:
+            meta = self._read_meta()
+        except (OSError, ValueError):
+            return False
+        try:
+            return meta.get("key") == self._key()
+        except OSError:
+            return False
+
+    def read_packets(self) -> Generator[Dict[str, Any], None, None]:
+        """
+        Stream packets (without _id) from the memory-mapped column files.
+
+        Yields:
+            Dict with internal column names as keys and correct types
+        """
+        meta = self._read_meta()
+        rows = meta["rows"]
+        if rows == 0:
+            return
+
+        columns = []
+        for col in meta["columns"]:
+            data = np.memmap(self.cache_dir / f"{col['name']}.bin", dtype=col["dtype"], mode="r", shape=(rows,))
+            columns.append((col["name"], col["kind"], data, col.get("categories")))
+
+        names = [name for name, _, _, _ in columns]
+        for start in range(0, rows, _READ_ROWS):
+            end = min(start + _READ_ROWS, rows)
+            values = []
+            for _, kind, data, categories in columns:
+                chunk = data[start:end]
+                if kind == "dictionary":
+                    values.append([categories[c] for c in chunk.tolist()])
+                elif kind.startswith("S"):
+                    values.append([v.decode("utf-8") for v in chunk.tolist()])
+                else:
+                    values.append(chunk.tolist())
+            for row in zip(*values):
+                yield dict(zip(names, row))
+
+    def writer(self) -> "DatasetCacheWriter":
+        """
+        Start building a new cache for the current source and schema.
+
+        Returns:
+            DatasetCacheWriter to append packets to
+        """
+        return DatasetCacheWriter(self)
+
+
+class DatasetCacheWriter:
+    """
+    Builds a cache in a temporary directory and swaps it in on commit().
+
+    Packets are appended in the order they are produced; nothing becomes
+    visible to readers unless the whole dataset was read (commit()).
+    Once a value turns out longer than its fixed_width the writer stops
+    writing and commit() drops the cache instead (see refused).
+    """
+
+    def __init__(self, cache: DatasetCache):
+        """
+        Open the temporary column files.
+
+        Args:
+            cache: DatasetCache to build
+        """
+        self.cache = cache
+        self.key = cache._key()
+        self.tmp_dir = cache.cache_dir.with_name(f"{cache.cache_dir.name}.tmp-{os.getpid()}")
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        self.tmp_dir.mkdir(parents=True)
+        self.files = {name: open(self.tmp_dir / f"{name}.bin", "wb") for name, _ in cache.layout.columns}
+        self.categories = {name: {} for name, kind in cache.layout.columns if kind == "dictionary"}
+        self.pending: List[Dict[str, Any]] = []
+        self.rows = 0
+        self.refused = None  # reason the dataset can't be cached, once known
+
+    def append(self, packet: Dict[str, Any]) -> None:
+        """
+        Add one decoded packet to the cache.
+
+        Args:
+            packet: Packet produced from a CSV row
+        """
+        if self.refused is not None:
+            return
+        self.pending.append(packet)
+        if len(self.pending) >= _WRITE_ROWS:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        if not self.pending:
+            return
+        batch = self.cache.layout.pack(self.pending)
+        if not batch.valid.all():
+            # pack() marks a row invalid only for a value longer than its fixed_width
+            self.refused = "a value is longer than its column's fixed_width"
+            self.pending = []
+            return
+        for name, column in batch.columns.items():
+            if isinstance(column, DictionaryColumn):
+                # Batch-local codes → codes into the file-wide dictionary
+                lookup = self.categories[name]
+                remap = np.array([lookup.setdefault(v, len(lookup)) for v in column.categories], dtype=np.int32)
+                remap[column.codes].tofile(self.files[name])
+            else:
+                column.tofile(self.files[name])
+        self.rows += len(self.pending)
+        self.pending = []
+
+    def commit(self) -> bool:
+        """
+        Flush the column files, write meta.json and replace the old cache.
+
+        Returns:
+            True if the cache was written, False if it was refused and dropped
+        """
+        self._write_pending()
+        if self.refused is not None:
+            self.abort()
+            return False
+        for f in self.files.values():
+            f.close()
+
+        columns = []
+        for name, kind in self.cache.layout.columns:
+            col = {"name": name, "kind": kind, "dtype": _DTYPES.get(kind, kind)}
+            if kind == "dictionary":
+                col["categories"] = list(self.categories[name])
+            columns.append(col)
+
+        with open(self.tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"key": self.key, "rows": self.rows, "columns": columns}, f)
+
+        shutil.rmtree(self.cache.cache_dir, ignore_errors=True)
+        os.replace(self.tmp_dir, self.cache.cache_dir)
+        return True
+
+    def abort(self) -> None:
+        """Drop the partially built cache."""
+        for f in self.files.values():
+            f.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
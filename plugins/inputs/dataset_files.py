@@ -0,0 +1,57 @@
+"""
+Dataset File Resolution for Phase 3 - Multi-file Ingest
+
+dataset_path may name more than one file:
+
+- a single file:   "data/sample_sensor_data.csv"
+- a directory:     "data/hourly/"          (every *.csv, *.csv.gz, *.csv.bz2
+                                            and *.csv.xz directly inside it)
+- a glob pattern:  "data/hourly/2024-*.csv"
+
+Files are always returned sorted by path, so hourly/daily files named by
+their timestamp are read in chronological order and every run numbers the
+rows the same way.
+
+Example:
+    for path in resolve_dataset_files(config["dataset_path"]):
+        ...
+"""
+
+from .compression import data_suffix
+import glob
+from pathlib import Path
+from typing import List
+
+_GLOB_CHARS = set("*?[")
+
+
+def is_pattern(dataset_path: str) -> bool:
+    """
+    Check whether dataset_path is a glob pattern.
+
+    Args:
+        dataset_path: dataset_path from config.json
+
+    Returns:
+        True if it contains glob wildcards
+    """
+    return any(c in _GLOB_CHARS for c in str(dataset_path))
+
+
+def resolve_dataset_files(dataset_path: str) -> List[Path]:
+    """
+    Expand dataset_path into the sorted list of files to read.
+
+    Args:
+        dataset_path: File, directory or glob pattern
+
+    Returns:
+        Sorted list of file paths (empty if nothing matches). A plain path
+        that does not exist is returned as-is so the reader reports it.
+    """
+    path = Path(dataset_path)
+    if is_pattern(dataset_path):
+        return sorted(Path(p) for p in glob.glob(str(dataset_path), recursive=True) if Path(p).is_file())
+    if path.is_dir():
+        return sorted(p for p in path.iterdir() if p.is_file() and data_suffix(p) == ".csv")
+    return [path]
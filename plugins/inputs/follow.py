@@ -0,0 +1,222 @@
+"""
+Follow Mode for Phase 3 - Tailing Growing CSV Files
+
+This module lets the producer run as a long-lived service on a CSV that
+sensors keep appending to:
+
+- CsvFollower keeps the file open after EOF and polls for new bytes with
+  exponential backoff, only yields complete lines (a partial trailing line
+  waits for its newline), and detects rotation (the path now points to a
+  different inode) and truncation (the file got shorter than our offset),
+  restarting from the new file's header in both cases.
+- FollowCheckpoint persists the byte offset after the last committed row
+  together with the producer's next_id, so a restart resumes right after
+  the rows that were already queued instead of re-reading (and making the
+  core workers re-verify) the whole file.
+
+Example:
+    checkpoint = FollowCheckpoint("data/live.csv.checkpoint.json")
+    follower = CsvFollower("data/live.csv", should_stop=lambda: stopping)
+    for fields in follower.rows(*checkpoint.load()[:2]):
+        ...
+"""
+
+from .read_ahead import DATASET_ENCODING
+import csv as csv_module
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_READ_BYTES = 1024 * 1024
+
+
+class CsvFollower:
+    """
+    Streams CSV rows from a file that keeps growing, forever (until should_stop()).
+
+    Attributes:
+        header: Current header fields (re-read after rotation/truncation)
+        offset: Byte offset just past the last yielded row
+        inode: Inode of the file being read
+    """
+
+    def __init__(self, dataset_path: str, should_stop: Callable[[], bool],
+                 poll_min: float = 0.01, poll_max: float = 1.0,
+                 on_idle: Optional[Callable[[], None]] = None,
+                 on_header: Optional[Callable[[List[str]], None]] = None):
+        """
+        Args:
+            dataset_path: Path of the CSV to follow
+            should_stop: Returns True when following must end
+            poll_min: First backoff delay in seconds after hitting EOF
+            poll_max: Backoff ceiling in seconds
+            on_idle: Called before every backoff sleep (flush + checkpoint hook)
+            on_header: Called with the header whenever a file is (re)opened
+        """
+        self.path = Path(dataset_path)
+        self.should_stop = should_stop
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.on_idle = on_idle
+        self.on_header = on_header
+        self.header = None
+        self.offset = 0
+        self.inode = None
+
+    def _open(self, resume_offset: int = 0, resume_inode: Optional[int] = None):
+        """Open the file, read its header and seek to the resume point if it still applies."""
+        f = open(self.path, "rb")
+        stat = os.fstat(f.fileno())
+        header_line = f.readline()
+        while not header_line.endswith(b"\n"):
+            # Header itself not fully written yet
+            if self.should_stop():
+                f.close()
+                return None
+            time.sleep(self.poll_min)
+            header_line += f.readline()
+
+        self.header = next(csv_module.reader([header_line.decode(DATASET_ENCODING)]))
+        self.inode = stat.st_ino
+        self.offset = f.tell()
+        if resume_offset and resume_inode == stat.st_ino and self.offset <= resume_offset <= stat.st_size:
+            f.seek(resume_offset)
+            self.offset = resume_offset
+            logger.info(f"✓ Resuming {self.path} at byte {resume_offset}")
+        if self.on_header is not None:
+            self.on_header(self.header)
+        return f
+
+    def _replaced(self) -> bool:
+        """True if the path now names a different file or the file shrank below our offset."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            # Rotated away and not recreated yet - keep waiting on the old file
+            return False
+        if stat.st_ino != self.inode:
+            logger.info(f"Detected rotation of {self.path}, reopening")
+            return True
+        if stat.st_size < self.offset:
+            logger.info(f"Detected truncation of {self.path}, reading from the start")
+            return True
+        return False
+
+    def rows(self, resume_offset: int = 0, resume_inode: Optional[int] = None) -> Generator[List[str], None, None]:
+        """
+        Yield the field list of every complete, non-blank line, following the file.
+
+        self.offset is advanced past a row before it is yielded.
+
+        Args:
+            resume_offset: Byte offset to resume from (0 = start after the header)
+            resume_inode: Inode the offset belongs to; ignored if the file changed
+        """
+        state = {"file": self._open(resume_offset, resume_inode)}
+        if state["file"] is None:
+            return
+
+        def lines():
+            pending = b""
+            delay = self.poll_min
+            while not self.should_stop():
+                data = state["file"].read(_READ_BYTES)
+                if data:
+                    delay = self.poll_min
+                    *complete, pending = (pending + data).split(b"\n")
+                    for line in complete:
+                        # Advanced before csv.reader turns the line into a row
+                        self.offset += len(line) + 1
+                        yield line.decode("utf-8")
+                        if self.should_stop():
+                            return
+                    continue
+
+                if self._replaced():
+                    state["file"].close()
+                    pending = b""
+                    state["file"] = self._open()
+                    if state["file"] is None:
+                        return
+                    continue
+
+                if self.on_idle is not None:
+                    self.on_idle()
+                time.sleep(delay)
+                delay = min(delay * 2, self.poll_max)
+
+        try:
+            for fields in csv_module.reader(lines()):
+                if fields:
+                    yield fields
+        finally:
+            if state["file"] is not None:
+                state["file"].close()
+
+
+class FollowCheckpoint:
+    """
+    Last committed read position of a followed file, saved atomically as JSON.
+
+    Attributes:
+        path: Checkpoint file
+        interval: Minimum seconds between two saves
+    """
+
+    def __init__(self, path: str, interval: float = 1.0):
+        """
+        Args:
+            path: Checkpoint file location
+            interval: Minimum seconds between two saves (maybe_save)
+        """
+        self.path = Path(path)
+        self.interval = interval
+        self.state = None
+        self.saved_state = None
+        self.last_save = 0.0
+
+    def load(self) -> Tuple[int, Optional[int], int]:
+        """
+        Read the saved position.
+
+        Returns:
+            Tuple of (offset, inode, next_id); (0, None, 0) if there is no checkpoint
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["offset"], data["inode"], data["next_id"]
+        except (OSError, ValueError, KeyError):
+            return 0, None, 0
+
+    def commit(self, offset: int, inode: int, next_id: int) -> None:
+        """
+        Record a position whose rows have all been handed to the input queue.
+
+        Args:
+            offset: Byte offset after the last committed row
+            inode: Inode of the file the offset belongs to
+            next_id: Producer's next _id after that row
+        """
+        self.state = {"offset": offset, "inode": inode, "next_id": next_id}
+
+    def maybe_save(self) -> None:
+        """Save the committed position if the interval has passed since the last save."""
+        if time.monotonic() - self.last_save >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        """Write the committed position now (atomic replace)."""
+        self.last_save = time.monotonic()
+        if self.state is None or self.state == self.saved_state:
+            return
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+        self.saved_state = dict(self.state)
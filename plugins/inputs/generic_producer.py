@@ -2,11 +2,15 @@
 Generic Input Producer for Phase 3 - Reads Data and Queues Packets
 
 This module provides a GenericInputProducer process that:
-1. Reads CSV file row by row (streaming)
-2. Maps columns to internal generic names via schema_mapper
+1. Reads CSV file row by row (streaming); dataset_path may also be a
+   directory or glob, whose files are read one after another, and .gz,
+   .bz2 and .xz files are decompressed on the fly
+2. Maps columns to internal generic names via a RowDecoder compiled
+   from schema_mapper and the CSV header (only mapped columns are read),
+   or replays already typed rows from a DatasetCache
 3. Casts data types according to schema
-4. Applies throttling with input_delay_seconds
-5. Puts processed packets into Queue1 (bounded queue)
+4. Paces rows (input_delay_seconds, token bucket or event-time replay)
+5. Puts processed packets into Queue1 (bounded queue), optionally micro-batched
 6. Handles graceful shutdown
 
 The producer is completely domain-agnostic - it works with ANY CSV
@@ -24,12 +28,20 @@ Example:
 
 from .input_validator import InputValidator
 from .schema_mapper import SchemaMapper, SchemaMapperError
+from .dataset_cache import DatasetCache
+from .pacing import create_pacer
+from .follow import CsvFollower, FollowCheckpoint
+from .dataset_files import resolve_dataset_files
+from .read_ahead import open_dataset_text
+from core.batching import PacketBatcher
+from core.columnar import BatchLayout
 import csv as csv_module
-import time
+import mmap
 import sys
 import signal
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, Generator
+from typing import Dict, Any, Optional, Generator, List, Tuple
 from multiprocessing import Queue
 import logging
 import traceback
@@ -58,23 +70,37 @@ class GenericInputProducer:
     - Maps columns to internal names
     - Casts data types
     - Applies input delay throttling
-    - Queues packets to be processed by core workers
+    - Queues packets (or micro-batches of packets) to be processed by core workers
     - Gracefully shuts down on signal
 
     Attributes:
         config: schema_config only
         queue1: multiprocessing.Queue to put packets into
         schema_mapper: SchemaMapper instance for column mapping
+        batcher: PacketBatcher grouping packets into lists before queueing
         shutdown_requested: Flag to check for graceful shutdown
     """
 
-    def __init__(self, queue1: Queue, schema_mapping: Dict[str, Any], input_delay: int):
+    def __init__(self, queue1: Queue, schema_mapping: Dict[str, Any], input_delay: int,
+                 batch_size: int = 1, batch_linger_ms: float = 0, packet_format: str = "dict",
+                 use_cache: bool = False, pacing: Optional[Dict[str, Any]] = None,
+                 follow: Optional[Dict[str, Any]] = None, read_ahead: Optional[Dict[str, Any]] = None):
         """
         Initialize the input producer.
 
         Args:
             config: Full config.json as dict
             queue1: multiprocessing.Queue(maxsize=50) to put packets into
+            batch_size: Max packets per queued batch (1 disables batching)
+            batch_linger_ms: Max time the oldest packet waits before its batch is flushed
+            packet_format: "dict" (lists of packet dicts) or "columnar" (ColumnarBatch per batch)
+            use_cache: Read from / build a typed binary cache next to the dataset
+            pacing: pipeline_dynamics.pacing dict (None = one row every input_delay)
+            follow: pipeline_dynamics.follow dict; when enabled the file is tailed
+                after EOF and the read position is checkpointed
+            read_ahead: pipeline_dynamics.read_ahead dict; when enabled a reader
+                thread reads the file ahead in chunks and a sender thread drains
+                a bounded buffer into queue1 (not used in follow mode)
 
         Raises:
             ProducerError: If config is invalid
@@ -84,6 +110,19 @@ class GenericInputProducer:
         self.shutdown_requested = False
         self.next_id = 0
         self.input_delay = input_delay
+        self.pacer = create_pacer(pacing, input_delay)
+        self.decoder = None  # compiled from the CSV header when reading starts
+        self.use_cache = use_cache
+        self.follow = follow if follow and follow.get("enabled", False) else None
+        self.follower = None
+        self.checkpoint = None
+        # Follow mode checkpoints what reached queue1, so it keeps the direct path
+        self.read_ahead = read_ahead if read_ahead and read_ahead.get("enabled", False) and not self.follow else None
+        self.send_buffer = None
+        self.sender = None
+        self.send_error = None
+        pack = BatchLayout(schema_mapping).pack if packet_format == "columnar" else None
+        self.batcher = PacketBatcher(queue1, batch_size, batch_linger_ms, pack)
 
         # Initialize schema mapper
         try:
@@ -94,7 +133,12 @@ class GenericInputProducer:
             raise ProducerError(f"Schema mapper error: {e}")
 
 
-        logger.info(f"Input delay: {self.input_delay}s")
+        logger.info(f"Pacing: {(pacing or {}).get('mode', 'fixed_delay')}, input delay: {self.input_delay}s")
+        if self.batcher.enabled:
+            logger.info(f"Batching: up to {self.batcher.max_size} packets, linger {batch_linger_ms}ms, format {packet_format}")
+        if self.read_ahead:
+            logger.info(f"Read-ahead: {self.read_ahead.get('chunks', 4)} x {self.read_ahead.get('chunk_bytes', 1024 * 1024)} bytes, "
+                        f"send buffer {self.read_ahead.get('send_buffer', 64)}")
 
     def _setup_signal_handlers(self) -> None:
         """Setup handlers for graceful shutdown on Ctrl+C."""
@@ -105,12 +149,15 @@ class GenericInputProducer:
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
-    def _read_csv_rows(self, dataset_path:str) -> Generator[Dict[str, Any], None, None]:
+    def _read_csv_rows(self, dataset_path:str) -> Generator[List[str], None, None]:
         """
         Read CSV file row by row (streaming).
 
+        Reads the header first and compiles the schema against it into
+        self.decoder, so rows can be decoded by column position.
+
         Yields:
-            Dict with CSV column names as keys (raw strings)
+            List of raw string fields per non-blank row
 
         Raises:
             ProducerError: If CSV cannot be read
@@ -118,21 +165,30 @@ class GenericInputProducer:
         path = Path(dataset_path)
 
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                reader = csv_module.DictReader(f)
-
-                if reader.fieldnames is None:
+            # Compressed files are decompressed by a background thread while we parse
+            if self.read_ahead:
+                f = open_dataset_text(path, self.read_ahead.get("chunks", 4), self.read_ahead.get("chunk_bytes", 1024 * 1024))
+            else:
+                f = open_dataset_text(path)
+            with f:
+                reader = csv_module.reader(f)
+
+                header = next(reader, None)
+                if header is None:
                     raise ProducerError(f"Cannot read CSV headers from {path}")
 
                 # Log CSV structure
-                logger.info(f"✓ CSV opened, columns: {reader.fieldnames}")
+                logger.info(f"✓ CSV opened, columns: {header}")
+                self.decoder = self.schema_mapper.compile(header)
 
                 for row in reader:
                     if self.shutdown_requested:
                         logger.info(f"Shutdown requested")
                         return
 
-                    yield row
+                    # DictReader used to skip blank lines, keep doing that
+                    if row:
+                        yield row
 
                 logger.info(f"✓ Finished reading from CSV")
 
@@ -141,19 +197,162 @@ class GenericInputProducer:
         except Exception as e:
             raise ProducerError(f"Error reading CSV: {e}")
 
-    def _process_row(self, raw_row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _start_sender(self) -> None:
+        """Put a bounded buffer and a sender thread between the batcher and Queue1."""
+        if not self.read_ahead:
+            return
+        self.send_buffer = queue.Queue(maxsize=self.read_ahead.get("send_buffer", 64))
+        self.batcher.queue = self.send_buffer
+        self.sender = threading.Thread(target=self._send_loop, name="sender", daemon=True)
+        self.sender.start()
+
+    def _send_loop(self) -> None:
+        """Sender thread: move items from the send buffer to Queue1 until the None marker."""
+        while True:
+            item = self.send_buffer.get()
+            if item is None:
+                return
+            if self.send_error is not None:
+                continue  # keep draining so the parser never blocks on a dead sender
+            try:
+                # Blocks while Queue1 is full; the parser keeps filling the buffer meanwhile
+                self.input_queue.put(item, timeout=30)
+            except Exception as e:
+                self.send_error = e
+
+    def _stop_sender(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything in the send buffer reached Queue1 and stop the sender thread.
+
+        Without a timeout this always finishes: each put of the sender gives
+        up after 30 seconds, after which the rest of the buffer is dropped.
+
+        Args:
+            timeout: Max seconds to wait for the buffer to drain (None = until done)
+
+        Returns:
+            True once the sender has stopped, False if it still holds packets
+            (nothing may be queued after them, e.g. the EOF sentinel)
+        """
+        if self.sender is None:
+            return True
+        try:
+            self.send_buffer.put(None, timeout=timeout)
+        except queue.Full:
+            logger.warning("Send buffer still full at shutdown, dropping buffered packets")
+            return False
+        self.sender.join(timeout)
+        if self.sender.is_alive():
+            logger.warning("Sender still draining at shutdown, buffered packets may be lost")
+            return False
+        self.sender = None
+        self.batcher.queue = self.input_queue
+        if self.send_error is not None:
+            logger.error(f"Sender failed, buffered packets were dropped: {self.send_error}")
+        return True
+
+    def _read_dataset_rows(self, dataset_path: str) -> Generator[List[str], None, None]:
+        """
+        Read every file of dataset_path (file, directory or glob) one after another.
+
+        The decoder is recompiled for each file's header, and next_id simply
+        keeps counting, so the _id sequence runs on across files.
+
+        Yields:
+            List of raw string fields per non-blank row
+
+        Raises:
+            ProducerError: If nothing matches dataset_path or a file cannot be read
+        """
+        files = resolve_dataset_files(dataset_path)
+        if not files:
+            raise ProducerError(f"dataset_path matches no CSV files: {dataset_path}")
+
+        for path in files:
+            if self.shutdown_requested:
+                return
+            yield from self._read_csv_rows(path)
+
+    def _follow_csv_rows(self, dataset_path: str) -> Generator[List[str], None, None]:
+        """
+        Read CSV rows and keep following the file after EOF (follow mode).
+
+        Resumes from the checkpoint (byte offset, inode and next_id) if one
+        exists for the same file. Never ends on its own - only on shutdown.
+
+        Yields:
+            List of raw string fields per non-blank row
+        """
+        checkpoint_path = self.follow.get("checkpoint_path", f"{dataset_path}.checkpoint.json")
+        self.checkpoint = FollowCheckpoint(checkpoint_path, self.follow.get("checkpoint_interval_seconds", 1.0))
+        offset, inode, self.next_id = self.checkpoint.load()
+
+        def compile_header(header: List[str]) -> None:
+            logger.info(f"✓ Following CSV, columns: {header}")
+            self.decoder = self.schema_mapper.compile(header)
+
+        self.follower = CsvFollower(
+            dataset_path,
+            should_stop=lambda: self.shutdown_requested,
+            poll_min=self.follow.get("poll_min_ms", 10) / 1000.0,
+            poll_max=self.follow.get("poll_max_ms", 1000) / 1000.0,
+            on_idle=self._follow_idle,
+            on_header=compile_header,
+        )
+        try:
+            yield from self.follower.rows(offset, inode)
+        except FileNotFoundError:
+            raise ProducerError(f"Dataset file not found: {dataset_path}")
+
+    def _follow_idle(self) -> None:
+        """Caught up with the file: push out the pending batch and checkpoint everything read so far."""
+        self.batcher.flush(timeout=30)
+        self._commit_position()
+
+    def _commit_position(self) -> None:
+        """Checkpoint the follower position once nothing read is still waiting in the batcher."""
+        if self.follower is None or self.batcher.pending:
+            return
+        self.checkpoint.commit(self.follower.offset, self.follower.inode, self.next_id)
+        self.checkpoint.maybe_save()
+
+    def _read_chunk_rows(self, dataset_path: str, start: int, end: int) -> Generator[List[str], None, None]:
+        """
+        Read the CSV records of one newline-aligned byte range via mmap.
+
+        Yields exactly one field list per physical line (an empty list for a
+        blank line) so the caller can give every line its own _id.
+
+        Args:
+            dataset_path: Path of the CSV file
+            start: Offset of the first byte of the range
+            end: Offset one past the last byte of the range
+        """
+        with open(dataset_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.seek(start)
+
+                def lines():
+                    # Chunks start after the header line, so there is no BOM for DATASET_ENCODING
+                    # to drop here; plain utf-8 decodes the same bytes much faster per line
+                    while mm.tell() < end and not self.shutdown_requested:
+                        yield mm.readline().decode('utf-8')
+
+                yield from csv_module.reader(lines())
+
+    def _process_row(self, raw_row: List[str]) -> Optional[Dict[str, Any]]:
         """
         Process a single row: map columns and cast types.
 
         Args:
-            raw_row: Row from CSV (all values are strings)
+            raw_row: Field list from csv.reader (all values are strings)
 
         Returns:
             Processed packet (or None if error)
         """
         try:
-            # Map columns to internal names and cast types
-            packet = self.schema_mapper.process_row(raw_row)
+            # Map columns to internal names and cast types in one pass
+            packet = self.decoder.decode(raw_row)
 
             # Add metadata
             packet["_id"] = self.next_id
@@ -168,15 +367,38 @@ class GenericInputProducer:
             logger.warning(f"Unexpected error - {e}")
             return None
 
-    def _apply_throttle(self) -> None:
-        """Apply input delay throttling."""
-        if self.input_delay > 0:
-            time.sleep(self.input_delay)
+    def _number_packet(self, packet: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Give a packet read from the dataset cache its _id.
+
+        Args:
+            packet: Already typed packet from DatasetCache.read_packets()
+
+        Returns:
+            The same packet with _id set
+        """
+        packet["_id"] = self.next_id
+        self.next_id += 1
+        return packet
+
+    def _apply_throttle(self, packet: Dict[str, Any]) -> None:
+        """
+        Wait until the pacer releases the packet.
+
+        Args:
+            packet: The packet about to be queued (event-time pacing reads it)
+        """
+        self.pacer.wait(packet)
+        # Don't let a pending batch outlive its linger while we waited
+        self.batcher.poll(timeout=30)
 
     def _queue_packet(self, packet: Dict[str, Any]) -> None:
         """
         Put packet into Queue1 with error handling.
 
+        With batching enabled the packet is buffered and only the full (or
+        lingered) batch is put on the queue.
+
         Args:
             packet: Processed row data
 
@@ -188,8 +410,10 @@ class GenericInputProducer:
             # Put packet into queue (will block if queue is full - natural backpressure)
             if self.input_queue is None:
                 raise ProducerError("Queue1 is None - not initialized")
+            if self.send_error is not None:
+                raise self.send_error
 
-            self.input_queue.put(packet, timeout=30)
+            self.batcher.put(packet, timeout=30)
             logger.debug(f"Row Successfully queued packet")
 
         except Exception as e:
@@ -199,6 +423,71 @@ class GenericInputProducer:
             logger.error(f"Traceback:\n{error_trace}")
             raise ProducerError(f"Queue error: {str(e)}")
 
+    def run_chunks(self, dataset_paths: List[str], headers: List[List[str]],
+                   chunks: List[Tuple[int, int, int, int]], next_chunk) -> None:
+        """
+        Reader loop of one ShardedInputProducer process.
+
+        Claims chunks in order through the shared next_chunk counter,
+        numbers rows from each chunk's id base and queues them. Rows that
+        fail processing are queued as invalid placeholders so no _id is
+        skipped. Does not send the EOF sentinel - the coordinator does once
+        every reader has finished.
+
+        Args:
+            dataset_paths: Paths of the CSV files
+            headers: CSV header fields of each file
+            chunks: List of (file_index, start, end, id_base) from plan_chunks()
+            next_chunk: Shared multiprocessing.Value holding the next unclaimed chunk index
+        """
+        self._setup_signal_handlers()
+        self._start_sender()
+        decoders = {}
+
+        packets_queued = 0
+        packets_skipped = 0
+
+        try:
+            while not self.shutdown_requested:
+                with next_chunk.get_lock():
+                    index = next_chunk.value
+                    next_chunk.value += 1
+                if index >= len(chunks):
+                    break
+
+                file_index, start, end, id_base = chunks[index]
+                if file_index not in decoders:
+                    decoders[file_index] = self.schema_mapper.compile(headers[file_index])
+                self.decoder = decoders[file_index]
+                self.next_id = id_base
+                for fields in self._read_chunk_rows(dataset_paths[file_index], start, end):
+                    packet = self._process_row(fields)
+                    if packet is None:
+                        # Keep the id sequence gap-free for the Agregator
+                        packet = {"_id": self.next_id, "isValid": False}
+                        self.next_id += 1
+                        packets_skipped += 1
+                    else:
+                        packets_queued += 1
+
+                    self._apply_throttle(packet)
+                    self._queue_packet(packet)
+
+                # Never let a batch straddle two chunks, so its ids stay contiguous
+                self.batcher.flush(timeout=30)
+
+            # The coordinator sends the sentinel once we return, so drain the send buffer first
+            self._stop_sender()
+
+        except KeyboardInterrupt:
+            logger.info("Reader interrupted by user")
+        except ProducerError:
+            logger.error(f"Failed to queue row stopping reader")
+        finally:
+            # Interrupted or failed readers still hand their buffered packets to Queue1 (no-op after the drain above)
+            self._stop_sender(timeout=5)
+            logger.info(f"Reader done: {packets_queued} packets queued, {packets_skipped} placeholders for bad rows")
+
     def run(self, dataset_path) -> None:
         """
         Main producer loop.
@@ -214,39 +503,76 @@ class GenericInputProducer:
         logger.info("=" * 70)
 
         self._setup_signal_handlers()
+        self._start_sender()
 
         packets_queued = 0
         packets_skipped = 0
+        cache_writer = None
 
         try:
+            # Replay from the binary cache when it matches the dataset and schema
+            rows, process = self._read_dataset_rows(dataset_path), self._process_row
+            files = resolve_dataset_files(dataset_path)
+            if self.follow:
+                rows = self._follow_csv_rows(dataset_path)
+            elif self.use_cache and len(files) == 1:
+                cache = DatasetCache(files[0], self.config)
+                if not cache.can_store():
+                    logger.warning("dataset_cache does not store passthrough_extra_columns, reading the CSV")
+                elif cache.is_valid():
+                    logger.info(f"✓ Reading from dataset cache {cache.cache_dir}")
+                    rows, process = cache.read_packets(), self._number_packet
+                else:
+                    logger.info(f"Building dataset cache {cache.cache_dir}")
+                    cache_writer = cache.writer()
+
             # Read CSV and process each row
-            for raw_row in self._read_csv_rows(dataset_path):
+            for raw_row in rows:
                 if self.shutdown_requested:
                     logger.info("Shutdown requested, exiting main loop")
                     break
 
 
                 # Process the row
-                packet = self._process_row(raw_row)
+                packet = process(raw_row)
 
                 if packet is None:
                     packets_skipped += 1
                     continue
 
+                if cache_writer is not None:
+                    cache_writer.append(packet)
+
                 # Throttle according to config
-                self._apply_throttle()
+                self._apply_throttle(packet)
 
                 # Queue the packet (may block if queue is full)
                 try:
                     self._queue_packet(packet)
                     packets_queued += 1
+                    self._commit_position()
                 except ProducerError:
                     logger.error(f"Failed to queue row stopping producer")
                     break
+            else:
+                # Only a fully read dataset may become the cache
+                if cache_writer is not None and not self.shutdown_requested:
+                    if cache_writer.commit():
+                        logger.info(f"✓ Dataset cache written")
+                    else:
+                        logger.warning(f"Dataset cache not written: {cache_writer.refused}")
+                    cache_writer = None
 
             try:
-                # Dropped timeout to 2 seconds so Ctrl+C shuts down faster
-                self.input_queue.put(None, timeout=2)  
+                # Whatever is still buffered has to go out before the sentinel, so block
+                # on slow workers here instead of dropping the last batch with it
+                self.batcher.flush(timeout=None)
+                self._stop_sender()
+                if self.checkpoint is not None:
+                    self._commit_position()
+                    self.checkpoint.save()
+                # Only a requested shutdown (Ctrl+C) gives up on the sentinel after 2 seconds
+                self.input_queue.put(None, timeout=2 if self.shutdown_requested else None)
                 logger.info(f"✓ End-of-stream sentinel sent")
             except queue.Full:
                 # Catch the error if workers are dead and queue is maxed out
@@ -256,6 +582,8 @@ class GenericInputProducer:
             logger.info("Producer interrupted by user")
         except Exception as e:
             logger.error(f"Producer error: {e}")
+            # The sentinel must not overtake packets the sender still holds
+            self._stop_sender()
             # Send EOF marker even on error
             try:
                 self.input_queue.put(None, timeout=5)
@@ -264,6 +592,9 @@ class GenericInputProducer:
             raise
 
         finally:
+            self._stop_sender(timeout=5)
+            if cache_writer is not None:
+                cache_writer.abort()
             logger.info("=" * 70)
             logger.info(f"PRODUCER SHUTDOWN SUMMARY")
             logger.info(f"  Packets queued: {packets_queued}")
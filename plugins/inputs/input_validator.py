@@ -19,6 +19,13 @@ import sys
 from pathlib import Path
 from typing import Tuple, Dict, Any, List
 import csv as csv_module
+from .dataset_files import is_pattern, resolve_dataset_files
+from .compression import data_suffix, detect_compression
+from .read_ahead import open_dataset_text
+from core.signatures import resolve_signer
+from core.core_logic import STATEFUL_OPERATIONS
+from core.window_stats import WindowStats
+from core.event_windows import EventTimeWindows
 
 
 class InputValidatorError(Exception):
@@ -31,10 +38,11 @@ class InputValidator:
     Validates the input module configuration.
 
     Checks:
-    - dataset_path file exists and is readable
+    - dataset_path file (or every file of a directory/glob) exists and is readable
     - schema_mapping structure is valid
     - pipeline_dynamics are properly configured
     - CSV columns match schema requirements
+    - processing tasks name a known operation/algorithm
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -65,6 +73,7 @@ class InputValidator:
         self._validate_schema_mapping()
         self._validate_pipeline_dynamics()
         self._validate_csv_columns()
+        self._validate_processing()
 
         # Compile results
         if self.errors:
@@ -78,15 +87,30 @@ class InputValidator:
         return True, "✓ All validations passed"
 
     def _validate_dataset_path(self) -> None:
-        """Check that dataset_path exists and is readable."""
+        """Check that dataset_path exists and is readable (every file, for a directory or glob)."""
         if "dataset_path" not in self.config:
-            self.errors.append("❌ config.json missing 'dataset_path' key")
+            # Not needed when rows arrive over the network
+            network = self.config.get("pipeline_dynamics", {}).get("network")
+            if not (isinstance(network, dict) and network.get("enabled", False)):
+                self.errors.append("❌ config.json missing 'dataset_path' key")
             return
 
         filepath = self.config["dataset_path"]
+        path = Path(filepath)
+
+        # Directory or glob: every matched file has to pass the single-file checks
+        if is_pattern(filepath) or path.is_dir():
+            files = resolve_dataset_files(filepath)
+            if not files:
+                self.errors.append(
+                    f"❌ dataset_path matches no CSV files: '{filepath}'"
+                )
+                return
+            for file in files:
+                self._validate_dataset_file(file)
+            return
 
         # Check path exists
-        path = Path(filepath)
         if not path.exists():
             self.errors.append(
                 f"❌ Dataset file not found: '{filepath}'"
@@ -100,15 +124,19 @@ class InputValidator:
             )
             return
 
+        self._validate_dataset_file(path)
+
+    def _validate_dataset_file(self, path: Path) -> None:
+        """Check that one dataset file is non-empty and has a known extension."""
         # Check file is readable
         if not path.stat().st_size > 0:
             self.errors.append(
-                f"❌ Dataset file is empty: '{filepath}'"
+                f"❌ Dataset file is empty: '{path}'"
             )
             return
 
-        # Check file extension
-        if path.suffix.lower() not in {".csv", ".json"}:
+        # Check file extension (of the data inside, for .gz/.bz2/.xz)
+        if data_suffix(path) not in {".csv", ".json"}:
             self.warnings.append(
                 f"⚠ Dataset file extension '{path.suffix}' is not .csv or .json"
             )
@@ -138,6 +166,12 @@ class InputValidator:
             self.errors.append("❌ schema_mapping.columns cannot be empty")
             return
 
+        # Check optional passthrough flag
+        if not isinstance(schema.get("passthrough_extra_columns", False), bool):
+            self.errors.append(
+                "❌ schema_mapping.passthrough_extra_columns must be true or false"
+            )
+
         # Validate each column entry
         for i, col in enumerate(columns):
             if not isinstance(col, dict):
@@ -164,6 +198,15 @@ class InputValidator:
                 )
                 continue
 
+            # Check optional fixed_width (fixed-width byte storage in columnar batches)
+            if "fixed_width" in col:
+                width = col["fixed_width"]
+                if col["data_type"] != "string" or not isinstance(width, int) or width < 1:
+                    self.errors.append(
+                        f"❌ schema_mapping.columns[{i}]: fixed_width must be a positive "
+                        f"integer on a string column, got '{width}'"
+                    )
+
             # Check for duplicate source_name
             duplicates = [
                 c["source_name"] for idx, c in enumerate(columns)
@@ -252,37 +295,417 @@ class InputValidator:
                     f"❌ stream_queue_max_size must be an integer, got '{size}'"
                 )
 
-    def _validate_csv_columns(self) -> None:
-        """Validate that CSV file has all required columns."""
-        # Skip if dataset_path validation already failed
-        if not self.config.get("dataset_path"):
+        # Check optional micro-batching settings
+        if "batch_max_size" in dynamics:
+            batch_size = dynamics["batch_max_size"]
+            try:
+                batch_size_int = int(batch_size)
+                if batch_size_int < 1:
+                    self.errors.append(
+                        f"❌ batch_max_size must be >= 1, got {batch_size_int}"
+                    )
+                elif batch_size_int > 10000:
+                    self.warnings.append(
+                        f"⚠ batch_max_size is very large ({batch_size_int}), "
+                        f"each queue slot may hold a lot of memory"
+                    )
+            except (ValueError, TypeError):
+                self.errors.append(
+                    f"❌ batch_max_size must be an integer, got '{batch_size}'"
+                )
+
+        # Check optional parallel reader settings
+        if "reader_processes" in dynamics:
+            readers = dynamics["reader_processes"]
+            try:
+                readers_int = int(readers)
+                if readers_int < 1:
+                    self.errors.append(
+                        f"❌ reader_processes must be >= 1, got {readers_int}"
+                    )
+                elif readers_int > 16:
+                    self.warnings.append(
+                        f"⚠ reader_processes is very high ({readers_int}), "
+                        f"may exceed available CPU cores"
+                    )
+            except (ValueError, TypeError):
+                self.errors.append(
+                    f"❌ reader_processes must be an integer, got '{readers}'"
+                )
+            else:
+                files = resolve_dataset_files(self.config.get("dataset_path", ""))
+                if readers_int > 1 and any(detect_compression(f) for f in files):
+                    self.warnings.append(
+                        "⚠ compressed datasets are read by a single reader, reader_processes is ignored"
+                    )
+
+        if "reader_chunk_bytes" in dynamics:
+            chunk_bytes = dynamics["reader_chunk_bytes"]
+            try:
+                chunk_bytes_int = int(chunk_bytes)
+                if chunk_bytes_int < 4096:
+                    self.errors.append(
+                        f"❌ reader_chunk_bytes must be >= 4096, got {chunk_bytes_int}"
+                    )
+            except (ValueError, TypeError):
+                self.errors.append(
+                    f"❌ reader_chunk_bytes must be an integer, got '{chunk_bytes}'"
+                )
+
+        # Check optional pacing settings
+        if "pacing" in dynamics:
+            self._validate_pacing(dynamics["pacing"])
+
+        # Check optional follow mode settings
+        if "follow" in dynamics:
+            self._validate_follow(dynamics["follow"], dynamics)
+
+        # Check optional read-ahead settings
+        if "read_ahead" in dynamics:
+            self._validate_read_ahead(dynamics["read_ahead"], dynamics)
+
+        # Check optional network ingest settings
+        if "network" in dynamics:
+            self._validate_network(dynamics["network"], dynamics)
+
+        # Check optional scheduling mode
+        if "scheduling" in dynamics:
+            self._validate_scheduling(dynamics)
+
+        # Check optional elastic core pool settings
+        if "elastic_pool" in dynamics:
+            self._validate_elastic_pool(dynamics["elastic_pool"], dynamics)
+
+        # Check optional dataset cache flag
+        if not isinstance(dynamics.get("dataset_cache", False), bool):
+            self.errors.append("❌ dataset_cache must be true or false")
+        elif dynamics.get("dataset_cache", False) and len(resolve_dataset_files(self.config.get("dataset_path", ""))) > 1:
+            self.warnings.append(
+                "⚠ dataset_cache only applies to a single dataset file, it is ignored for several files"
+            )
+        if dynamics.get("dataset_cache", False) is True and \
+                self.config.get("schema_mapping", {}).get("passthrough_extra_columns", False):
+            self.warnings.append(
+                "⚠ dataset_cache does not store passthrough_extra_columns, the CSV is read every run"
+            )
+
+        # Check optional packet format
+        if "packet_format" in dynamics:
+            packet_format = dynamics["packet_format"]
+            if packet_format not in {"dict", "columnar"}:
+                self.errors.append(
+                    f"❌ packet_format must be 'dict' or 'columnar', got '{packet_format}'"
+                )
+            elif packet_format == "columnar" and not (
+                isinstance(dynamics.get("batch_max_size"), int) and dynamics["batch_max_size"] > 1
+            ):
+                self.errors.append(
+                    "❌ packet_format 'columnar' needs batch_max_size > 1"
+                )
+
+        # Check optional queue transport settings
+        if "queue_transport" in dynamics:
+            transport = dynamics["queue_transport"]
+            valid_transports = {"auto", "manager", "mp_queue", "simple_queue", "pipe", "shared_memory"}
+            if transport not in valid_transports:
+                self.errors.append(
+                    f"❌ queue_transport must be one of {valid_transports}, got '{transport}'"
+                )
+
+        if "shm_slot_bytes" in dynamics:
+            slot_size = dynamics["shm_slot_bytes"]
+            try:
+                slot_size_int = int(slot_size)
+                if slot_size_int < 256:
+                    self.errors.append(
+                        f"❌ shm_slot_bytes must be >= 256, got {slot_size_int}"
+                    )
+            except (ValueError, TypeError):
+                self.errors.append(
+                    f"❌ shm_slot_bytes must be an integer, got '{slot_size}'"
+                )
+
+        if "batch_linger_ms" in dynamics:
+            linger = dynamics["batch_linger_ms"]
+            try:
+                linger_float = float(linger)
+                if linger_float < 0:
+                    self.errors.append(
+                        f"❌ batch_linger_ms must be >= 0, got {linger_float}"
+                    )
+                elif linger_float > 1000:
+                    self.warnings.append(
+                        f"⚠ batch_linger_ms is very large ({linger_float}ms), "
+                        f"packets may wait long before being sent"
+                    )
+            except (ValueError, TypeError):
+                self.errors.append(
+                    f"❌ batch_linger_ms must be a number, got '{linger}'"
+                )
+
+    def _reader_processes(self) -> int:
+        """reader_processes as main.py uses it (1 when missing or invalid; invalid values are reported separately)."""
+        try:
+            return int(self.config.get("pipeline_dynamics", {}).get("reader_processes", 1))
+        except (ValueError, TypeError):
+            return 1
+
+    def _validate_pacing(self, pacing: Any) -> None:
+        """Validate pipeline_dynamics.pacing."""
+        if not isinstance(pacing, dict):
+            self.errors.append("❌ pipeline_dynamics.pacing must be a dict")
             return
 
-        if not self.config.get("schema_mapping"):
+        mode = pacing.get("mode", "fixed_delay")
+        valid_modes = {"fixed_delay", "token_bucket", "event_time", "unthrottled"}
+        if mode not in valid_modes:
+            self.errors.append(
+                f"❌ pacing.mode must be one of {valid_modes}, got '{mode}'"
+            )
             return
 
-        filepath = self.config["dataset_path"]
-        path = Path(filepath)
+        if not isinstance(pacing.get("precise", False), bool):
+            self.errors.append("❌ pacing.precise must be true or false")
+
+        if mode == "token_bucket":
+            rate = pacing.get("rows_per_second")
+            if not isinstance(rate, (int, float)) or rate <= 0:
+                self.errors.append(
+                    f"❌ pacing.rows_per_second must be a number > 0, got '{rate}'"
+                )
+            burst = pacing.get("burst", 1)
+            if not isinstance(burst, int) or burst < 1:
+                self.errors.append(
+                    f"❌ pacing.burst must be an integer >= 1, got '{burst}'"
+                )
 
-        # Only validate CSV files
-        if path.suffix.lower() != ".csv":
+        if mode == "event_time":
+            speed = pacing.get("speed", 1.0)
+            if not isinstance(speed, (int, float)) or speed <= 0:
+                self.errors.append(
+                    f"❌ pacing.speed must be a number > 0, got '{speed}'"
+                )
+            if self._reader_processes() > 1:
+                self.warnings.append(
+                    "⚠ event_time pacing replays each reader process on its own clock; "
+                    "use reader_processes = 1 for a faithful replay"
+                )
+
+    def _validate_follow(self, follow: Any, dynamics: Dict[str, Any]) -> None:
+        """Validate pipeline_dynamics.follow."""
+        if not isinstance(follow, dict):
+            self.errors.append("❌ pipeline_dynamics.follow must be a dict")
             return
 
-        # Try to read CSV header
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                reader = csv_module.DictReader(f)
-                if reader.fieldnames is None:
+        if not isinstance(follow.get("enabled", False), bool):
+            self.errors.append("❌ follow.enabled must be true or false")
+
+        for key in ("poll_min_ms", "poll_max_ms", "checkpoint_interval_seconds"):
+            if key in follow:
+                value = follow[key]
+                if not isinstance(value, (int, float)) or value <= 0:
                     self.errors.append(
-                        f"❌ Cannot read CSV header from {filepath}"
+                        f"❌ follow.{key} must be a number > 0, got '{value}'"
                     )
-                    return
 
-                csv_columns = set(reader.fieldnames)
-        except Exception as e:
+        if follow.get("enabled", False):
+            files = resolve_dataset_files(self.config.get("dataset_path", ""))
+            if len(files) > 1:
+                self.errors.append(
+                    "❌ follow mode tails a single file, dataset_path must not match several files"
+                )
+            elif files and detect_compression(files[0]) is not None:
+                self.errors.append(
+                    "❌ follow mode cannot tail a compressed file"
+                )
+            if self._reader_processes() > 1:
+                self.warnings.append(
+                    "⚠ follow mode uses a single reader, reader_processes is ignored"
+                )
+            if dynamics.get("dataset_cache", False):
+                self.warnings.append(
+                    "⚠ follow mode reads the live file, dataset_cache is ignored"
+                )
+
+    def _validate_read_ahead(self, read_ahead: Any, dynamics: Dict[str, Any]) -> None:
+        """Validate pipeline_dynamics.read_ahead."""
+        if not isinstance(read_ahead, dict):
+            self.errors.append("❌ pipeline_dynamics.read_ahead must be a dict")
+            return
+
+        if not isinstance(read_ahead.get("enabled", False), bool):
+            self.errors.append("❌ read_ahead.enabled must be true or false")
+
+        minimums = {"chunk_bytes": 4096, "chunks": 1, "send_buffer": 1}
+        for key, minimum in minimums.items():
+            if key in read_ahead:
+                value = read_ahead[key]
+                if not isinstance(value, int) or value < minimum:
+                    self.errors.append(
+                        f"❌ read_ahead.{key} must be an integer >= {minimum}, got '{value}'"
+                    )
+
+        follow = dynamics.get("follow")
+        if read_ahead.get("enabled", False) and isinstance(follow, dict) and follow.get("enabled", False):
+            self.warnings.append(
+                "⚠ follow mode checkpoints what reached the queue, read_ahead is ignored"
+            )
+
+    def _validate_scheduling(self, dynamics: Dict[str, Any]) -> None:
+        """Validate pipeline_dynamics.scheduling and deal_block_ids."""
+        scheduling = dynamics["scheduling"]
+        if scheduling not in ("shared", "dealt"):
+            self.errors.append(
+                f"❌ scheduling must be 'shared' or 'dealt', got '{scheduling}'"
+            )
+            return
+
+        if "deal_block_ids" in dynamics:
+            block_ids = dynamics["deal_block_ids"]
+            if not isinstance(block_ids, int) or isinstance(block_ids, bool) or block_ids < 1:
+                self.errors.append(
+                    f"❌ deal_block_ids must be an integer >= 1, got '{block_ids}'"
+                )
+
+        if scheduling != "dealt":
+            return
+        operation = self.config.get("processing", {}).get("stateful_tasks", {}).get("operation")
+        if operation in ("running_total", "window_average"):
+            self.warnings.append(
+                f"⚠ operation '{operation}' does not need packet order, scheduling 'dealt' is ignored"
+            )
+        if self._reader_processes() > 1:
             self.errors.append(
-                f"❌ Error reading CSV file {filepath}: {str(e)}"
+                "❌ scheduling 'dealt' needs a single producer writing ids in order; "
+                "set reader_processes to 1"
             )
+        elastic = dynamics.get("elastic_pool")
+        if isinstance(elastic, dict) and elastic.get("enabled", False):
+            self.warnings.append(
+                "⚠ scheduling 'dealt' fixes the worker count at core_parallelism, elastic_pool is ignored"
+            )
+
+    def _validate_elastic_pool(self, elastic: Any, dynamics: Dict[str, Any]) -> None:
+        """Validate pipeline_dynamics.elastic_pool."""
+        if not isinstance(elastic, dict):
+            self.errors.append("❌ pipeline_dynamics.elastic_pool must be a dict")
+            return
+
+        if not isinstance(elastic.get("enabled", False), bool):
+            self.errors.append("❌ elastic_pool.enabled must be true or false")
+
+        for key in ("min_workers", "max_workers"):
+            if key in elastic:
+                value = elastic[key]
+                if not isinstance(value, int) or value < 1:
+                    self.errors.append(
+                        f"❌ elastic_pool.{key} must be an integer >= 1, got '{value}'"
+                    )
+                    return
+        if elastic.get("min_workers", 1) > elastic.get("max_workers", elastic.get("min_workers", 1)):
+            self.errors.append("❌ elastic_pool.min_workers must be <= max_workers")
+
+        for key in ("check_interval_s", "scale_up_after_s", "idle_after_s"):
+            if key in elastic:
+                value = elastic[key]
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                    self.errors.append(
+                        f"❌ elastic_pool.{key} must be a number > 0, got '{value}'"
+                    )
+
+        if "high_water" in elastic:
+            high_water = elastic["high_water"]
+            if isinstance(high_water, bool) or not isinstance(high_water, (int, float)) or not 0 < high_water <= 1:
+                self.errors.append(
+                    f"❌ elastic_pool.high_water must be a fraction of stream_queue_max_size in (0, 1], got '{high_water}'"
+                )
+
+        if elastic.get("enabled", False) and dynamics.get("queue_transport") == "manager":
+            self.warnings.append(
+                "⚠ elastic_pool reads the input queue depth on every check; "
+                "with the manager transport that is a round trip to the manager process"
+            )
+
+    def _validate_network(self, network: Any, dynamics: Dict[str, Any]) -> None:
+        """Validate pipeline_dynamics.network."""
+        if not isinstance(network, dict):
+            self.errors.append("❌ pipeline_dynamics.network must be a dict")
+            return
+
+        if not isinstance(network.get("enabled", False), bool):
+            self.errors.append("❌ network.enabled must be true or false")
+
+        for key in ("tcp_port", "udp_port"):
+            if key in network:
+                port = network[key]
+                if not isinstance(port, int) or not 0 < port < 65536:
+                    self.errors.append(
+                        f"❌ network.{key} must be a port number (1-65535), got '{port}'"
+                    )
+
+        if "max_pending_chunks" in network:
+            pending = network["max_pending_chunks"]
+            if not isinstance(pending, int) or pending < 1:
+                self.errors.append(
+                    f"❌ network.max_pending_chunks must be an integer >= 1, got '{pending}'"
+                )
+
+        if "fields" in network:
+            fields = network["fields"]
+            columns = self.config.get("schema_mapping", {}).get("columns", [])
+            required = {col["source_name"] for col in columns if isinstance(col, dict) and "source_name" in col}
+            if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+                self.errors.append("❌ network.fields must be a list of column names")
+            elif required - set(fields):
+                self.errors.append(
+                    f"❌ network.fields missing required columns: {required - set(fields)}"
+                )
+
+        if network.get("enabled", False):
+            if "tcp_port" not in network and "udp_port" not in network:
+                self.errors.append("❌ network ingest needs a tcp_port and/or udp_port")
+            follow = dynamics.get("follow")
+            if isinstance(follow, dict) and follow.get("enabled", False):
+                self.errors.append("❌ network ingest and follow mode cannot both be enabled")
+            if self._reader_processes() > 1:
+                self.warnings.append(
+                    "⚠ network ingest uses its own listener, reader_processes is ignored"
+                )
+
+    def _validate_processing(self) -> None:
+        """Validate processing.stateless_tasks and stateful_tasks before any worker starts."""
+        processing = self.config.get("processing")
+        if not isinstance(processing, dict) or not isinstance(processing.get("stateless_tasks"), dict):
+            self.errors.append("❌ config.json missing 'processing.stateless_tasks'")
+            return
+        try:
+            # Same lookup the core workers do, so an unknown operation/algorithm fails here
+            resolve_signer(processing["stateless_tasks"])
+        except (KeyError, ValueError) as e:
+            self.errors.append(f"❌ stateless_tasks: {e}")
+
+        stateful = processing.get("stateful_tasks")
+        if not isinstance(stateful, dict):
+            self.errors.append("❌ config.json missing 'processing.stateful_tasks'")
+            return
+        try:
+            # Galat window size ya statistic ka naam yahin pakra jaaye, aggregator ke andar nahi
+            WindowStats([stateful["running_average_window_size"]] + list(stateful.get("windows", [])), stateful.get("statistics", ("mean",)))
+            operation = stateful.get("operation", "running_average")
+            if operation not in STATEFUL_OPERATIONS:
+                raise ValueError(f"unknown operation '{operation}', expected one of {list(STATEFUL_OPERATIONS)}")
+            if operation == "window_average":
+                EventTimeWindows.from_config(stateful.get("event_windows", {}))
+        except (KeyError, ValueError, TypeError) as e:
+            self.errors.append(f"❌ stateful_tasks: {e}")
+
+    def _validate_csv_columns(self) -> None:
+        """Validate that every CSV file has all required columns."""
+        # Skip if dataset_path validation already failed
+        if not self.config.get("dataset_path"):
+            return
+
+        if not self.config.get("schema_mapping"):
             return
 
         # Get required columns from schema
@@ -297,22 +720,52 @@ class InputValidator:
             col["source_name"] for col in columns if isinstance(col, dict)
         }
 
-        # Check all required columns exist in CSV
-        missing = required_columns - csv_columns
-        if missing:
-            self.errors.append(
-                f"❌ CSV missing required columns: {missing}\n"
-                f"   Available columns: {sorted(csv_columns)}"
-            )
-            return
+        # Each header is read once here, so readers never find a bad file mid-run
+        extra = set()
+        for path in resolve_dataset_files(self.config["dataset_path"]):
+            # Only validate CSV files
+            if data_suffix(path) != ".csv":
+                continue
+
+            csv_columns = self._read_csv_header(path)
+            if csv_columns is None:
+                continue
+
+            # Check all required columns exist in CSV
+            missing = required_columns - csv_columns
+            if missing:
+                self.errors.append(
+                    f"❌ CSV {path} missing required columns: {missing}\n"
+                    f"   Available columns: {sorted(csv_columns)}"
+                )
+                continue
+
+            extra |= csv_columns - required_columns
 
         # Warn about extra columns in CSV
-        extra = csv_columns - required_columns
         if extra:
             self.warnings.append(
                 f"⚠ CSV has extra columns not in schema: {extra}"
             )
 
+    def _read_csv_header(self, path: Path):
+        """Read the header of one CSV, recording an error and returning None if that fails."""
+        try:
+            with open_dataset_text(path) as f:
+                reader = csv_module.DictReader(f)
+                if reader.fieldnames is None:
+                    self.errors.append(
+                        f"❌ Cannot read CSV header from {path}"
+                    )
+                    return None
+
+                return set(reader.fieldnames)
+        except Exception as e:
+            self.errors.append(
+                f"❌ Error reading CSV file {path}: {str(e)}"
+            )
+            return None
+
     @staticmethod
     def print_validation_result(is_valid: bool, message: str) -> int:
         """
@@ -0,0 +1,265 @@
+"""
+Network Input Producer for Phase 3 - Live Sensor Feeds over TCP/UDP
+
+This module provides a NetworkInputProducer process that receives CSV lines
+(e.g. "Sensor_ID,Timestamp,Raw_Value,Auth_Signature") pushed by sensors
+instead of reading a file:
+
+1. An asyncio event loop accepts any number of TCP connections (one line per
+   row, newline terminated) and listens on a UDP port (one or more lines per
+   datagram)
+2. Lines are decoded with the same RowDecoder as the file producers; the
+   field order of a line is pipeline_dynamics.network.fields (default: the
+   schema_mapping source_names in order)
+3. Decoded rows are handed to a sender thread through a bounded buffer of
+   at most max_pending_chunks read chunks, so memory stays bounded
+4. The sender thread assigns the _ids (in hand-off order, so they are
+   gap-free and increasing) and queues the packets - batched with
+   PacketBatcher - into Queue1, blocking when Queue1 is full
+
+Backpressure: when the buffer is full a TCP connection stops reading from
+its socket until there is room again (the kernel window then throttles the
+sender), while UDP datagrams that don't fit are dropped and counted.
+
+The producer runs until SIGINT/SIGTERM, then flushes and sends the
+end-of-stream sentinel like the file producers.
+
+Example:
+    producer = NetworkInputProducer(queue1, config["schema_mapping"], {"tcp_port": 9000, "udp_port": 9001})
+    producer_process = Process(target=producer.run)
+    producer_process.start()
+"""
+
+from .schema_mapper import SchemaMapper, SchemaMapperError
+from .generic_producer import ProducerError
+from core.batching import PacketBatcher
+from core.columnar import BatchLayout
+import asyncio
+import csv as csv_module
+import queue
+import signal
+import threading
+import time
+from typing import Dict, Any, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Max bytes taken from a TCP connection per read (one buffer chunk at most)
+_READ_BYTES = 64 * 1024
+# Seconds between two throughput/drop log lines
+_STATS_INTERVAL = 10.0
+
+
+class NetworkInputProducer:
+    """
+    Receives CSV lines over TCP and UDP and queues them as packets.
+
+    Attributes:
+        input_queue: Queue to put packets into
+        schema_mapper: SchemaMapper used to decode the lines
+        decoder: RowDecoder compiled for the configured field order
+        pending: Bounded hand-off buffer between the event loop and the sender thread
+        batcher: PacketBatcher used by the sender thread
+        udp_dropped: Lines dropped because the buffer was full when their datagram arrived
+    """
+
+    def __init__(self, queue1, schema_mapping: Dict[str, Any], network: Dict[str, Any],
+                 batch_size: int = 1, batch_linger_ms: float = 0, packet_format: str = "dict"):
+        """
+        Initialize the network producer.
+
+        Args:
+            queue1: Queue to put packets into
+            schema_mapping: The 'schema_mapping' dict from config.json
+            network: pipeline_dynamics.network dict (host, tcp_port, udp_port,
+                fields, max_pending_chunks)
+            batch_size: Max packets per queued batch (1 disables batching)
+            batch_linger_ms: Max time the oldest packet waits before its batch is flushed
+            packet_format: "dict" or "columnar", see GenericInputProducer
+
+        Raises:
+            ProducerError: If the schema or field list is invalid
+        """
+        self.input_queue = queue1
+        self.host = network.get("host", "127.0.0.1")
+        self.tcp_port = network.get("tcp_port")
+        self.udp_port = network.get("udp_port")
+        self.next_id = 0
+        self.shutdown_requested = False
+        self.pending = queue.Queue(maxsize=network.get("max_pending_chunks", 256))
+        pack = BatchLayout(schema_mapping).pack if packet_format == "columnar" else None
+        self.batcher = PacketBatcher(queue1, batch_size, batch_linger_ms, pack)
+
+        self.packets_queued = 0
+        self.lines_skipped = 0
+        self.udp_dropped = 0
+        self.connections = 0
+
+        try:
+            self.schema_mapper = SchemaMapper(schema_mapping)
+            fields = network.get("fields") or [col["source_name"] for col in schema_mapping["columns"]]
+            self.decoder = self.schema_mapper.compile(fields)
+        except Exception as e:
+            raise ProducerError(f"Schema mapper error: {e}")
+
+    def _decode_lines(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """
+        Decode complete lines into packets (without _id); bad lines are counted and skipped.
+
+        Args:
+            lines: Decoded text lines without their newline
+
+        Returns:
+            List of packets
+        """
+        packets = []
+        for fields in csv_module.reader(lines):
+            if not fields:
+                continue
+            try:
+                packets.append(self.decoder.decode(fields))
+            except SchemaMapperError as e:
+                self.lines_skipped += 1
+                logger.debug(f"Failed to process - {e}")
+        return packets
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read one TCP connection until EOF; waits for buffer space instead of reading ahead."""
+        self.connections += 1
+        peer = writer.get_extra_info("peername")
+        logger.info(f"TCP connection from {peer}")
+        loop = asyncio.get_running_loop()
+        partial = b""
+        try:
+            while not self.shutdown_requested:
+                data = await reader.read(_READ_BYTES)
+                if not data:
+                    break
+                *complete, partial = (partial + data).split(b"\n")
+                packets = self._decode_lines([line.decode("utf-8", "replace") for line in complete])
+                if not packets:
+                    continue
+                try:
+                    self.pending.put_nowait(packets)
+                except queue.Full:
+                    # No reads from this socket until the sender thread makes room
+                    await loop.run_in_executor(None, self.pending.put, packets)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.warning(f"TCP connection {peer} failed: {e}")
+        finally:
+            if partial.strip():
+                self.lines_skipped += 1  # connection closed mid-line
+            self.connections -= 1
+            writer.close()
+
+    def _handle_datagram(self, data: bytes) -> None:
+        """Decode one UDP datagram; drops it if the buffer is full."""
+        packets = self._decode_lines(data.decode("utf-8", "replace").splitlines())
+        if not packets:
+            return
+        try:
+            self.pending.put_nowait(packets)
+        except queue.Full:
+            self.udp_dropped += len(packets)
+
+    def _send_loop(self) -> None:
+        """Sender thread: number packets, batch them and put them on Queue1 until the None marker."""
+        try:
+            while True:
+                packets = self.batcher.get(self.pending)
+                if packets is None:
+                    break
+                for packet in packets:
+                    packet["_id"] = self.next_id
+                    self.next_id += 1
+                    self.batcher.put(packet)
+                    self.packets_queued += 1
+                self.batcher.poll()
+        finally:
+            self.batcher.flush()
+
+    async def _log_stats(self) -> None:
+        """Log throughput and UDP drops every _STATS_INTERVAL seconds."""
+        last_queued, last_time = 0, time.monotonic()
+        while True:
+            await asyncio.sleep(_STATS_INTERVAL)
+            now = time.monotonic()
+            rate = (self.packets_queued - last_queued) / (now - last_time)
+            last_queued, last_time = self.packets_queued, now
+            logger.info(f"Network ingest: {rate:.0f} packets/s, {self.connections} TCP connections, "
+                        f"{self.udp_dropped} UDP lines dropped, {self.pending.qsize()} chunks buffered")
+
+    async def _serve(self) -> None:
+        """Start the listeners and run until a shutdown signal arrives."""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+
+        def request_shutdown():
+            logger.info("Shutdown signal received, stopping producer...")
+            self.shutdown_requested = True
+            stop.set()
+
+        loop.add_signal_handler(signal.SIGINT, request_shutdown)
+        loop.add_signal_handler(signal.SIGTERM, request_shutdown)
+
+        server = None
+        transport = None
+        if self.tcp_port is not None:
+            server = await asyncio.start_server(self._handle_tcp, self.host, self.tcp_port, limit=_READ_BYTES)
+            logger.info(f"✓ Listening for TCP on {self.host}:{self.tcp_port}")
+        if self.udp_port is not None:
+            producer = self
+
+            class _DatagramProtocol(asyncio.DatagramProtocol):
+                def datagram_received(self, data, addr):
+                    producer._handle_datagram(data)
+
+            transport, _ = await loop.create_datagram_endpoint(_DatagramProtocol, local_addr=(self.host, self.udp_port))
+            logger.info(f"✓ Listening for UDP on {self.host}:{self.udp_port}")
+
+        stats = asyncio.create_task(self._log_stats())
+        try:
+            await stop.wait()
+        finally:
+            stats.cancel()
+            if transport is not None:
+                transport.close()
+            if server is not None:
+                # Not wait_closed(): it would wait for every client to hang up
+                server.close()
+
+    def run(self) -> None:
+        """
+        Main producer loop: serve the sockets, then flush and send the EOF sentinel.
+
+        This method runs in its own process.
+        """
+        logger.info("=" * 70)
+        logger.info("NETWORK INPUT PRODUCER STARTED")
+        logger.info("=" * 70)
+
+        sender = threading.Thread(target=self._send_loop, name="network-sender", daemon=True)
+        sender.start()
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            logger.info("Producer interrupted by user")
+        except OSError as e:
+            logger.error(f"Producer error: {e}")
+        finally:
+            # Everything already accepted goes out before the sentinel
+            self.pending.put(None)
+            sender.join()
+            try:
+                self.input_queue.put(None, timeout=2)
+                logger.info(f"✓ End-of-stream sentinel sent")
+            except queue.Full:
+                logger.warning("Queue full during shutdown, dropping EOF sentinel.")
+
+            logger.info("=" * 70)
+            logger.info(f"PRODUCER SHUTDOWN SUMMARY")
+            logger.info(f"  Packets queued: {self.packets_queued}")
+            logger.info(f"  Lines skipped (errors): {self.lines_skipped}")
+            logger.info(f"  UDP lines dropped (backpressure): {self.udp_dropped}")
+            logger.info("=" * 70)
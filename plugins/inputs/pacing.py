@@ -0,0 +1,187 @@
+"""
+Pacing Engine for Phase 3 - Producer Rate Control
+
+This module decides WHEN the producer may queue the next packet. All pacers
+schedule against absolute deadlines on the monotonic clock, so scheduler
+jitter and per-row work don't accumulate into drift the way repeated
+time.sleep(delay) calls do.
+
+Modes (pipeline_dynamics.pacing.mode):
+- fixed_delay:  one row every input_delay_seconds (the default, old behaviour)
+- token_bucket: rows_per_second on average, bursts of up to `burst` rows
+- event_time:   replays the gaps of an event-time column (time_period by
+                default), sped up by `speed`
+- unthrottled:  as fast as the queue accepts
+
+Waits are plain sleeps, which may overshoot a deadline by ~0.1-1 ms; the
+next deadline is still start + n * interval, so that error never adds up.
+With pacing.precise the last millisecond of every wait is spun instead,
+trading a busy core for sub-millisecond release times.
+
+Example:
+    pacer = create_pacer({"mode": "token_bucket", "rows_per_second": 5000, "burst": 100}, 0.01)
+    for packet in packets:
+        pacer.wait(packet)
+        queue.put(packet)
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+# With precise pacing, below this much remaining time we spin instead of sleeping
+# (sleep overshoots by ~0.1-1 ms)
+_SPIN_SECONDS = 0.001
+
+PACING_MODES = {"fixed_delay", "token_bucket", "event_time", "unthrottled"}
+
+
+def sleep_until(deadline: float, precise: bool = False) -> None:
+    """
+    Block until the monotonic clock reaches deadline.
+
+    Sleeps for the whole wait; with precise, sleeps for the bulk of it and
+    spins for the last millisecond.
+
+    Args:
+        deadline: Target time.monotonic() value
+        precise: Spin the final _SPIN_SECONDS instead of sleeping through them
+    """
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if not precise:
+            time.sleep(remaining)
+        elif remaining > _SPIN_SECONDS:
+            time.sleep(remaining - _SPIN_SECONDS)
+
+
+class Pacer:
+    """Base pacer: never waits (unthrottled mode)."""
+
+    def wait(self, packet: Dict[str, Any]) -> None:
+        """
+        Block until packet may be queued.
+
+        Args:
+            packet: The packet about to be queued
+        """
+        return None
+
+
+class FixedDelayPacer(Pacer):
+    """One packet every `delay` seconds, scheduled as start + n * delay."""
+
+    def __init__(self, delay: float, precise: bool = False):
+        """
+        Args:
+            delay: Seconds between packets (input_delay_seconds)
+            precise: Spin the last millisecond of each wait (see sleep_until)
+        """
+        self.delay = delay
+        self.precise = precise
+        self.next_deadline = None
+
+    def wait(self, packet: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        if self.next_deadline is None:
+            self.next_deadline = now + self.delay
+        # After a long stall (e.g. full queue) don't burst to catch up
+        elif self.next_deadline < now - self.delay:
+            self.next_deadline = now
+        sleep_until(self.next_deadline, self.precise)
+        self.next_deadline += self.delay
+
+
+class TokenBucketPacer(Pacer):
+    """
+    Token bucket: refills rows_per_second tokens per second up to `burst`,
+    each packet takes one token.
+    """
+
+    def __init__(self, rows_per_second: float, burst: int = 1, precise: bool = False):
+        """
+        Args:
+            rows_per_second: Long-run target rate
+            burst: Bucket capacity - packets that may go out back to back
+            precise: Spin the last millisecond of each wait (see sleep_until)
+        """
+        self.precise = precise
+        self.rate = float(rows_per_second)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait(self, packet: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1.0:
+            # Deadline at which the missing fraction of a token has refilled
+            deadline = now + (1.0 - self.tokens) / self.rate
+            sleep_until(deadline, self.precise)
+            self.tokens = 1.0
+            self.updated = deadline
+        self.tokens -= 1.0
+
+
+class EventTimePacer(Pacer):
+    """
+    Replays the stream at the pace its event-time column was recorded.
+
+    A packet with event time t is released at
+    wall_start + (t - first_event_time) / speed. Packets whose event time
+    goes backwards or is missing are released immediately.
+    """
+
+    def __init__(self, time_field: str = "time_period", speed: float = 1.0, precise: bool = False):
+        """
+        Args:
+            time_field: Internal column holding the event time (in seconds)
+            speed: Replay speed multiplier (2.0 = twice as fast as recorded)
+            precise: Spin the last millisecond of each wait (see sleep_until)
+        """
+        self.time_field = time_field
+        self.speed = float(speed)
+        self.precise = precise
+        self.first_event = None
+        self.wall_start = None
+
+    def wait(self, packet: Dict[str, Any]) -> None:
+        event_time = packet.get(self.time_field)
+        if event_time is None:
+            return
+        if self.first_event is None:
+            self.first_event = event_time
+            self.wall_start = time.monotonic()
+            return
+        sleep_until(self.wall_start + (event_time - self.first_event) / self.speed, self.precise)
+
+
+def create_pacer(pacing: Optional[Dict[str, Any]], input_delay: float) -> Pacer:
+    """
+    Build the pacer described by pipeline_dynamics.pacing.
+
+    Args:
+        pacing: The 'pacing' dict from pipeline_dynamics (None = fixed_delay)
+        input_delay: input_delay_seconds, used by fixed_delay
+
+    Returns:
+        Pacer instance
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    pacing = pacing or {}
+    mode = pacing.get("mode", "fixed_delay")
+    precise = pacing.get("precise", False)
+
+    if mode == "fixed_delay":
+        return FixedDelayPacer(input_delay, precise) if input_delay > 0 else Pacer()
+    if mode == "token_bucket":
+        return TokenBucketPacer(pacing["rows_per_second"], pacing.get("burst", 1), precise)
+    if mode == "event_time":
+        return EventTimePacer(pacing.get("time_field", "time_period"), pacing.get("speed", 1.0), precise)
+    if mode == "unthrottled":
+        return Pacer()
+    raise ValueError(f"Unknown pacing mode '{mode}', expected one of {PACING_MODES}")
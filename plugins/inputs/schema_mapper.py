@@ -14,9 +14,13 @@ Example:
     After mapping: {entity_name: "Alpha", time_period: 1234, metric_value: 24.99, ...}
 
 This allows the core module to work with ANY dataset without code changes.
+
+For the per-row hot path, SchemaMapper.compile(header) returns a RowDecoder
+that reads only the mapped column positions from a csv.reader field list and
+casts them with pre-resolved functions, building the packet in one pass.
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Callable
 from pathlib import Path
 import sys
 
@@ -41,6 +45,105 @@ class ColumnMappingError(SchemaMapperError):
     pass
 
 
+def _cast_integer(value: str) -> int:
+    # Same rule as cast_type: "24.99" → 24
+    return int(float(value))
+
+
+def _cast_boolean(value: str) -> bool:
+    return value.lower() in {"true", "yes", "1", "on"}
+
+
+# Cast function per data_type for values coming straight from csv.reader (always str)
+_FIELD_CASTS: Dict[str, Callable[[str], Any]] = {
+    "string": None,  # already a str, nothing to do
+    "integer": _cast_integer,
+    "float": float,
+    "boolean": _cast_boolean,
+}
+
+
+class RowDecoder:
+    """
+    A schema compiled against one CSV header.
+
+    Knows the position of every mapped column in the header (projection
+    pushdown: unmapped columns are never touched) and one cast function per
+    column, and builds a packet from a csv.reader field list in one pass.
+
+    Created by SchemaMapper.compile(header) - don't build it directly.
+    """
+
+    def __init__(self, mapper: "SchemaMapper", header: List[str]):
+        """
+        Compile the decoder.
+
+        Args:
+            mapper: SchemaMapper holding the schema
+            header: CSV header row (list of column names)
+
+        Raises:
+            ColumnMappingError: If a mapped column is missing from the header
+        """
+        self.mapper = mapper
+        self.header = list(header)
+        positions = {name: i for i, name in enumerate(self.header)}
+
+        missing = [src for src in mapper.get_required_source_columns() if src not in positions]
+        if missing:
+            raise ColumnMappingError(f"CSV missing columns: {set(missing)}")
+
+        # (internal name, field index, cast function or None, data_type)
+        self.plan = [
+            (mapper._source_to_internal[src], positions[src], _FIELD_CASTS[mapper._source_to_type[src]],
+             mapper._source_to_type[src])
+            for src in mapper.get_required_source_columns()
+        ]
+        self.extras = []
+        if mapper.passthrough_extra_columns:
+            self.extras = [(f"_raw_{name}", i) for i, name in enumerate(self.header)
+                           if name not in mapper._source_to_internal]
+        self.min_fields = max(i for _, i, _, _ in self.plan) + 1
+        self._decode = self._build()
+
+    def _build(self) -> Callable[[List[str]], Dict[str, Any]]:
+        """Build the dict-building closure for this schema and header."""
+        # (key, field index, cast or None) in packet key order; extras are never cast
+        steps = tuple((internal, index, cast) for internal, index, cast, _ in self.plan)
+        steps += tuple((name, index, None) for name, index in self.extras)
+
+        def decode(f: List[str]) -> Dict[str, Any]:
+            return {key: f[index] if cast is None else cast(f[index]) for key, index, cast in steps}
+
+        return decode
+
+    def decode(self, fields: List[str]) -> Dict[str, Any]:
+        """
+        Build a typed packet from one csv.reader row.
+
+        Args:
+            fields: List of raw string fields in header order
+
+        Returns:
+            Dict with internal column names as keys and correct types
+
+        Raises:
+            ColumnMappingError: If the row is too short for the mapped columns
+            TypeCastError: If type casting fails
+        """
+        if len(fields) < self.min_fields:
+            raise ColumnMappingError(
+                f"Row has {len(fields)} fields, mapped columns need {self.min_fields}"
+            )
+        try:
+            return self._decode(fields)
+        except (ValueError, TypeError, AttributeError):
+            # Slow path only to report which value failed
+            for internal, index, _, dtype in self.plan:
+                self.mapper.cast_type(fields[index], dtype)
+            raise
+
+
 class SchemaMapper:
     """
     Maps CSV column names to internal generic names and casts data types.
@@ -49,6 +152,10 @@ class SchemaMapper:
     by reading the column mappings from config.json.
 
     Supported data types: string, integer, float, boolean
+
+    Unmapped CSV columns are dropped unless schema_mapping sets
+    "passthrough_extra_columns": true, in which case they are kept as
+    _raw_<name> (for debugging/metadata).
     """
 
     def __init__(self, schema_config: Dict[str, Any]):
@@ -65,7 +172,8 @@ class SchemaMapper:
                             "data_type": "string|integer|float|boolean"
                         },
                         ...
-                    ]
+                    ],
+                    "passthrough_extra_columns": false   (optional)
                 }
 
         Raises:
@@ -73,6 +181,7 @@ class SchemaMapper:
         """
         self.schema_config = schema_config
         self.columns = schema_config.get("columns", [])
+        self.passthrough_extra_columns = bool(schema_config.get("passthrough_extra_columns", False))
 
         # Build lookup dictionaries for fast access
         self._source_to_internal = {}  # CSV column name → internal name
@@ -187,10 +296,11 @@ class SchemaMapper:
 
             mapped_row[internal_col] = raw_row[source_col]
 
-        # Copy any extra columns from raw_row (for debugging/metadata)
-        for key, value in raw_row.items():
-            if key not in self._source_to_internal:
-                mapped_row[f"_raw_{key}"] = value
+        # Copy any extra columns from raw_row (for debugging/metadata) if asked to
+        if self.passthrough_extra_columns:
+            for key, value in raw_row.items():
+                if key not in self._source_to_internal:
+                    mapped_row[f"_raw_{key}"] = value
 
         return mapped_row
 
@@ -291,6 +401,24 @@ class SchemaMapper:
         mapped = self.map_row(raw_row)
         return self.cast_types(mapped)
 
+    def compile(self, csv_headers: List[str]) -> RowDecoder:
+        """
+        Compile the schema against a CSV header into a RowDecoder.
+
+        Use this on the per-row hot path instead of process_row(): rows are
+        read with csv.reader (lists, not dicts) and decoded in one pass.
+
+        Args:
+            csv_headers: List of column names from CSV header row
+
+        Returns:
+            RowDecoder for rows of that CSV
+
+        Raises:
+            ColumnMappingError: If a mapped column is missing from the header
+        """
+        return RowDecoder(self, csv_headers)
+
     def get_schema_summary(self) -> str:
         """
         Get a human-readable summary of the schema mapping.
@@ -0,0 +1,194 @@
+"""
+Sharded Input Producer for Phase 3 - Parallel CSV Ingest
+
+This module provides a ShardedInputProducer that reads one large CSV, or
+every file of a directory/glob dataset_path, with several processes:
+1. Memory-maps each dataset file (files in sorted path order)
+2. Splits each body into byte ranges (chunks) aligned to newline boundaries
+3. Counts the newlines of every chunk in a fast pre-pass, which gives each
+   chunk the _id of its first row (its id base); id bases continue from one
+   file to the next
+4. Starts reader_processes workers that claim chunks in order and parse
+   them with the same GenericInputProducer row handling - with many small
+   files the readers work on different files at the same time
+5. Sends the single end-of-stream sentinel once every worker is done
+
+Every physical line gets exactly one _id. A row that fails mapping/casting
+is still queued as {"_id": ..., "isValid": False} so the id sequence stays
+gap-free and the Agregator's ordering keeps working.
+
+Because workers claim chunks in order, only about reader_processes chunks
+are in flight at once, which bounds how far ahead of expected_id the
+Agregator has to buffer.
+
+Limitation: quoted fields containing newlines are not supported (a row is
+assumed to be exactly one line), which holds for sensor CSVs.
+
+Example:
+    producer = ShardedInputProducer(queue1, config["schema_mapping"], 0, processes=4)
+    producer_process = Process(target=producer.run, args=(config["dataset_path"],))
+    producer_process.start()
+"""
+
+from .generic_producer import GenericInputProducer, ProducerError
+from .dataset_files import resolve_dataset_files
+from .read_ahead import DATASET_ENCODING
+import csv as csv_module
+import mmap
+import multiprocessing as mp
+import queue
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Newline counting is done in slices of this size so the pre-pass never copies a whole chunk
+_COUNT_SLICE = 16 * 1024 * 1024
+
+
+def _count_newlines(mm: mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for offset in range(start, end, _COUNT_SLICE):
+        count += mm[offset:min(offset + _COUNT_SLICE, end)].count(b"\n")
+    return count
+
+
+def plan_chunks(dataset_paths: List[str], chunk_bytes: int) -> Tuple[List[List[str]], List[Tuple[int, int, int, int]]]:
+    """
+    Split CSV files into newline-aligned byte ranges and compute their id bases.
+
+    Id bases run on across files in the given order, so the rows of all
+    files share one gap-free _id sequence.
+
+    Args:
+        dataset_paths: Paths of the CSV files, in reading order
+        chunk_bytes: Target size of one chunk
+
+    Returns:
+        Tuple of (header fields per file, list of (file_index, start, end, id_base))
+
+    Raises:
+        ProducerError: If a file is missing or has no header
+    """
+    headers = []
+    chunks = []
+    next_id = 0
+    for file_index, dataset_path in enumerate(dataset_paths):
+        path = Path(dataset_path)
+        try:
+            with open(path, "rb") as f:
+                size = path.stat().st_size
+                if size == 0:
+                    raise ProducerError(f"Cannot read CSV headers from {path}")
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header_end = mm.find(b"\n")
+                    if header_end == -1:
+                        # Header only, no rows
+                        header_end = size
+                    header_line = mm[:header_end].decode(DATASET_ENCODING)
+                    headers.append(next(csv_module.reader([header_line])))
+
+                    start = header_end + 1
+                    while start < size:
+                        end = min(start + chunk_bytes, size)
+                        if end < size:
+                            newline = mm.find(b"\n", end)
+                            end = size if newline == -1 else newline + 1
+                        rows = _count_newlines(mm, start, end)
+                        if end == size and mm[size - 1:size] != b"\n":
+                            rows += 1  # last line without a trailing newline
+                        chunks.append((file_index, start, end, next_id))
+                        next_id += rows
+                        start = end
+        except FileNotFoundError:
+            raise ProducerError(f"Dataset file not found: {path}")
+
+    return headers, chunks
+
+
+class ShardedInputProducer:
+    """
+    Reads one or more CSVs with several processes that parse newline-aligned chunks in parallel.
+
+    Attributes:
+        input_queue: Queue to put packets into
+        schema_mapping: schema_mapping from config.json
+        processes: Number of reader processes
+        chunk_bytes: Target chunk size in bytes
+    """
+
+    def __init__(self, queue1, schema_mapping: Dict[str, Any], input_delay: float,
+                 processes: int = 2, chunk_bytes: int = 8 * 1024 * 1024,
+                 batch_size: int = 1, batch_linger_ms: float = 0, packet_format: str = "dict",
+                 pacing: Optional[Dict[str, Any]] = None, read_ahead: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the sharded producer.
+
+        Args:
+            queue1: Queue to put packets into
+            schema_mapping: The 'schema_mapping' dict from config.json
+            input_delay: Delay between rows of the whole producer (fixed_delay pacing);
+                each reader waits processes x input_delay, so together they keep it
+            processes: Number of parallel reader processes
+            chunk_bytes: Target size of one chunk claimed by a reader
+            batch_size: Max packets per queued batch (1 disables batching)
+            batch_linger_ms: Max time the oldest packet waits before its batch is flushed
+            packet_format: "dict" or "columnar", see GenericInputProducer
+            pacing: pipeline_dynamics.pacing dict; a token bucket rate is split
+                evenly across the reader processes
+            read_ahead: pipeline_dynamics.read_ahead dict; each reader gets its own
+                sender thread and send buffer (chunks are already mmap-read)
+        """
+        self.input_queue = queue1
+        self.schema_mapping = schema_mapping
+        self.input_delay = input_delay
+        # Like the token bucket rate below, the fixed delay is split across the readers
+        self.reader_delay = input_delay * processes
+        self.processes = processes
+        self.chunk_bytes = chunk_bytes
+        self.batch_size = batch_size
+        self.batch_linger_ms = batch_linger_ms
+        self.packet_format = packet_format
+        self.pacing = pacing
+        self.read_ahead = read_ahead
+        if pacing and pacing.get("mode") == "token_bucket":
+            # Each reader gets its share so the total matches the configured rate
+            self.pacing = dict(pacing,
+                               rows_per_second=pacing["rows_per_second"] / processes,
+                               burst=max(1, pacing.get("burst", 1) // processes))
+
+    def run(self, dataset_path: str) -> None:
+        """
+        Plan the chunks, run the reader processes and send the EOF sentinel.
+
+        Args:
+            dataset_path: CSV file, directory or glob pattern
+        """
+        try:
+            paths = [str(p) for p in resolve_dataset_files(dataset_path)]
+            headers, chunks = plan_chunks(paths, self.chunk_bytes)
+            logger.info(f"✓ Planned {len(chunks)} chunks over {len(paths)} file(s) for {self.processes} reader processes")
+
+            next_chunk = mp.Value('l', 0)
+            readers = []
+            for _ in range(self.processes):
+                producer = GenericInputProducer(self.input_queue, self.schema_mapping, self.reader_delay,
+                                                self.batch_size, self.batch_linger_ms, self.packet_format,
+                                                pacing=self.pacing, read_ahead=self.read_ahead)
+                reader = mp.Process(target=producer.run_chunks,
+                                    args=(paths, headers, chunks, next_chunk))
+                reader.start()
+                readers.append(reader)
+            for reader in readers:
+                reader.join()
+        except KeyboardInterrupt:
+            logger.info("Sharded producer interrupted by user")
+        except ProducerError as e:
+            logger.error(f"Producer error: {e}")
+        finally:
+            try:
+                self.input_queue.put(None, timeout=2)
+                logger.info(f"✓ End-of-stream sentinel sent")
+            except queue.Full:
+                logger.warning("Queue full during shutdown, dropping EOF sentinel.")
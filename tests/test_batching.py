@@ -0,0 +1,94 @@
+import queue
+import time
+import unittest
+from core.batching import PacketBatcher, unpack
+
+
+class UnpackTest(unittest.TestCase):
+    def test_single_packet_and_batch(self):
+        self.assertEqual(unpack({"_id": 0}), [{"_id": 0}])
+        self.assertEqual(unpack([{"_id": 0}, {"_id": 1}]), [{"_id": 0}, {"_id": 1}])
+        self.assertEqual(unpack([]), [])
+
+
+class PacketBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = queue.Queue()
+
+    def test_max_size_one_puts_packets_unbatched(self):
+        batcher = PacketBatcher(self.queue, 1, 1000)
+        self.assertFalse(batcher.enabled)
+        batcher.put({"_id": 0})
+        self.assertEqual(self.queue.get_nowait(), {"_id": 0})
+        self.assertEqual(batcher.pending, 0)
+
+    def test_flushes_at_max_size(self):
+        batcher = PacketBatcher(self.queue, 3, 10000)
+        for i in range(7):
+            batcher.put(i)
+        self.assertEqual(self.queue.get_nowait(), [0, 1, 2])
+        self.assertEqual(self.queue.get_nowait(), [3, 4, 5])
+        self.assertTrue(self.queue.empty())
+        self.assertEqual(batcher.pending, 1)
+        batcher.flush()
+        self.assertEqual(self.queue.get_nowait(), [6])
+
+    def test_flush_of_empty_batch_puts_nothing(self):
+        batcher = PacketBatcher(self.queue, 4, 10)
+        batcher.flush()
+        self.assertTrue(self.queue.empty())
+        self.assertIsNone(batcher.time_left())
+
+    def test_linger_deadline(self):
+        batcher = PacketBatcher(self.queue, 100, 20)
+        batcher.put(0)
+        self.assertGreater(batcher.time_left(), 0.0)
+        batcher.poll()
+        self.assertTrue(self.queue.empty())
+        time.sleep(0.03)
+        self.assertEqual(batcher.time_left(), 0.0)
+        batcher.poll()
+        self.assertEqual(self.queue.get_nowait(), [0])
+        # A put after the deadline goes out together with the waiting packets
+        batcher.put(1)
+        time.sleep(0.03)
+        batcher.put(2)
+        self.assertEqual(self.queue.get_nowait(), [1, 2])
+
+    def test_pack_is_applied_to_each_batch(self):
+        batcher = PacketBatcher(self.queue, 2, 1000, pack=tuple)
+        batcher.put(0)
+        batcher.put(1)
+        self.assertEqual(self.queue.get_nowait(), (0, 1))
+
+    def test_full_queue_raises_on_timeout(self):
+        bounded = queue.Queue(maxsize=1)
+        batcher = PacketBatcher(bounded, 2, 1000)
+        batcher.put(0)
+        batcher.put(1)
+        batcher.put(2)
+        with self.assertRaises(queue.Full):
+            batcher.put(3, timeout=0.01)
+
+    def test_get_flushes_on_linger_while_waiting(self):
+        source = queue.Queue()
+        batcher = PacketBatcher(self.queue, 100, 20)
+        batcher.put(0)
+        with self.assertRaises(queue.Empty):
+            batcher.get(source, timeout=0.1)
+        # The linger deadline hit during the wait, so the batch went out
+        self.assertEqual(self.queue.get_nowait(), [0])
+        source.put("item")
+        self.assertEqual(batcher.get(source, timeout=0.1), "item")
+
+    def test_get_with_nothing_pending(self):
+        source = queue.Queue()
+        batcher = PacketBatcher(self.queue, 100, 20)
+        started = time.monotonic()
+        with self.assertRaises(queue.Empty):
+            batcher.get(source, timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import pickle
+import unittest
+import numpy as np
+from core.columnar import BatchLayout, ColumnarBatch, DictionaryColumn
+
+SCHEMA = {
+    "columns": [
+        {"source_name": "Sensor_ID", "internal_mapping": "entity_name", "data_type": "string"},
+        {"source_name": "Timestamp", "internal_mapping": "time_period", "data_type": "integer"},
+        {"source_name": "Raw_Value", "internal_mapping": "metric_value", "data_type": "float"},
+        {"source_name": "Online", "internal_mapping": "online", "data_type": "boolean"},
+        {"source_name": "Auth_Signature", "internal_mapping": "security_hash", "data_type": "string",
+         "fixed_width": 8},
+    ]
+}
+
+
+def packet(i, entity="Alpha", signature="abcd"):
+    return {"_id": i, "entity_name": entity, "time_period": 1000 + i, "metric_value": i / 4,
+            "online": i % 2 == 0, "security_hash": signature}
+
+
+class DictionaryColumnTest(unittest.TestCase):
+    def test_codes_follow_first_appearance(self):
+        column = DictionaryColumn.encode(["b", "a", "b", "c", "a"])
+        self.assertEqual(column.categories, ["b", "a", "c"])
+        self.assertEqual(column.codes.tolist(), [0, 1, 0, 2, 1])
+        self.assertEqual(column.codes.dtype, np.int32)
+        self.assertEqual(column.tolist(), ["b", "a", "b", "c", "a"])
+        self.assertEqual(len(column), 5)
+
+    def test_indexing_shares_the_categories(self):
+        column = DictionaryColumn.encode(["b", "a", "b", "c"])
+        self.assertEqual(column[1:3].tolist(), ["a", "b"])
+        self.assertEqual(column[np.array([True, False, False, True])].tolist(), ["b", "c"])
+        self.assertIs(column[1:].categories, column.categories)
+
+    def test_empty(self):
+        column = DictionaryColumn.encode([])
+        self.assertEqual((len(column), column.tolist(), column.categories), (0, [], []))
+
+
+class BatchLayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.layout = BatchLayout(SCHEMA)
+
+    def test_layout_kinds(self):
+        self.assertEqual(self.layout.columns, [("entity_name", "dictionary"), ("time_period", "integer"),
+                                               ("metric_value", "float"), ("online", "boolean"),
+                                               ("security_hash", "S8")])
+
+    def test_round_trip(self):
+        packets = [packet(0), {"_id": 1, "isValid": False}, packet(2, "Beta"), packet(3, signature="12345678")]
+        batch = self.layout.pack(packets)
+        self.assertEqual(batch.valid.tolist(), [True, False, True, True])
+        self.assertTrue(batch.is_contiguous())
+        rows = list(batch.rows())
+        self.assertEqual(rows[1], {"_id": 1, "isValid": False})
+        for got, sent in zip([rows[0], rows[2], rows[3]], [packets[0], packets[2], packets[3]]):
+            self.assertEqual(got, dict(sent, isValid=True))
+        restored = pickle.loads(pickle.dumps(batch))
+        self.assertEqual(list(restored.rows()), rows)
+
+    def test_value_longer_than_fixed_width_marks_the_row_invalid(self):
+        # 8 bytes fit; 9 bytes, or 5 characters that are 10 UTF-8 bytes, don't
+        packets = [packet(0, signature="12345678"), packet(1, signature="123456789"),
+                   packet(2, signature="ééééé"), packet(3, signature="éééé")]
+        batch = self.layout.pack(packets)
+        self.assertEqual(batch.valid.tolist(), [True, False, False, True])
+        rows = list(batch.rows())
+        self.assertEqual(rows[1], {"_id": 1, "isValid": False})
+        self.assertEqual(rows[3]["security_hash"], "éééé")
+        # Never a truncated value that might match a real signature
+        self.assertNotIn("12345678", [row.get("security_hash") for row in rows[1:]])
+
+    def test_slices_and_valid_rows(self):
+        batch = self.layout.pack([packet(i) for i in range(6)])
+        batch.valid[[1, 4]] = False
+        part = batch.slice(2, 5)
+        self.assertEqual((part.first_id, len(part)), (2, 3))
+        self.assertEqual(part.column("time_period"), [1002, 1003, 1004])
+        valid = batch.valid_rows()
+        self.assertEqual(valid.ids.tolist(), [0, 2, 3, 5])
+        self.assertFalse(valid.is_contiguous())
+        self.assertEqual(valid.column("entity_name"), ["Alpha"] * 4)
+        self.assertTrue(all(row["isValid"] for row in valid.rows()))
+
+    def test_is_contiguous(self):
+        self.assertFalse(ColumnarBatch(np.array([], dtype=np.int64), {}, np.array([], dtype=np.bool_)).is_contiguous())
+        self.assertFalse(self.layout.pack([packet(0), packet(2)]).is_contiguous())
+        self.assertTrue(self.layout.pack([packet(5)]).is_contiguous())
+
+
+if __name__ == "__main__":
+    unittest.main()
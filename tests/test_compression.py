@@ -0,0 +1,73 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+from unittest import mock
+from plugins.inputs import compression
+from plugins.inputs.compression import data_suffix, decompress_chunks, detect_compression
+from plugins.inputs.read_ahead import open_dataset_text
+
+COMPRESS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+EXTENSION = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+MEMBERS = [b"Sensor_ID,Timestamp,Raw_Value\nAlpha,1,1.0\n", b"Beta,2,2.0\n", b"", b"Gamma,3,3.0\n" * 500]
+
+
+class CompressionTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def write(self, name, data):
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def decompress(self, path, fmt):
+        with open(path, "rb") as f:
+            return b"".join(decompress_chunks(f, fmt))
+
+    def test_concatenated_members(self):
+        for fmt, compress in COMPRESS.items():
+            data = b"".join(compress(member) for member in MEMBERS)
+            path = self.write("multi.csv" + EXTENSION[fmt], data)
+            self.assertEqual(self.decompress(path, fmt), b"".join(MEMBERS), fmt)
+            # Member boundaries inside an input block, on one, and blocks smaller than a member
+            for input_bytes in (1, 7, len(compress(MEMBERS[0])), 4096):
+                with mock.patch.object(compression, "INPUT_BYTES", input_bytes):
+                    self.assertEqual(self.decompress(path, fmt), b"".join(MEMBERS), (fmt, input_bytes))
+
+    def test_truncated_stream(self):
+        for fmt, compress in COMPRESS.items():
+            data = compress(MEMBERS[0]) + compress(MEMBERS[3])
+            path = self.write("cut.csv" + EXTENSION[fmt], data[:-8])
+            with self.assertRaises(EOFError, msg=fmt):
+                self.decompress(path, fmt)
+
+    def test_detection(self):
+        for fmt, compress in COMPRESS.items():
+            self.assertEqual(detect_compression(self.write("a.csv" + EXTENSION[fmt], b"")), fmt)
+            # No telling extension: the magic bytes decide
+            self.assertEqual(detect_compression(self.write(f"{fmt}.dat", compress(b"x"))), fmt)
+        self.assertIsNone(detect_compression(self.write("plain.csv", b"a,b\n")))
+        self.assertIsNone(detect_compression(os.path.join(self.dir, "missing.csv")))
+        self.assertEqual(data_suffix("data/2024.CSV.GZ"), ".csv")
+        self.assertEqual(data_suffix("data/2024.csv"), ".csv")
+        self.assertEqual(data_suffix("data/2024.tar.xz"), ".tar")
+
+    def test_text_stream_over_members(self):
+        text = "\ufeffSensor_ID,Timestamp,Raw_Value\nÄlpha,1,1.0\n"
+        raw = text.encode("utf-8")
+        split = raw.index("Ä".encode("utf-8")) + 1
+        data = gzip.compress(raw[:split]) + gzip.compress(raw[split:])
+        path = self.write("bom.csv.gz", data)
+        with open_dataset_text(path) as f:
+            # The BOM is dropped and a UTF-8 character split across members survives
+            self.assertEqual(f.read(), text[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import time
+import unittest
+import multiprocessing as mp
+from core.core_manager import CoreManager
+
+ctx = mp.get_context("fork")
+
+
+def idle_worker(retire, quit_now):
+    # Stands in for CoreLogic.process: leaves once retired (or on its own, like a poison pill)
+    while not retire.wait(0.01):
+        if quit_now.is_set():
+            return
+
+
+class DepthQueue:
+    def __init__(self):
+        self.depth = 0
+
+    def qsize(self):
+        return self.depth
+
+
+class FakeWorkers(CoreManager):
+    def generate_worker(self, retire=None, index=None):
+        quit_now = ctx.Event()
+        process = ctx.Process(target=idle_worker, args=(retire, quit_now))
+        process.quit_now = quit_now
+        process.start()
+        return process
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class ElasticPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = DepthQueue()
+        self.manager = FakeWorkers(self.queue, None, 1, {}, queue_size=100, elastic={
+            "min_workers": 1, "max_workers": 3, "check_interval_s": 0.01,
+            "high_water": 0.5, "scale_up_after_s": 0.05, "idle_after_s": 0.05,
+        })
+        self.manager.initialize_multiprocessing()
+        self.addCleanup(self.shutdown)
+
+    def shutdown(self):
+        # Stop the monitor first so no worker is started after the quit signals
+        self.manager.stopping.set()
+        self.manager.monitor.join()
+        for process in self.manager.processes_arr:
+            process.quit_now.set()
+        self.manager.shutdown_core()
+
+    def test_grows_then_retires_newest_first(self):
+        manager = self.manager
+        first = manager.active[0][0]
+        self.queue.depth = 80
+        self.assertTrue(wait_for(lambda: len(manager.active) == 3))
+        time.sleep(0.2)
+        self.assertEqual(len(manager.active), 3)  # never above max_workers
+        grown = [process for process, _ in manager.active]
+
+        self.queue.depth = 10  # neither busy nor idle: nothing changes
+        time.sleep(0.2)
+        self.assertEqual(len(manager.active), 3)
+
+        self.queue.depth = 0
+        self.assertTrue(wait_for(lambda: len(manager.active) == 1))
+        time.sleep(0.2)
+        self.assertEqual([process for process, _ in manager.active], [first])  # never below min_workers
+        # Retired workers exit and drop out of the process list
+        for process in grown[1:]:
+            process.join(5)
+            self.assertFalse(process.is_alive())
+        self.assertTrue(wait_for(lambda: manager.processes_arr == [first]))
+        self.assertEqual(manager.pool_stats.stats(), {
+            "workers": 1, "scale_ups": 2, "scale_downs": 2, "last_event": "down", "last_event_queue_depth": 0})
+
+    def test_worker_that_exits_on_its_own_is_replaced_by_count(self):
+        manager = self.manager
+        self.queue.depth = 80
+        self.assertTrue(wait_for(lambda: len(manager.active) == 3))
+        self.queue.depth = 10
+        leaving = manager.active[1][0]
+        leaving.quit_now.set()
+        leaving.join(5)
+        self.assertTrue(wait_for(lambda: leaving not in [p for p, _ in manager.active]))
+        self.assertEqual(len(manager.active), 2)
+        self.assertNotIn(leaving, manager.processes_arr)
+        # Busy again: the pool grows back to max_workers
+        self.queue.depth = 80
+        self.assertTrue(wait_for(lambda: len(manager.active) == 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
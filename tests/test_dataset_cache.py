@@ -0,0 +1,96 @@
+import json
+import os
+import queue
+import signal
+import tempfile
+import unittest
+from plugins.inputs.dataset_cache import DatasetCache
+from plugins.inputs.generic_producer import GenericInputProducer
+
+SCHEMA = {
+    "columns": [
+        {"source_name": "Sensor_ID", "internal_mapping": "entity_name", "data_type": "string"},
+        {"source_name": "Timestamp", "internal_mapping": "time_period", "data_type": "integer"},
+        {"source_name": "Raw_Value", "internal_mapping": "metric_value", "data_type": "float"},
+        {"source_name": "Auth_Signature", "internal_mapping": "security_hash", "data_type": "string",
+         "fixed_width": 8},
+    ]
+}
+HEADER = "Sensor_ID,Timestamp,Raw_Value,Auth_Signature"
+ROWS = [
+    "Alpha,100,24.99,aaaa",
+    '"Beta, north wing",101,25.5,bbbbbbbb',
+    "Gamma,102,not-a-number,cccc",
+    "Alpha,103,-1.5e3,",
+    "Delta,104,0.1,dd",
+]
+
+
+class DatasetCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "data.csv")
+        # run() installs the producer's Ctrl+C handlers in this process
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+
+    def write(self, rows, header=HEADER):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(header + "\n" + "\n".join(rows) + "\n")
+
+    def run_producer(self, schema=SCHEMA):
+        q = queue.Queue()
+        GenericInputProducer(q, schema, 0, use_cache=True).run(self.path)
+        packets = []
+        while True:
+            item = q.get(timeout=10)
+            if item is None:
+                return packets
+            packets.append(item)
+
+    def test_replay_yields_the_same_packets_as_the_csv(self):
+        self.write(ROWS * 3)
+        from_csv = self.run_producer()
+        cache = DatasetCache(self.path, SCHEMA)
+        self.assertTrue(cache.is_valid())
+        replayed = self.run_producer()
+        self.assertEqual(len(from_csv), 12)
+        self.assertEqual(json.dumps(replayed, sort_keys=True), json.dumps(from_csv, sort_keys=True))
+
+    def test_changed_source_or_schema_makes_the_cache_stale(self):
+        self.write(ROWS)
+        self.run_producer()
+        self.assertTrue(DatasetCache(self.path, SCHEMA).is_valid())
+        other_schema = json.loads(json.dumps(SCHEMA))
+        other_schema["columns"][3]["fixed_width"] = 16
+        self.assertFalse(DatasetCache(self.path, other_schema).is_valid())
+
+        self.write(ROWS + ["Echo,105,2.0,ee"])
+        self.assertFalse(DatasetCache(self.path, SCHEMA).is_valid())
+        self.assertEqual(self.run_producer()[-1]["entity_name"], "Echo")
+        self.assertTrue(DatasetCache(self.path, SCHEMA).is_valid())
+
+    def test_value_longer_than_fixed_width_is_not_cached(self):
+        self.write(ROWS + ["Echo,105,2.0,ninechars"])
+        first = self.run_producer()
+        cache = DatasetCache(self.path, SCHEMA)
+        self.assertFalse(cache.is_valid())
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["data.csv"])
+        # Every run reads the CSV, and keeps the full value
+        self.assertEqual(first[-1]["security_hash"], "ninechars")
+        self.assertEqual(self.run_producer(), first)
+
+    def test_passthrough_columns_are_not_cached(self):
+        schema = dict(SCHEMA, passthrough_extra_columns=True)
+        self.write([row + ",extra" for row in ROWS], header=HEADER + ",Site")
+        cache = DatasetCache(self.path, schema)
+        self.assertFalse(cache.can_store())
+        first = self.run_producer(schema)
+        self.assertEqual(first[0]["_raw_Site"], "extra")
+        self.assertFalse(cache.is_valid())
+        self.assertEqual(self.run_producer(schema), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from plugins.inputs.dataset_files import is_pattern, resolve_dataset_files
+
+
+class ResolveDatasetFilesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        # Created out of order so the result can't just follow creation order
+        for name in ("2024-03.csv", "2024-01.csv.gz", "2024-02.csv.bz2", "2024-04.csv.xz",
+                     "notes.txt", "2024-00.json", "nested/2024-05.csv"):
+            path = self.dir / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"")
+        (self.dir / "2024-03.csv.cache").mkdir()
+
+    def names(self, files):
+        return [str(path.relative_to(self.dir)) for path in files]
+
+    def test_directory(self):
+        self.assertEqual(self.names(resolve_dataset_files(str(self.dir))),
+                         ["2024-01.csv.gz", "2024-02.csv.bz2", "2024-03.csv", "2024-04.csv.xz"])
+
+    def test_glob(self):
+        self.assertEqual(self.names(resolve_dataset_files(str(self.dir / "2024-0[1-3]*"))),
+                         ["2024-01.csv.gz", "2024-02.csv.bz2", "2024-03.csv"])
+        self.assertEqual(self.names(resolve_dataset_files(str(self.dir / "**" / "*.csv"))),
+                         ["2024-03.csv", os.path.join("nested", "2024-05.csv")])
+        self.assertEqual(resolve_dataset_files(str(self.dir / "*.parquet")), [])
+
+    def test_order_is_the_same_every_run(self):
+        pattern = str(self.dir / "*.csv*")
+        first = resolve_dataset_files(pattern)
+        self.assertEqual(first, sorted(first))
+        (self.dir / "2024-00.csv").write_bytes(b"")
+        self.assertEqual(resolve_dataset_files(pattern), [self.dir / "2024-00.csv"] + first)
+
+    def test_single_file(self):
+        missing = str(self.dir / "missing.csv")
+        self.assertEqual(resolve_dataset_files(missing), [Path(missing)])
+        self.assertFalse(is_pattern(missing))
+        self.assertTrue(is_pattern("data/hour-?.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
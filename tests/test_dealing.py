@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+import unittest
+import numpy as np
+from core.columnar import ColumnarBatch
+from core.dealing import BlockDealer, ChannelMerge, block_owner
+
+
+def packets(*ids):
+    return [{"_id": i, "isValid": True} for i in ids]
+
+
+def ids_of(run):
+    if isinstance(run, ColumnarBatch):
+        return run.ids.tolist()
+    return [p["_id"] for p in run]
+
+
+def merge_all(merge):
+    out = []
+    while True:
+        run = merge.get()
+        if run is None:
+            return out
+        out.extend(ids_of(run))
+
+
+class BlockDealerTest(unittest.TestCase):
+    def test_splits_at_block_boundaries(self):
+        queues = [queue.Queue(), queue.Queue()]
+        dealer = BlockDealer(queues, 2)
+        dealer.put(packets(0, 1, 2, 3, 4))
+        dealer.put(None)
+        self.assertEqual(block_owner(4, 2, 2), 0)
+        self.assertEqual([ids_of(queues[0].get()), ids_of(queues[0].get())], [[0, 1], [4]])
+        self.assertEqual(ids_of(queues[1].get()), [2, 3])
+        self.assertIsNone(queues[0].get())
+        self.assertIsNone(queues[1].get())
+
+    def test_columnar_batches_are_sliced(self):
+        queues = [queue.Queue(), queue.Queue()]
+        dealer = BlockDealer(queues, 2)
+        ids = np.arange(0, 4, dtype=np.int64)
+        dealer.put(ColumnarBatch(ids, {"metric_value": ids.astype(np.float64)}, np.ones(4, dtype=np.bool_)))
+        self.assertEqual(queues[0].get().ids.tolist(), [0, 1])
+        self.assertEqual(queues[1].get().ids.tolist(), [2, 3])
+
+
+class ChannelMergeTest(unittest.TestCase):
+    def test_merges_dealt_channels_in_order(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2)
+        # Channel 1 is ahead of channel 0; the merge still follows the owner of expected_id
+        channels[1].put(packets(2, 3))
+        channels[1].put(packets(6, 7))
+        channels[0].put(packets(0, 1))
+        channels[0].put(packets(4, 5))
+        for channel in channels:
+            channel.put(None)
+        self.assertEqual(merge_all(merge), list(range(8)))
+
+    def test_run_stops_at_block_boundary(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2)
+        channels[0].put(packets(0, 1, 4, 5))
+        channels[1].put(packets(2, 3))
+        self.assertEqual(ids_of(merge.get()), [0, 1])
+        self.assertEqual(ids_of(merge.get()), [2, 3])
+        self.assertEqual(ids_of(merge.get()), [4, 5])
+
+    def test_columnar_runs(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2)
+        for c, start in ((1, 2), (0, 0)):
+            ids = np.arange(start, start + 2, dtype=np.int64)
+            channels[c].put(ColumnarBatch(ids, {"metric_value": ids.astype(np.float64)}, np.ones(2, dtype=np.bool_)))
+            channels[c].put(None)
+        self.assertEqual(merge_all(merge), [0, 1, 2, 3])
+
+    def test_start_id(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2, start_id=6)
+        channels[1].put(packets(6, 7))
+        channels[0].put(packets(8))
+        for channel in channels:
+            channel.put(None)
+        self.assertEqual(merge_all(merge), [6, 7, 8])
+
+    def test_idle_feed_does_not_skip_blocks(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2, gap_timeout=0.2)
+
+        def produce():
+            # Nothing at all for longer than gap_timeout, then the feed resumes
+            time.sleep(0.5)
+            channels[0].put(packets(0, 1))
+            channels[1].put(packets(2, 3))
+            channels[0].put(packets(4))
+            for channel in channels:
+                channel.put(None)
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        self.assertEqual(merge_all(merge), [0, 1, 2, 3, 4])
+        thread.join()
+
+    def test_silent_owner_is_given_up_when_later_ids_wait(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2, gap_timeout=0.1)
+        channels[1].put(packets(2, 3))
+        started = time.monotonic()
+        self.assertEqual(ids_of(merge.get()), [2, 3])
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertEqual(merge.expected_id, 4)
+
+    def test_get_timeout_raises_empty(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2, gap_timeout=1.0)
+        with self.assertRaises(queue.Empty):
+            merge.get(timeout=0.05)
+        # Idle wait must not have started the gap timer
+        self.assertIsNone(merge.waiting_since)
+        self.assertEqual(merge.expected_id, 0)
+
+    def test_ended_channel_falls_back_to_smallest_head(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2)
+        # Worker 0 ends without ever sending block 0
+        channels[0].put(None)
+        channels[1].put(packets(2, 3))
+        channels[1].put(packets(6))
+        channels[1].put(None)
+        self.assertEqual(merge_all(merge), [2, 3, 6])
+
+    def test_put_none_reaches_every_channel(self):
+        channels = [queue.Queue(), queue.Queue()]
+        merge = ChannelMerge(channels, 2)
+        merge.put(None)
+        self.assertIsNone(merge.get())
+        with self.assertRaises(TypeError):
+            merge.put(packets(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+import math
+import random
+import unittest
+from core.event_windows import EventTimeWindows, EventWindowStats
+
+
+class ReferenceWindows:
+    """Brute force: keeps every accepted value per window, nothing is ever evicted."""
+    def __init__(self, size, slide, allowed_lateness, max_out_of_orderness, group_by):
+        self.size, self.slide = size, slide
+        self.allowed_lateness, self.max_out_of_orderness = allowed_lateness, max_out_of_orderness
+        self.group_by = group_by
+        self.values = {}  # (group, start) -> accepted values
+        self.fired = set()
+        self.max_time = None
+        self.watermark = -math.inf
+        self.fired_count = self.updates = self.dropped = 0
+
+    def open_windows(self):
+        return {key for key in self.values if key[1] + self.size + self.allowed_lateness > self.watermark}
+
+    def add(self, packet):
+        t, group = packet["time_period"], packet.get(self.group_by, "") if self.group_by else ""
+        # Every window [s, s + size) holding t, starts before 0 included
+        last_start = t - t % self.slide
+        starts = list(range(last_start, t - self.size, -self.slide))
+        if all(s + self.size + self.allowed_lateness <= self.watermark for s in starts):
+            self.dropped += 1
+            return []
+        results = []
+        for start in starts:
+            if start + self.size + self.allowed_lateness > self.watermark:
+                self.values.setdefault((group, start), []).append(packet["metric_value"])
+                if (group, start) in self.fired:
+                    results.append(self.result(group, start, True))
+                    self.updates += 1
+        if self.max_time is None or t > self.max_time:
+            self.max_time = t
+            self.watermark = max(self.watermark, t - self.max_out_of_orderness)
+        return results + self.fire()
+
+    def flush(self):
+        self.watermark = math.inf
+        return self.fire()
+
+    def fire(self):
+        due = sorted((start + self.size, start, group) for group, start in self.values
+                     if (group, start) not in self.fired and start + self.size <= self.watermark)
+        for _, start, group in due:
+            self.fired.add((group, start))
+        self.fired_count += len(due)
+        return [self.result(group, start, False) for _, start, group in due]
+
+    def result(self, group, start, update):
+        values = self.values[(group, start)]
+        result = {"window_start": start, "window_end": start + self.size}
+        if self.group_by:
+            result[self.group_by] = group
+        result.update({"value": sum(values) / len(values), "count": len(values), "min": min(values), "max": max(values)})
+        if update:
+            result["late_update"] = True
+        return result
+
+
+def stream(rng, length, groups, jitter):
+    packets = []
+    for i in range(length):
+        t = max(0, i // 2 + rng.randint(-jitter, 2))
+        # Whole-number values keep the sums exact whatever order they are added in
+        packets.append({"time_period": t, "entity_name": rng.choice(groups), "metric_value": float(rng.randint(-100, 100))})
+    return packets
+
+
+class EventTimeWindowsTest(unittest.TestCase):
+    def check(self, packets, size, slide=None, allowed_lateness=0, max_out_of_orderness=0, group_by=None):
+        stats = EventWindowStats()
+        windows = EventTimeWindows(size, slide, allowed_lateness, max_out_of_orderness, group_by=group_by, stats=stats)
+        reference = ReferenceWindows(size, slide or size, allowed_lateness, max_out_of_orderness, group_by)
+        for i, packet in enumerate(packets):
+            self.assertEqual(windows.add(packet), reference.add(packet), f"packet {i}: {packet}")
+            self.assertEqual(windows.watermark, reference.watermark)
+            # Only windows that can still fire or take late updates keep state
+            open_windows = reference.open_windows()
+            self.assertEqual(set(windows.windows), open_windows)
+            self.assertEqual({group for group, _ in windows.panes} - {group for group, _ in open_windows}, set())
+            self.assertTrue(all(start + size + allowed_lateness > windows.watermark for _, start in windows.panes))
+        self.assertEqual(windows.flush(), reference.flush())
+        self.assertEqual((windows.windows, windows.panes), ({}, {}))
+        self.assertEqual(stats.stats(), {"windows_fired": reference.fired_count, "late_updates": reference.updates,
+                                         "late_dropped": reference.dropped, "open_windows": 0})
+        return reference
+
+    def test_tumbling_in_order(self):
+        packets = [{"time_period": t, "metric_value": float(t)} for t in range(25)]
+        reference = self.check(packets, 10)
+        self.assertEqual(reference.fired_count, 3)
+
+    def test_tumbling_example(self):
+        windows = EventTimeWindows(10)
+        self.assertEqual(windows.add({"time_period": 3, "metric_value": 1.0}), [])
+        self.assertEqual(windows.add({"time_period": 9, "metric_value": 3.0}), [])
+        self.assertEqual(windows.add({"time_period": 10, "metric_value": 5.0}),
+                         [{"window_start": 0, "window_end": 10, "value": 2.0, "count": 2, "min": 1.0, "max": 3.0}])
+        self.assertEqual(windows.flush(),
+                         [{"window_start": 10, "window_end": 20, "value": 5.0, "count": 1, "min": 5.0, "max": 5.0}])
+
+    def test_late_update_and_drop(self):
+        windows = EventTimeWindows(10, allowed_lateness=5, stats=EventWindowStats())
+        windows.add({"time_period": 1, "metric_value": 1.0})
+        self.assertEqual(len(windows.add({"time_period": 12, "metric_value": 2.0})), 1)
+        # Inside the lateness: window [0, 10) is emitted again with the late value
+        update = windows.add({"time_period": 4, "metric_value": 3.0})
+        self.assertEqual(update, [{"window_start": 0, "window_end": 10, "value": 2.0, "count": 2,
+                                   "min": 1.0, "max": 3.0, "late_update": True}])
+        # Watermark 15 passes end + lateness: the window and its panes are gone
+        windows.add({"time_period": 15, "metric_value": 4.0})
+        self.assertNotIn(("", 0), windows.windows)
+        self.assertNotIn(("", 0), windows.panes)
+        self.assertEqual(windows.add({"time_period": 5, "metric_value": 9.0}), [])
+        self.assertEqual(windows.stats.stats()["late_dropped"], 1)
+
+    def test_out_of_orderness_holds_the_watermark_back(self):
+        windows = EventTimeWindows(10, max_out_of_orderness=3)
+        windows.add({"time_period": 2, "metric_value": 1.0})
+        self.assertEqual(windows.add({"time_period": 12, "metric_value": 1.0}), [])
+        self.assertEqual(windows.add({"time_period": 7, "metric_value": 2.0}), [])
+        fired = windows.add({"time_period": 13, "metric_value": 1.0})
+        self.assertEqual([(w["window_start"], w["count"]) for w in fired], [(0, 2)])
+
+    def test_random_tumbling(self):
+        rng = random.Random(3)
+        for lateness, ooo in ((0, 0), (4, 0), (0, 3), (6, 2)):
+            self.check(stream(rng, 300, ["a"], 12), 10, allowed_lateness=lateness, max_out_of_orderness=ooo)
+
+    def test_random_sliding(self):
+        rng = random.Random(5)
+        for size, slide in ((10, 5), (12, 8), (9, 1), (7, 7)):
+            for lateness, ooo in ((0, 0), (5, 2)):
+                self.check(stream(rng, 250, ["a"], 10), size, slide, lateness, ooo)
+
+    def test_random_grouped(self):
+        rng = random.Random(9)
+        self.check(stream(rng, 400, ["a", "b", "c"], 14), 10, 4, 3, 1, group_by="entity_name")
+
+    def test_memory_follows_open_windows(self):
+        windows = EventTimeWindows(10, 5, allowed_lateness=5)
+        for t in range(10000):
+            windows.add({"time_period": t, "metric_value": 1.0})
+        self.assertLessEqual(len(windows.windows), 4)
+        self.assertLessEqual(len(windows.panes), 4)
+        self.assertLessEqual(len(windows.expiry) + len(windows.pending) + len(windows.pane_expiry), 12)
+
+    def test_validation(self):
+        for kwargs in ({"size": 0}, {"size": 10, "slide": 20}, {"size": 10, "allowed_lateness": -1},
+                       {"size": 10, "max_out_of_orderness": 1.5}, {"size": True}):
+            with self.assertRaises(ValueError):
+                EventTimeWindows(**kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
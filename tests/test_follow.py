@@ -0,0 +1,160 @@
+import json
+import os
+import queue
+import signal
+import tempfile
+import unittest
+from plugins.inputs.follow import CsvFollower, FollowCheckpoint
+from plugins.inputs.generic_producer import GenericInputProducer
+
+HEADER = "Sensor_ID,Timestamp,Raw_Value\n"
+SCHEMA = {
+    "columns": [
+        {"source_name": "Sensor_ID", "internal_mapping": "entity_name", "data_type": "string"},
+        {"source_name": "Timestamp", "internal_mapping": "time_period", "data_type": "integer"},
+        {"source_name": "Raw_Value", "internal_mapping": "metric_value", "data_type": "float"},
+    ]
+}
+
+
+class ScriptedFollow:
+    """Runs one action each time the follower catches up with the file, then stops it."""
+    def __init__(self, path, actions, **kwargs):
+        self.actions = list(actions)
+        self.stopped = False
+        self.follower = CsvFollower(path, should_stop=lambda: self.stopped, poll_min=0.001, poll_max=0.002,
+                                    on_idle=self.idle, **kwargs)
+
+    def idle(self):
+        if self.actions:
+            self.actions.pop(0)()
+        else:
+            self.stopped = True
+
+    def rows(self, *resume):
+        return list(self.follower.rows(*resume))
+
+
+class CsvFollowerTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "live.csv")
+        self.write(HEADER + "A,1,1.0\nB,2,2.0\n")
+
+    def write(self, text, mode="w"):
+        with open(self.path, mode, encoding="utf-8") as f:
+            f.write(text)
+
+    def test_appended_rows_and_partial_lines(self):
+        follow = ScriptedFollow(self.path, [
+            lambda: self.write("C,3,3.0\nD,4", "a"),
+            # D waits for its newline
+            lambda: self.assertEqual(follow.follower.offset, os.path.getsize(self.path) - len("D,4")),
+            lambda: self.write(",4.0\n\n", "a"),
+        ])
+        rows = follow.rows()
+        self.assertEqual(rows, [["A", "1", "1.0"], ["B", "2", "2.0"], ["C", "3", "3.0"], ["D", "4", "4.0"]])
+        self.assertEqual(follow.follower.offset, os.path.getsize(self.path))
+
+    def test_rotation_reopens_the_new_file(self):
+        headers = []
+
+        def rotate():
+            os.rename(self.path, self.path + ".1")
+            self.write("Timestamp,Sensor_ID,Raw_Value\n7,C,3.0\n")
+
+        follow = ScriptedFollow(self.path, [rotate], on_header=headers.append)
+        old_inode = os.stat(self.path).st_ino
+        rows = follow.rows()
+        self.assertEqual(rows, [["A", "1", "1.0"], ["B", "2", "2.0"], ["7", "C", "3.0"]])
+        self.assertEqual(headers, [["Sensor_ID", "Timestamp", "Raw_Value"], ["Timestamp", "Sensor_ID", "Raw_Value"]])
+        self.assertNotEqual(follow.follower.inode, old_inode)
+
+    def test_path_missing_after_rotation_keeps_waiting(self):
+        follow = ScriptedFollow(self.path, [
+            lambda: os.rename(self.path, self.path + ".1"),
+            lambda: None,
+            lambda: self.write(HEADER + "C,3,3.0\n"),
+        ])
+        self.assertEqual([row[0] for row in follow.rows()], ["A", "B", "C"])
+
+    def test_truncation_restarts_from_the_header(self):
+        follow = ScriptedFollow(self.path, [lambda: self.write(HEADER + "Z,9,9\n")])
+        inode = os.stat(self.path).st_ino
+        rows = follow.rows()
+        self.assertEqual([row[0] for row in rows], ["A", "B", "Z"])
+        self.assertEqual(follow.follower.inode, inode)
+        self.assertEqual(follow.follower.offset, os.path.getsize(self.path))
+
+    def test_resume_offset_applies_only_to_the_same_file(self):
+        first_row_end = len(HEADER) + len("A,1,1.0\n")
+        inode = os.stat(self.path).st_ino
+        self.assertEqual(ScriptedFollow(self.path, []).rows(first_row_end, inode), [["B", "2", "2.0"]])
+        # Another inode, or an offset past the end (file replaced by a shorter one): from the start
+        self.assertEqual(len(ScriptedFollow(self.path, []).rows(first_row_end, inode + 1)), 2)
+        self.assertEqual(len(ScriptedFollow(self.path, []).rows(10 ** 6, inode)), 2)
+
+
+class FollowCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(self.dir, "live.csv")
+
+    def test_save_and_load(self):
+        checkpoint = FollowCheckpoint(self.path + ".checkpoint.json", interval=3600)
+        self.assertEqual(checkpoint.load(), (0, None, 0))
+        checkpoint.commit(120, 77, 5)
+        checkpoint.save()
+        checkpoint.commit(140, 77, 6)
+        checkpoint.maybe_save()  # inside the interval: not written
+        self.assertEqual(FollowCheckpoint(checkpoint.path).load(), (120, 77, 5))
+        checkpoint.save()
+        self.assertEqual(FollowCheckpoint(checkpoint.path).load(), (140, 77, 6))
+        self.assertEqual(os.listdir(self.dir), ["live.csv.checkpoint.json"])
+
+    def test_corrupt_checkpoint_starts_over(self):
+        with open(self.path + ".checkpoint.json", "w") as f:
+            f.write("{not json")
+        self.assertEqual(FollowCheckpoint(self.path + ".checkpoint.json").load(), (0, None, 0))
+
+    def test_producer_resumes_after_the_checkpoint(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(HEADER + "A,1,1.0\nB,2,2.0\nC,3,3.0\n")
+        # run() installs the producer's Ctrl+C handlers in this process
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+
+        first = self.follow_run(3)
+        self.assertEqual([(p["_id"], p["entity_name"]) for p in first], [(0, "A"), (1, "B"), (2, "C")])
+        with open(self.path + ".checkpoint.json", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["next_id"], 3)
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("D,4,4.0\nE,5,5.0\n")
+        second = self.follow_run(2)
+        # Neither A-C again nor their ids
+        self.assertEqual([(p["_id"], p["entity_name"]) for p in second], [(3, "D"), (4, "E")])
+
+    def follow_run(self, stop_after):
+        producer = None
+        received = []
+
+        class StoppingQueue(queue.Queue):
+            def put(self, item, block=True, timeout=None):
+                if item is not None:
+                    received.append(item)
+                    if len(received) == stop_after:
+                        producer.shutdown_requested = True
+
+        producer = GenericInputProducer(StoppingQueue(), SCHEMA, 0, follow={
+            "enabled": True, "poll_min_ms": 1, "poll_max_ms": 2, "checkpoint_interval_seconds": 0})
+        producer.run(self.path)
+        return received
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+import multiprocessing as mp
+from core.ledger import VerificationLedger, LedgerStats, LedgerBusyError, _HEADER
+
+
+def hold_ledger(path, key, opened, release):
+    ledger = VerificationLedger(path, key, "pbkdf2_hmac:1000", capacity=64)
+    opened.set()
+    release.wait(10)
+    ledger.close()
+
+
+class VerificationLedgerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "verification.ledger")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, key="key-a", capacity=64, **kwargs):
+        return VerificationLedger(self.path, key, "pbkdf2_hmac:1000", capacity=capacity, **kwargs)
+
+    def test_verdicts_survive_reopen(self):
+        ledger = self.open()
+        ledger.record("24.99", "sig-a", True)
+        ledger.record("25.01", "sig-b", False)
+        self.assertIsNone(ledger.lookup("24.99", "sig-a"))  # still buffered
+        ledger.close()
+
+        ledger = self.open()
+        self.assertIs(ledger.lookup("24.99", "sig-a"), True)
+        self.assertIs(ledger.lookup("25.01", "sig-b"), False)
+        self.assertIsNone(ledger.lookup("24.99", "sig-b"))
+        self.assertEqual(ledger.stats(), {"hits": 2, "misses": 1, "appended": 0, "compactions": 0})
+        ledger.close()
+
+    def test_two_writers_share_one_file(self):
+        first, second = self.open(), self.open()
+        first.record("1.0", "s1", True)
+        second.record("1.0", "s1", True)
+        second.record("2.0", "s2", True)
+        first.flush()
+        second.flush()
+        self.assertIs(first.lookup("2.0", "s2"), True)
+        self.assertEqual(first.appended + second.appended, 2)
+        first.close()
+        second.close()
+
+    def test_compaction_keeps_newest_entries(self):
+        ledger = self.open(capacity=16, flush_every=1)
+        values = [str(i) for i in range(12)]
+        for value in values:
+            ledger.record(value, "sig", True)
+        # 16 slots: the 12th insert passes 70% load and leaves the newest 35% (5) plus itself
+        self.assertEqual(ledger.compactions, 1)
+        kept = [value for value in values if ledger.lookup(value, "sig")]
+        self.assertEqual(kept, values[-6:])
+        self.assertEqual(_HEADER.unpack_from(ledger.mm, 0)[3], 6)
+        ledger.close()
+
+    def test_new_key_rotates_the_file(self):
+        ledger = self.open("key-a")
+        ledger.record("24.99", "sig", True)
+        ledger.close()
+        inode = os.stat(self.path).st_ino
+
+        ledger = self.open("key-b")
+        self.assertNotEqual(os.stat(self.path).st_ino, inode)
+        self.assertIsNone(ledger.lookup("24.99", "sig"))
+        ledger.record("24.99", "sig", False)
+        ledger.close()
+
+        # Back to the first key: its old verdicts are gone, key-b's never leak into it
+        ledger = self.open("key-a")
+        self.assertIsNone(ledger.lookup("24.99", "sig"))
+        ledger.close()
+        self.assertEqual([name for name in os.listdir(self.tmp.name)], ["verification.ledger"])
+
+    def test_foreign_file_in_use_is_not_replaced(self):
+        ctx = mp.get_context("fork")
+        opened, release = ctx.Event(), ctx.Event()
+        holder = ctx.Process(target=hold_ledger, args=(self.path, "key-a", opened, release))
+        holder.start()
+        try:
+            self.assertTrue(opened.wait(10))
+            inode = os.stat(self.path).st_ino
+            with self.assertRaises(LedgerBusyError):
+                self.open("key-b")
+            # Same key but another capacity is just as foreign
+            with self.assertRaises(LedgerBusyError):
+                self.open("key-a", capacity=128)
+            self.assertEqual(os.stat(self.path).st_ino, inode)
+            # A matching configuration joins the file the holder is using
+            self.open("key-a").close()
+        finally:
+            release.set()
+            holder.join()
+        ledger = self.open("key-b")
+        self.assertNotEqual(os.stat(self.path).st_ino, inode)
+        ledger.close()
+
+    def test_shared_stats(self):
+        stats = LedgerStats()
+        ledger = self.open(flush_every=2, stats=stats)
+        ledger.record("1.0", "s", True)
+        ledger.record("2.0", "s", True)
+        ledger.lookup("1.0", "s")
+        self.assertEqual(stats.stats()["hits"], 0)  # published every 2 lookups
+        ledger.lookup("3.0", "s")
+        self.assertEqual(stats.stats(), {"hits": 1, "misses": 1, "appended": 2, "compactions": 0})
+        ledger.lookup("2.0", "s")
+        ledger.close()
+        self.assertEqual(stats.stats(), {"hits": 2, "misses": 1, "appended": 2, "compactions": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
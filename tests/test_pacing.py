@@ -0,0 +1,118 @@
+import unittest
+from unittest import mock
+from plugins.inputs import pacing
+from plugins.inputs.pacing import (EventTimePacer, FixedDelayPacer, Pacer, TokenBucketPacer,
+                                   create_pacer, sleep_until)
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() moves the clock by the slept time plus overshoot."""
+    def __init__(self, overshoot=0.0, tick=0.0):
+        self.now = 100.0
+        self.overshoot = overshoot
+        self.tick = tick  # advance per monotonic() call, so a spin loop terminates
+        self.sleeps = []
+        self.reads = 0
+
+    def monotonic(self):
+        self.reads += 1
+        self.now += self.tick
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds + self.overshoot
+
+
+class PacingTest(unittest.TestCase):
+    def use_clock(self, clock):
+        patcher = mock.patch.object(pacing, "time", clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return clock
+
+    def test_sleep_until_sleeps_without_spinning(self):
+        clock = self.use_clock(FakeClock())
+        sleep_until(100.0005)
+        self.assertEqual(len(clock.sleeps), 1)
+        self.assertAlmostEqual(clock.sleeps[0], 0.0005)
+        self.assertEqual(clock.reads, 2)
+        sleep_until(50.0)
+        self.assertEqual(len(clock.sleeps), 1)
+
+    def test_precise_sleep_until_spins_the_last_millisecond(self):
+        clock = self.use_clock(FakeClock(tick=1e-5))
+        sleep_until(100.01, precise=True)
+        self.assertEqual(len(clock.sleeps), 1)
+        self.assertAlmostEqual(clock.sleeps[0], 0.01 - pacing._SPIN_SECONDS, delta=1e-4)
+        self.assertGreater(clock.reads, 50)
+        self.assertGreaterEqual(clock.now, 100.01)
+
+    def test_fixed_delay_keeps_its_schedule(self):
+        clock = self.use_clock(FakeClock(overshoot=0.003))
+        pacer = FixedDelayPacer(0.1)
+        releases = []
+        for _ in range(5):
+            pacer.wait({})
+            releases.append(clock.now)
+        # Each sleep overshoots, the next deadline is still start + n * delay
+        for n, release in enumerate(releases, 1):
+            self.assertAlmostEqual(release, 100.0 + n * 0.1 + 0.003, delta=1e-9)
+
+    def test_fixed_delay_does_not_burst_after_a_stall(self):
+        clock = self.use_clock(FakeClock())
+        pacer = FixedDelayPacer(0.1)
+        pacer.wait({})
+        clock.now += 5.0
+        # Released at once, and the schedule restarts from now instead of catching up 50 rows
+        pacer.wait({})
+        self.assertEqual(len(clock.sleeps), 1)
+        pacer.wait({})
+        self.assertEqual(len(clock.sleeps), 2)
+        self.assertAlmostEqual(clock.sleeps[-1], 0.1)
+
+    def test_token_bucket_bursts_then_holds_the_rate(self):
+        clock = self.use_clock(FakeClock())
+        pacer = TokenBucketPacer(100, burst=5)
+        for _ in range(5):
+            pacer.wait({})
+        self.assertEqual(clock.sleeps, [])
+        for _ in range(100):
+            pacer.wait({})
+        self.assertAlmostEqual(clock.now - 100.0, 1.0, delta=1e-6)
+        # Idle time refills the bucket, never beyond burst
+        clock.now += 10.0
+        sleeps = len(clock.sleeps)
+        for _ in range(5):
+            pacer.wait({})
+        self.assertEqual(len(clock.sleeps), sleeps)
+        pacer.wait({})
+        self.assertEqual(len(clock.sleeps), sleeps + 1)
+
+    def test_event_time_replays_the_gaps(self):
+        clock = self.use_clock(FakeClock())
+        pacer = EventTimePacer(speed=2.0)
+        releases = []
+        for t in (1000, 1002, 1001, 1010):
+            pacer.wait({"time_period": t})
+            releases.append(clock.now)
+        # 2 s of event time is 1 s at double speed; the step back goes out at once
+        self.assertEqual(releases, [100.0, 101.0, 101.0, 105.0])
+        pacer.wait({})
+        self.assertEqual(clock.now, 105.0)
+
+    def test_create_pacer(self):
+        self.assertIsInstance(create_pacer(None, 0.5), FixedDelayPacer)
+        self.assertIs(type(create_pacer(None, 0)), Pacer)
+        self.assertIs(type(create_pacer({"mode": "unthrottled"}, 0.5)), Pacer)
+        bucket = create_pacer({"mode": "token_bucket", "rows_per_second": 50, "burst": 4, "precise": True}, 0)
+        self.assertEqual((bucket.rate, bucket.capacity, bucket.precise), (50.0, 4.0, True))
+        replay = create_pacer({"mode": "event_time", "time_field": "ts", "speed": 3}, 0)
+        self.assertEqual((replay.time_field, replay.speed, replay.precise), ("ts", 3.0, False))
+        self.assertTrue(create_pacer({"precise": True}, 0.5).precise)
+        with self.assertRaises(ValueError):
+            create_pacer({"mode": "warp"}, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import math
+import queue
+import random
+import threading
+import time
+import unittest
+from core.columnar import BatchLayout
+from core.partitioned import AggregationRouter, SensorAgregator, partition_of
+
+SCHEMA = {
+    "columns": [
+        {"source_name": "Sensor_ID", "internal_mapping": "entity_name", "data_type": "string"},
+        {"source_name": "Raw_Value", "internal_mapping": "metric_value", "data_type": "float"},
+    ]
+}
+SENSORS = ["alpha", "beta", "gamma", "delta", "eps"]
+
+
+def make_packets(rng, count):
+    packets = []
+    for i in range(count):
+        if rng.random() < 0.1:
+            packets.append({"_id": i, "isValid": False})
+        else:
+            packets.append({"_id": i, "isValid": True, "entity_name": rng.choice(SENSORS),
+                            "metric_value": rng.uniform(-10, 40)})
+    return packets
+
+
+def shuffled_batches(rng, packets, max_batch, spread):
+    """Batches of nearby packets, delivered out of order like several workers would."""
+    batches, i = [], 0
+    while i < len(packets):
+        size = rng.randint(1, max_batch)
+        batches.append(packets[i:i + size])
+        i += size
+    # Each batch moves at most `spread` places from where it was produced
+    keyed = sorted(enumerate(batches), key=lambda b: b[0] + rng.uniform(0, spread))
+    return [batch for _, batch in keyed]
+
+
+def reference(packets, partitions, max_len, windows=()):
+    """Per partition, the outputs a single in-order pass over the valid packets would give."""
+    history, outputs = {}, [[] for _ in range(partitions)]
+    for packet in packets:
+        if not packet.get("isValid"):
+            continue
+        entity = packet["entity_name"]
+        values = history.setdefault(entity, [])
+        values.append(packet["metric_value"])
+        output = {"entity_name": entity, "value": math.fsum(values[-max_len:]) / len(values[-max_len:])}
+        if windows:
+            output["windows"] = {str(size): max(values[-size:]) for size in windows}
+        outputs[partition_of(entity, partitions)].append(output)
+    return outputs
+
+
+def drain(q):
+    items = []
+    while True:
+        item = q.get(timeout=5)
+        if item is None:
+            return items
+        items.append(item)
+
+
+class PartitionedTest(unittest.TestCase):
+    def run_stage(self, items, partitions, max_len, windows=None, reorder=None):
+        source = queue.Queue()
+        for item in items:
+            source.put(item)
+        source.put(None)
+        partition_queues = [queue.Queue() for _ in range(partitions)]
+        router = AggregationRouter(source, partition_queues, reorder=reorder)
+        router.route()
+        outputs = []
+        for partition_queue in partition_queues:
+            output = queue.Queue()
+            SensorAgregator(partition_queue, output, max_len, windows=windows,
+                            statistics=("max",) if windows else None).agregate()
+            outputs.append(drain(output))
+        return router, outputs
+
+    def assert_outputs(self, got, expected):
+        self.assertEqual([len(p) for p in got], [len(p) for p in expected])
+        for partition, (got_p, expected_p) in enumerate(zip(got, expected)):
+            for g, e in zip(got_p, expected_p):
+                self.assertEqual(g["entity_name"], e["entity_name"], f"partition {partition}")
+                self.assertTrue(math.isclose(g["value"], e["value"], rel_tol=1e-12, abs_tol=1e-12))
+                if "windows" in e:
+                    self.assertEqual({size: w["max"] for size, w in g["windows"].items()}, e["windows"])
+
+    def test_out_of_order_packets_come_out_in_id_order(self):
+        rng = random.Random(1)
+        packets = make_packets(rng, 2000)
+        items = shuffled_batches(rng, packets, 8, 30)
+        for partitions in (1, 3):
+            router, outputs = self.run_stage(items, partitions, 10)
+            self.assertEqual(router.frontier, 2000)
+            self.assert_outputs(outputs, reference(packets, partitions, 10))
+
+    def test_single_packets_and_windows(self):
+        rng = random.Random(2)
+        packets = make_packets(rng, 600)
+        # Items that are one packet dict each, not lists
+        items = [batch[0] for batch in shuffled_batches(rng, packets, 1, 20)]
+        _, outputs = self.run_stage(items, 2, 5, windows=[3, 20])
+        self.assert_outputs(outputs, reference(packets, 2, 5, windows=(3, 20)))
+
+    def test_columnar_batches(self):
+        rng = random.Random(4)
+        packets = make_packets(rng, 1000)
+        layout = BatchLayout(SCHEMA)
+        head, tail = packets[:992], packets[992:]
+        items = [layout.pack(batch) for batch in shuffled_batches(rng, head, 16, 10)]
+        # Non-contiguous batches go through the per-packet path
+        items += [layout.pack(tail[::2]), layout.pack(tail[1::2])]
+        rng.shuffle(items)
+        router, outputs = self.run_stage(items, 3, 25)
+        self.assertEqual(router.frontier, 1000)
+        self.assert_outputs(outputs, reference(packets, 3, 25))
+
+    def test_gap_timeout_releases_later_packets(self):
+        source = queue.Queue()
+        partition_queues = [queue.Queue()]
+        router = AggregationRouter(source, partition_queues, reorder={"gap_timeout_s": 0.05})
+        thread = threading.Thread(target=router.route)
+        thread.start()
+        packet = lambda i: {"_id": i, "isValid": True, "entity_name": "alpha", "metric_value": float(i)}
+        source.put([packet(0), packet(2)])
+        time.sleep(0.3)
+        # Id 1 was given up on: the frontier moved past 2, and 1 is dropped when it shows up
+        source.put(packet(1))
+        source.put(None)
+        thread.join(5)
+        messages = drain(partition_queues[0])
+        self.assertEqual(messages[0], (1, [packet(0), packet(2)]))
+        self.assertEqual(messages[1], (3, []))
+        self.assertEqual(len(messages), 2)
+
+    def test_unordered_operation_skips_the_frontier(self):
+        rng = random.Random(6)
+        packets = make_packets(rng, 300)
+        source = queue.Queue()
+        for item in shuffled_batches(rng, packets, 4, 50):
+            source.put(item)
+        source.put(None)
+        partition_queues = [queue.Queue(), queue.Queue()]
+        AggregationRouter(source, partition_queues, ordered=False).route()
+        totals = {}
+        for partition_queue in partition_queues:
+            output = queue.Queue()
+            SensorAgregator(partition_queue, output, 10, operation="running_total").agregate()
+            for result in drain(output):
+                totals[result["entity_name"]] = result
+        for entity in SENSORS:
+            values = [p["metric_value"] for p in packets if p.get("isValid") and p["entity_name"] == entity]
+            self.assertEqual(totals[entity]["count"], len(values))
+            self.assertTrue(math.isclose(totals[entity]["sum"], math.fsum(values), rel_tol=1e-12))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import random
+import time
+import unittest
+from core.reorder import ReorderRing, ReorderStats
+
+
+class ReorderRingTest(unittest.TestCase):
+    def setUp(self):
+        self.stats = ReorderStats()
+
+    def test_releases_in_id_order(self):
+        ring = ReorderRing(0, 16, stats=self.stats)
+        self.assertEqual(ring.push(2, "c"), [])
+        self.assertEqual(ring.push(1, "b"), [])
+        self.assertEqual(ring.push(0, "a"), ["a", "b", "c"])
+        self.assertEqual(ring.expected_id, 3)
+        self.assertEqual(ring.count, 0)
+
+    def test_start_id(self):
+        ring = ReorderRing(100, 16)
+        self.assertEqual(ring.push(101, "b"), [])
+        self.assertEqual(ring.push(100, "a"), ["a", "b"])
+
+    def test_span_unit_moves_expected_past_its_ids(self):
+        ring = ReorderRing(0, 16, stats=self.stats)
+        self.assertEqual(ring.push(4, "e"), [])
+        self.assertEqual(ring.push(0, "batch 0-3", span=4), ["batch 0-3", "e"])
+        self.assertEqual(ring.expected_id, 5)
+
+    def test_late_unit_is_dropped(self):
+        ring = ReorderRing(0, 16, stats=self.stats)
+        ring.push(0, "a")
+        self.assertEqual(ring.push(0, "again"), [])
+        self.assertEqual(self.stats.stats()["late_packets"], 1)
+
+    def test_duplicate_waiting_id_keeps_count_consistent(self):
+        ring = ReorderRing(0, 16, stats=self.stats)
+        ring.push(3, "first")
+        self.assertEqual(ring.push(3, "duplicate"), [])
+        self.assertEqual(ring.count, 1)
+        self.assertEqual(self.stats.stats()["late_packets"], 1)
+        # Used to raise StopIteration once count could no longer reach 0
+        self.assertEqual(ring.drain(), ["first"])
+        self.assertEqual(ring.count, 0)
+
+    def test_window_overflow_skips_missing_ids(self):
+        ring = ReorderRing(0, 4, stats=self.stats)
+        ring.push(1, "b")
+        # 6 needs the window to cover 3..6: 0 is skipped, 1 released, 2 skipped
+        self.assertEqual(ring.push(6, "g"), ["b"])
+        self.assertEqual(ring.expected_id, 3)
+        stats = self.stats.stats()
+        self.assertEqual(stats["window_overflows"], 1)
+        self.assertEqual(stats["skipped_ids"], 2)
+        self.assertEqual(ring.push(0, "a"), [])
+        self.assertEqual(self.stats.stats()["late_packets"], 1)
+
+    def test_gap_timeout_skips_to_next_waiting_unit(self):
+        ring = ReorderRing(0, 16, gap_timeout=0.05, stats=self.stats)
+        self.assertIsNone(ring.time_left())
+        ring.push(3, "d")
+        ring.push(4, "e")
+        self.assertIsNotNone(ring.time_left())
+        self.assertEqual(ring.expire(), [])
+        time.sleep(0.06)
+        self.assertEqual(ring.time_left(), 0.0)
+        self.assertEqual(ring.expire(), ["d", "e"])
+        stats = self.stats.stats()
+        self.assertEqual(stats["gap_timeouts"], 1)
+        self.assertEqual(stats["skipped_ids"], 3)
+        self.assertIsNone(ring.time_left())
+
+    def test_drain_releases_across_gaps(self):
+        ring = ReorderRing(0, 16, stats=self.stats)
+        ring.push(5, "f")
+        ring.push(2, "c", span=2)
+        ring.push(9, "j")
+        self.assertEqual(ring.drain(), ["c", "f", "j"])
+        self.assertEqual(ring.expected_id, 10)
+        self.assertEqual(self.stats.stats()["skipped_ids"], 6)
+        self.assertEqual(ring.drain(), [])
+
+    def test_skips_do_not_scan_the_window(self):
+        ring = ReorderRing(0, 1 << 20, gap_timeout=0.0, stats=self.stats)
+        ring.push(900000, "far")
+        started = time.monotonic()
+        self.assertEqual(ring.expire(), ["far"])
+        ring.push(1800000, "farther")
+        self.assertEqual(ring.drain(), ["farther"])
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertEqual(self.stats.stats()["skipped_ids"], 1799999)
+
+    def test_matches_reference_order_for_random_arrivals(self):
+        rng = random.Random(7)
+        ids = list(range(2000))
+        rng.shuffle(ids)
+        ring = ReorderRing(0, 64, stats=self.stats)
+        released = []
+        for i in ids:
+            released.extend(ring.push(i, i))
+        released.extend(ring.drain())
+        # Whatever survives the 64-slot window comes out strictly increasing
+        self.assertEqual(released, sorted(released))
+        stats = self.stats.stats()
+        self.assertEqual(len(released) + stats["late_packets"], 2000)
+        self.assertEqual(ring.waiting, [])
+
+    def test_in_order_stream_keeps_no_heap_entries(self):
+        ring = ReorderRing(0, 16)
+        for i in range(100):
+            ring.push(i, i)
+        self.assertEqual(ring.waiting, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
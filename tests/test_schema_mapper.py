@@ -0,0 +1,69 @@
+import random
+import unittest
+from plugins.inputs.schema_mapper import ColumnMappingError, SchemaMapper, TypeCastError
+
+SCHEMA = {
+    "columns": [
+        {"source_name": "Sensor_ID", "internal_mapping": "entity_name", "data_type": "string"},
+        {"source_name": "Timestamp", "internal_mapping": "time_period", "data_type": "integer"},
+        {"source_name": "Raw_Value", "internal_mapping": "metric_value", "data_type": "float"},
+        {"source_name": "Online", "internal_mapping": "online", "data_type": "boolean"},
+    ]
+}
+
+
+def random_fields(rng, header):
+    values = {
+        "Sensor_ID": rng.choice(["Alpha", "Beta", "", "x y"]),
+        "Timestamp": rng.choice(["1700000000", "24.99", "-3"]),
+        "Raw_Value": rng.choice(["24.99", "-1e3", "0", "inf"]),
+        "Online": rng.choice(["true", "YES", "0", "off", ""]),
+    }
+    return [values.get(name, f"extra-{rng.randint(0, 9)}") for name in header]
+
+
+class RowDecoderTest(unittest.TestCase):
+    def test_matches_process_row(self):
+        rng = random.Random(5)
+        for passthrough in (False, True):
+            mapper = SchemaMapper(dict(SCHEMA, passthrough_extra_columns=passthrough))
+            for _ in range(50):
+                header = ["Sensor_ID", "Timestamp", "Raw_Value", "Online", "Site", "Notes"]
+                rng.shuffle(header)
+                decoder = mapper.compile(header)
+                fields = random_fields(rng, header)
+                self.assertEqual(decoder.decode(fields), mapper.process_row(dict(zip(header, fields))))
+
+    def test_unmapped_columns_are_never_read(self):
+        mapper = SchemaMapper(SCHEMA)
+        header = ["Notes", "Sensor_ID", "Timestamp", "Raw_Value", "Online", "Trailing"]
+        decoder = mapper.compile(header)
+        self.assertEqual([index for _, index, _, _ in decoder.plan], [1, 2, 3, 4])
+        self.assertEqual(decoder.min_fields, 5)
+        # Garbage in, or no field at all for, the unmapped columns doesn't matter
+        packet = decoder.decode([object(), "Alpha", "7", "1.5", "on"])
+        self.assertEqual(packet, {"entity_name": "Alpha", "time_period": 7, "metric_value": 1.5, "online": True})
+
+    def test_passthrough_keeps_extra_columns_raw(self):
+        mapper = SchemaMapper(dict(SCHEMA, passthrough_extra_columns=True))
+        decoder = mapper.compile(["Site", "Sensor_ID", "Timestamp", "Raw_Value", "Online"])
+        packet = decoder.decode(["42", "Alpha", "7", "1.5", "no"])
+        self.assertEqual(packet["_raw_Site"], "42")
+        self.assertEqual(list(packet), ["entity_name", "time_period", "metric_value", "online", "_raw_Site"])
+
+    def test_errors(self):
+        mapper = SchemaMapper(SCHEMA)
+        with self.assertRaises(ColumnMappingError):
+            mapper.compile(["Sensor_ID", "Timestamp", "Raw_Value"])
+        decoder = mapper.compile(["Sensor_ID", "Timestamp", "Raw_Value", "Online"])
+        with self.assertRaises(ColumnMappingError):
+            decoder.decode(["Alpha", "7", "1.5"])
+        # The slow path names the failing value
+        with self.assertRaisesRegex(TypeCastError, "not-a-number"):
+            decoder.decode(["Alpha", "7", "not-a-number", "true"])
+        with self.assertRaises(TypeCastError):
+            decoder.decode(["Alpha", "", "1.5", "true"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import json
+import os
+import queue
+import signal
+import tempfile
+import unittest
+from plugins.inputs.generic_producer import GenericInputProducer, ProducerError
+from plugins.inputs.read_ahead import open_dataset_text
+from plugins.inputs.sharded_producer import ShardedInputProducer, plan_chunks
+from core.transport import QueueFactory
+
+SCHEMA = {
+    "columns": [
+        {"source_name": "Sensor_ID", "internal_mapping": "entity_name", "data_type": "string"},
+        {"source_name": "Timestamp", "internal_mapping": "time_period", "data_type": "integer"},
+        {"source_name": "Raw_Value", "internal_mapping": "metric_value", "data_type": "float"},
+    ]
+}
+HEADER = "Sensor_ID,Timestamp,Raw_Value"
+ROWS = [
+    "Alpha,100,24.99",
+    '"Beta, north wing",101,25.5',
+    "Gamma,102,not-a-number",
+    '"Delta ""quoted""",103,1',
+    "",
+    "Alpha,104,30.25",
+]
+
+
+def chunk_lines(path, chunks):
+    with open(path, "rb") as f:
+        data = f.read()
+    return [data[start:end] for _, start, end, _ in chunks]
+
+
+class PlanChunksTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text, bom=False):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write((b"\xef\xbb\xbf" if bom else b"") + text.encode("utf-8"))
+        return path
+
+    def test_every_chunk_ends_on_a_line_boundary(self):
+        path = self.write("a.csv", HEADER + "\n" + "\n".join(ROWS) + "\n")
+        body_start = len(HEADER) + 1
+        for chunk_bytes in range(1, 40):
+            headers, chunks = plan_chunks([path], chunk_bytes)
+            self.assertEqual(headers, [HEADER.split(",")])
+            pieces = chunk_lines(path, chunks)
+            # Contiguous, complete and newline-terminated
+            self.assertEqual(chunks[0][1], body_start)
+            for (_, _, end, _), (_, start, _, _) in zip(chunks, chunks[1:]):
+                self.assertEqual(end, start)
+            self.assertEqual(chunks[-1][2], os.path.getsize(path))
+            self.assertTrue(all(piece.endswith(b"\n") for piece in pieces))
+            # Id bases count the lines before each chunk, blank ones included
+            ids = [id_base for *_, id_base in chunks]
+            self.assertEqual(ids, [sum(p.count(b"\n") for p in pieces[:i]) for i in range(len(pieces))])
+
+    def test_boundary_inside_a_quoted_field_keeps_the_row_whole(self):
+        path = self.write("a.csv", HEADER + "\n" + "\n".join(ROWS) + "\n")
+        quoted = (len(HEADER) + 1) + len(ROWS[0]) + 1 + 5  # inside "Beta, north wing"
+        _, chunks = plan_chunks([path], quoted - (len(HEADER) + 1))
+        pieces = chunk_lines(path, chunks)
+        self.assertEqual(pieces[0], (ROWS[0] + "\n" + ROWS[1] + "\n").encode())
+        producer = GenericInputProducer(queue.Queue(), SCHEMA, 0)
+        rows = list(producer._read_chunk_rows(path, chunks[0][1], chunks[0][2]))
+        self.assertEqual(rows[1], ["Beta, north wing", "101", "25.5"])
+
+    def test_last_line_without_newline(self):
+        path = self.write("a.csv", HEADER + "\nAlpha,1,1.0\nBeta,2,2.0")
+        _, chunks = plan_chunks([path], 4)
+        self.assertEqual([id_base for *_, id_base in chunks], [0, 1])
+        self.assertEqual(chunks[-1][2], os.path.getsize(path))
+
+    def test_header_only_and_empty_files(self):
+        path = self.write("header.csv", HEADER)
+        self.assertEqual(plan_chunks([path], 8), ([HEADER.split(",")], []))
+        with self.assertRaises(ProducerError):
+            plan_chunks([self.write("empty.csv", "")], 8)
+        with self.assertRaises(ProducerError):
+            plan_chunks([os.path.join(self.tmp.name, "missing.csv")], 8)
+
+    def test_id_bases_continue_across_files(self):
+        first = self.write("1.csv", HEADER + "\nA,1,1\nB,2,2\n")
+        second = self.write("2.csv", HEADER + "\nC,3,3\n")
+        _, chunks = plan_chunks([first, second], 1)
+        self.assertEqual([(f, id_base) for f, _, _, id_base in chunks], [(0, 0), (0, 1), (1, 2)])
+
+    def test_bom_is_dropped_like_the_single_reader_does(self):
+        path = self.write("bom.csv", HEADER + "\nAlpha,1,1.0\n", bom=True)
+        headers, _ = plan_chunks([path], 8)
+        with open_dataset_text(path) as f:
+            self.assertEqual(f.readline().rstrip("\r\n").split(","), headers[0])
+        self.assertEqual(headers[0][0], "Sensor_ID")
+
+
+class ShardedInputProducerTest(unittest.TestCase):
+    def test_rate_is_split_across_readers(self):
+        producer = ShardedInputProducer(queue.Queue(), SCHEMA, 0.01, processes=4)
+        self.assertAlmostEqual(producer.reader_delay, 0.04)
+        producer = ShardedInputProducer(queue.Queue(), SCHEMA, 0.01, processes=4,
+                                        pacing={"mode": "token_bucket", "rows_per_second": 1000, "burst": 8})
+        self.assertEqual(producer.pacing["rows_per_second"], 250)
+        self.assertEqual(producer.pacing["burst"], 2)
+
+    def test_same_packets_as_the_single_reader(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "bom.csv")
+        with open(path, "wb") as f:
+            f.write(b"\xef\xbb\xbf" + (HEADER + "\n" + "\n".join(ROWS * 5) + "\n").encode("utf-8"))
+
+        factory = QueueFactory("mp_queue")
+        self.addCleanup(factory.close)
+        q = factory.create(1000)
+        ShardedInputProducer(q, SCHEMA, 0, processes=3, chunk_bytes=16).run(path)
+        sharded = drain(q)
+
+        single_queue = queue.Queue()
+        # run() installs the producer's Ctrl+C handlers in this process
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+        GenericInputProducer(single_queue, SCHEMA, 0).run(path)
+        single = drain(single_queue)
+
+        # The single reader skips bad rows, the sharded one queues invalid placeholders for them
+        valid = sorted((p for p in sharded if p.get("isValid", True)), key=lambda p: p["_id"])
+        self.assertEqual(len(sharded), len(ROWS) * 5)
+        self.assertEqual([strip_id(p) for p in valid], [strip_id(p) for p in single])
+        self.assertEqual(sorted(p["_id"] for p in sharded), list(range(len(ROWS) * 5)))
+
+
+def drain(q):
+    packets = []
+    while True:
+        item = q.get(timeout=10)
+        if item is None:
+            return packets
+        packets.append(item)
+
+
+def strip_id(packet):
+    return json.dumps({k: v for k, v in packet.items() if k != "_id"}, sort_keys=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
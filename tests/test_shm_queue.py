@@ -0,0 +1,101 @@
+import pickle
+import queue
+import time
+import unittest
+import multiprocessing as mp
+from core.shm_queue import SharedMemoryQueue
+
+
+def produce(q, count):
+    for i in range(count):
+        q.put({"_id": i})
+    q.put(None)
+
+
+class SharedMemoryQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = SharedMemoryQueue(3, slot_size=256)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_round_trip(self):
+        items = [{"_id": 0, "metric_value": 1.5}, [1, 2, 3], "text", None]
+        for item in items:
+            self.queue.put(item)
+            self.assertEqual(self.queue.get(), item)
+
+    def test_fifo_and_sizes(self):
+        self.assertTrue(self.queue.empty())
+        for i in range(3):
+            self.queue.put(i)
+        self.assertEqual(self.queue.qsize(), 3)
+        self.assertTrue(self.queue.full())
+        self.assertEqual([self.queue.get() for _ in range(3)], [0, 1, 2])
+        self.assertTrue(self.queue.empty())
+
+    def test_wraparound(self):
+        # head and tail pass the end of the ring many times over
+        out = []
+        for i in range(20):
+            self.queue.put(i)
+            if i % 2:
+                out.append(self.queue.get())
+                out.append(self.queue.get())
+        self.assertEqual(out, list(range(20)))
+        self.assertEqual(self.queue.qsize(), 0)
+
+    def test_full_times_out(self):
+        for i in range(3):
+            self.queue.put_nowait(i)
+        with self.assertRaises(queue.Full):
+            self.queue.put_nowait(3)
+        started = time.monotonic()
+        with self.assertRaises(queue.Full):
+            self.queue.put(3, timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(self.queue.get(), 0)
+
+    def test_empty_times_out(self):
+        with self.assertRaises(queue.Empty):
+            self.queue.get_nowait()
+        started = time.monotonic()
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+    def test_oversize_item_is_refused_without_using_a_slot(self):
+        with self.assertRaises(ValueError):
+            self.queue.put(b"x" * 1024)
+        for i in range(3):
+            self.queue.put_nowait(i)
+        self.assertEqual(self.queue.qsize(), 3)
+
+    def test_item_filling_the_slot_exactly(self):
+        # Grow a bytes payload until its pickle is exactly one slot long
+        payload = b""
+        while len(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)) < self.queue.slot_size:
+            payload += b"x"
+        self.queue.put(payload)
+        self.assertEqual(self.queue.get(), payload)
+
+    def test_across_processes(self):
+        ctx = mp.get_context("fork")
+        producer = ctx.Process(target=produce, args=(self.queue, 200))
+        producer.start()
+        received = []
+        while True:
+            item = self.queue.get(timeout=10)
+            if item is None:
+                break
+            received.append(item["_id"])
+        producer.join()
+        self.assertEqual(received, list(range(200)))
+
+    def test_needs_a_bound(self):
+        with self.assertRaises(ValueError):
+            SharedMemoryQueue(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
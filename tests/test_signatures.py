@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import unittest
+from core.signatures import ALGORITHMS, KeyRing, Signer, resolve_signer
+from core.verify_cache import VerificationCache
+
+KEY = "sda_spring_2026_secure_key"
+
+
+class SignerTest(unittest.TestCase):
+    def test_algorithms_registered(self):
+        self.assertEqual(set(ALGORITHMS), {"pbkdf2_hmac", "hmac_sha256", "blake2b", "scrypt"})
+
+    def test_pbkdf2_matches_hashlib(self):
+        signer = ALGORITHMS["pbkdf2_hmac"](KEY, {"iterations": 1000})
+        expected = hashlib.pbkdf2_hmac("sha256", KEY.encode(), b"24.99", 1000)
+        self.assertEqual(signer.derive("24.99"), expected)
+        self.assertEqual(signer.variant(), 1000)
+
+    def test_pbkdf2_verifies_the_sample_dataset(self):
+        signer = resolve_signer({"secret_key": KEY, "iterations": 100000})
+        signature = "18d9d277ba10acd37fc5f4ab791829b0b3de8c4625f75563b808f545874e2fed"
+        self.assertTrue(signer.verify(signature, "24.99"))
+        self.assertFalse(signer.verify(signature, "24.98"))
+
+    def test_hmac_sha256_matches_hmac(self):
+        signer = ALGORITHMS["hmac_sha256"](KEY, {})
+        expected = hmac.new(KEY.encode(), b"24.99", hashlib.sha256).digest()
+        self.assertEqual(signer.derive("24.99"), expected)
+
+    def test_blake2b_matches_hashlib(self):
+        for params, size in (({}, 32), ({"digest_size": 16}, 16), ({"digest_size": 64}, 64)):
+            signer = ALGORITHMS["blake2b"](KEY, params)
+            expected = hashlib.blake2b(b"24.99", key=KEY.encode(), digest_size=size).digest()
+            self.assertEqual(signer.derive("24.99"), expected)
+            self.assertEqual(signer.variant(), f"blake2b:{size}")
+        with self.assertRaises(ValueError):
+            ALGORITHMS["blake2b"](KEY, {"digest_size": 65})
+        with self.assertRaises(ValueError):
+            ALGORITHMS["blake2b"]("k" * 65, {})
+
+    def test_scrypt_matches_hashlib(self):
+        signer = ALGORITHMS["scrypt"](KEY, {"n": 1024, "r": 8, "p": 1})
+        expected = hashlib.scrypt(KEY.encode(), salt=b"24.99", n=1024, r=8, p=1, dklen=32)
+        self.assertEqual(signer.derive("24.99"), expected)
+        self.assertEqual(signer.variant(), "scrypt:1024:8:1")
+
+    def test_sign_and_verify_round_trip(self):
+        params = {"iterations": 1000, "n": 1024}
+        for name, signer_class in ALGORITHMS.items():
+            signer = signer_class(KEY, params)
+            signature = signer.sign("30.5")
+            self.assertTrue(signer.verify(signature, "30.5"), name)
+            self.assertFalse(signer.verify(signature, "30.6"), name)
+            tampered = signature[:-1] + ("1" if signature[-1] == "0" else "0")
+            self.assertFalse(signer.verify(tampered, "30.5"), name)
+
+    def test_verify_through_the_cache(self):
+        cache = VerificationCache(64)
+        self.addCleanup(cache.close)
+        signer = ALGORITHMS["blake2b"](KEY, {"digest_size": 20})
+        signature = signer.sign("1.25")
+        self.assertTrue(signer.verify(signature, "1.25", cache))
+        self.assertTrue(signer.verify(signature, "1.25", cache))
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_incomplete_signer_fails_at_construction(self):
+        class NoDerive(Signer):
+            name = "no_derive"
+
+        with self.assertRaises(TypeError):
+            NoDerive(KEY, {})
+
+    def test_resolve_signer_rejects_unknown_names(self):
+        with self.assertRaises(ValueError):
+            resolve_signer({"secret_key": KEY, "algorithm": "md5"})
+        with self.assertRaises(ValueError):
+            resolve_signer({"secret_key": KEY, "operation": "encrypt"})
+
+
+class KeyRingTest(unittest.TestCase):
+    def setUp(self):
+        self.ring = resolve_signer({
+            "algorithm": "hmac_sha256",
+            "keys": [
+                {"id": "old", "secret_key": "old-key", "valid_until": 100},
+                {"id": "new", "secret_key": "new-key", "valid_from": 100},
+            ],
+        })
+        self.old = ALGORITHMS["hmac_sha256"]("old-key", {})
+        self.new = ALGORITHMS["hmac_sha256"]("new-key", {})
+
+    def test_newest_key_is_tried_first(self):
+        self.assertIsInstance(self.ring, KeyRing)
+        self.assertEqual(self.ring.ids, ["new", "old"])
+        self.assertEqual(self.ring.candidates(time_period=50), [1, 0])
+        self.assertEqual(self.ring.candidates(time_period=150), [0, 1])
+        self.assertEqual(self.ring.candidates(key_id="old"), [1, 0])
+        self.assertEqual(self.ring.sign("1.0"), self.new.sign("1.0"))
+        self.assertEqual(self.ring.sign("1.0", "old"), self.old.sign("1.0"))
+
+    def test_old_key_still_verifies_after_rotation(self):
+        signature = self.old.sign("24.99")
+        # Inside its own period, by key id, and after the rotation through the fallback
+        self.assertTrue(self.ring.verify(signature, "24.99", time_period=50))
+        self.assertTrue(self.ring.verify(signature, "24.99", key_id="old"))
+        self.assertTrue(self.ring.verify(signature, "24.99", time_period=150))
+        self.assertTrue(self.ring.verify(self.new.sign("24.99"), "24.99", time_period=150))
+        self.assertFalse(self.ring.verify(signature, "25.00", time_period=150))
+        stats = self.ring.stats()
+        self.assertEqual(stats["keys"]["old"], {"hits": 3, "fallback_hits": 1})
+        self.assertEqual(stats["keys"]["new"], {"hits": 1, "fallback_hits": 0})
+        self.assertEqual(stats["rejected"], 1)
+        # 1 + 1 + 2 + 1 tries for the matches, 2 for the rejected packet
+        self.assertEqual(stats["tries_per_packet"], 7 / 5)
+
+    def test_key_ids_must_be_unique(self):
+        with self.assertRaises(ValueError):
+            KeyRing("hmac_sha256", {}, [{"id": "a", "secret_key": "x"}, {"id": "a", "secret_key": "y"}])
+        with self.assertRaises(ValueError):
+            KeyRing("hmac_sha256", {}, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
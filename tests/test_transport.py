@@ -0,0 +1,129 @@
+import queue
+import sys
+import threading
+import unittest
+import multiprocessing as mp
+from unittest import mock
+from core.transport import QueueFactory, TRANSPORTS, resolve_transport
+
+
+def produce(q, count):
+    for i in range(count):
+        q.put(i)
+    q.put(None)
+
+
+class ResolveTransportTest(unittest.TestCase):
+    def test_explicit_names_pass_through(self):
+        for name in TRANSPORTS:
+            self.assertEqual(resolve_transport(name), name)
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            resolve_transport("carrier_pigeon")
+
+    def test_auto(self):
+        with mock.patch.object(sys, "platform", "linux"):
+            self.assertEqual(resolve_transport("auto", "fork"), "shared_memory")
+            self.assertEqual(resolve_transport("auto", "spawn"), "pipe")
+            self.assertEqual(resolve_transport("auto", "forkserver"), "pipe")
+        with mock.patch.object(sys, "platform", "darwin"):
+            self.assertEqual(resolve_transport("auto", "fork"), "manager")
+        with mock.patch.object(sys, "platform", "win32"):
+            self.assertEqual(resolve_transport("auto", "spawn"), "manager")
+
+
+class TransportTest(unittest.TestCase):
+    """Runs the same queue contract against every transport QueueFactory can create."""
+    def check_transport(self, name):
+        factory = QueueFactory(name, shm_slot_bytes=1024)
+        try:
+            q = factory.create(2)
+            self.assertEqual(q.qsize(), 0)
+            q.put({"_id": 0})
+            q.put([1, 2])
+            self.assertEqual(q.qsize(), 2)
+            with self.assertRaises(queue.Full):
+                q.put(3, timeout=0.05)
+            self.assertEqual(q.qsize(), 2)
+            self.assertEqual(q.get(), {"_id": 0})
+            self.assertEqual(q.get(timeout=1), [1, 2])
+            with self.assertRaises(queue.Empty):
+                q.get(timeout=0.05)
+            with self.assertRaises(queue.Empty):
+                q.get_nowait()
+            self.assertEqual(q.qsize(), 0)
+
+            producer = mp.get_context("fork").Process(target=produce, args=(q, 50))
+            producer.start()
+            received = []
+            while True:
+                item = q.get(timeout=10)
+                if item is None:
+                    break
+                received.append(item)
+            producer.join()
+            self.assertEqual(received, list(range(50)))
+        finally:
+            factory.close()
+
+    def test_manager(self):
+        self.check_transport("manager")
+
+    def test_mp_queue(self):
+        self.check_transport("mp_queue")
+
+    def test_simple_queue(self):
+        self.check_transport("simple_queue")
+
+    def test_pipe(self):
+        self.check_transport("pipe")
+
+    def test_shared_memory(self):
+        self.check_transport("shared_memory")
+
+
+class CountedTransportTest(unittest.TestCase):
+    def test_size_never_goes_negative(self):
+        factory = QueueFactory("pipe")
+        q = factory.create(4)
+        sizes = []
+        consumed = threading.Event()
+        real_put = q._put
+
+        def slow_put(obj, block, timeout):
+            # The producer stalls right after sending, until the consumer is done with the item
+            real_put(obj, block, timeout)
+            consumed.wait(5)
+
+        def consume():
+            q.get()
+            sizes.append(q.qsize())
+            consumed.set()
+
+        q._put = slow_put
+        try:
+            consumer = threading.Thread(target=consume)
+            consumer.start()
+            q.put(1)
+            consumer.join(5)
+            self.assertEqual(sizes, [0])
+            self.assertEqual(q.qsize(), 0)
+        finally:
+            factory.close()
+
+    def test_full_put_rolls_back_the_count(self):
+        factory = QueueFactory("simple_queue")
+        q = factory.create(1)
+        try:
+            q.put(0)
+            with self.assertRaises(queue.Full):
+                q.put_nowait(1)
+            self.assertEqual(q.qsize(), 1)
+            self.assertTrue(q.full())
+        finally:
+            factory.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import hashlib
+import unittest
+import multiprocessing as mp
+from core.verify_cache import VerificationCache
+
+
+def digest_of(value):
+    return hashlib.sha256(value.encode()).digest()
+
+
+def hammer(cache, worker, rounds):
+    for i in range(rounds):
+        value = str((worker * 7 + i) % 50)
+        if cache.get(value, "key", 1000) is None:
+            cache.put(value, "key", 1000, digest_of(value))
+
+
+class VerificationCacheTest(unittest.TestCase):
+    def make(self, capacity):
+        cache = VerificationCache(capacity)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_miss_then_hit(self):
+        cache = self.make(64)
+        self.assertIsNone(cache.get("24.99", "key", 1000))
+        cache.put("24.99", "key", 1000, digest_of("24.99"))
+        self.assertEqual(cache.get("24.99", "key", 1000), digest_of("24.99"))
+        # Key and variant are part of the entry
+        self.assertIsNone(cache.get("24.99", "other", 1000))
+        self.assertIsNone(cache.get("24.99", "key", 2000))
+
+    def test_digest_lengths(self):
+        cache = self.make(64)
+        for size in (1, 16, 32, 64):
+            digest = bytes(range(size))
+            cache.put(f"v{size}", "key", "blake2b", digest)
+            self.assertEqual(cache.get(f"v{size}", "key", "blake2b"), digest)
+
+    def test_capacity_rounds_up_to_whole_sets(self):
+        cache = self.make(10)
+        self.assertEqual(cache.sets, 2)
+        self.assertEqual(cache.capacity, 16)
+
+    def test_clock_eviction_gives_referenced_entries_a_second_chance(self):
+        cache = self.make(8)  # a single set of 8 ways
+        for i in range(8):
+            cache.put(str(i), "key", 1, digest_of(str(i)))
+        # Every entry was referenced: the hand clears all bits and evicts way 0
+        cache.put("8", "key", 1, digest_of("8"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertIsNone(cache.get("0", "key", 1))
+        # Touch "1", the next in line; "2" is evicted instead
+        self.assertIsNotNone(cache.get("1", "key", 1))
+        cache.put("9", "key", 1, digest_of("9"))
+        self.assertIsNotNone(cache.get("1", "key", 1))
+        self.assertIsNone(cache.get("2", "key", 1))
+        for value in ("3", "4", "5", "6", "7", "8", "9"):
+            self.assertEqual(cache.get(value, "key", 1), digest_of(value))
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_put_of_a_present_entry_does_not_evict(self):
+        cache = self.make(8)
+        for i in range(8):
+            cache.put(str(i), "key", 1, digest_of(str(i)))
+        cache.put("3", "key", 1, digest_of("3"))
+        self.assertEqual(cache.stats()["evictions"], 0)
+
+    def test_hit_rate(self):
+        cache = self.make(64)
+        self.assertEqual(cache.stats()["hit_rate"], 0.0)
+        cache.get("1.0", "key", 1)
+        cache.put("1.0", "key", 1, digest_of("1.0"))
+        for _ in range(3):
+            cache.get("1.0", "key", 1)
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 1, "evictions": 0, "hit_rate": 0.75})
+
+    def test_workers_share_entries_and_counters(self):
+        cache = self.make(4096)
+        self.assertEqual(cache.stripes, 64)
+        ctx = mp.get_context("fork")
+        workers = [ctx.Process(target=hammer, args=(cache, w, 500)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stats = cache.stats()
+        # Per-stripe counters under the stripe lock lose no update
+        self.assertEqual(stats["hits"] + stats["misses"], 4 * 500)
+        # 50 distinct values: at most one miss per value and worker
+        self.assertLessEqual(stats["misses"], 4 * 50)
+        self.assertEqual(stats["evictions"], 0)
+        for i in range(50):
+            self.assertEqual(cache.get(str(i), "key", 1000), digest_of(str(i)))
+
+
+if __name__ == "__main__":
+    unittest.main()
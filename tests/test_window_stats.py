@@ -0,0 +1,88 @@
+import math
+import random
+import statistics
+import unittest
+from core.window_stats import WindowStats, STATISTICS
+
+
+def reference(values, size):
+    window = values[-size:]
+    n = len(window)
+    variance = statistics.variance(window) if n > 1 else 0.0
+    return {
+        "mean": math.fsum(window) / n,
+        "variance": variance,
+        "std": math.sqrt(variance),
+        "min": min(window),
+        "max": max(window),
+        "count": n,
+    }
+
+
+class WindowStatsTest(unittest.TestCase):
+    def check_stream(self, values, sizes, rel=1e-9, abs_tol=1e-9):
+        stats = WindowStats(sizes, STATISTICS)
+        for i, x in enumerate(values):
+            stats.push(x)
+            record = stats.record()
+            for size in sizes:
+                expected = reference(values[:i + 1], size)
+                got = record[str(size)]
+                self.assertEqual(got["count"], expected["count"])
+                # min/max come straight from the deques: exact
+                self.assertEqual(got["min"], expected["min"])
+                self.assertEqual(got["max"], expected["max"])
+                for name in ("mean", "variance", "std"):
+                    self.assertTrue(math.isclose(got[name], expected[name], rel_tol=rel, abs_tol=abs_tol),
+                                    f"{name} of window {size} after {i + 1} values: {got[name]} != {expected[name]}")
+                self.assertEqual(stats.mean(size), got["mean"])
+
+    def test_random_stream_matches_brute_force(self):
+        rng = random.Random(7)
+        values = [rng.uniform(-50, 50) for _ in range(400)]
+        self.check_stream(values, [1, 2, 7, 50])
+
+    def test_ties_and_monotonic_runs(self):
+        # Equal values and long rising/falling runs exercise the deque pops and expiry
+        values = [3.0] * 10 + [float(i) for i in range(20)] + [float(-i) for i in range(20)] + [5.0, 5.0, 1.0, 5.0]
+        self.check_stream(values, [1, 3, 8])
+
+    def test_no_drift_on_a_large_offset(self):
+        # Small variations on a huge mean: a plain running sum/M2 loses them
+        rng = random.Random(11)
+        values = [1e9 + rng.uniform(-1, 1) for _ in range(3000)]
+        self.check_stream(values[:300], [10, 100], rel=1e-9, abs_tol=1e-6)
+        stats = WindowStats([10, 100])
+        for x in values:
+            stats.push(x)
+        for size in (10, 100):
+            expected = reference(values, size)
+            self.assertTrue(math.isclose(stats.mean(size), expected["mean"], rel_tol=1e-15))
+            got = stats.record()[str(size)]
+            self.assertTrue(math.isclose(got["std"], expected["std"], rel_tol=1e-6))
+
+    def test_cancellation_is_compensated(self):
+        # 1e16 + 1 - 1e16 in a plain float sum gives 0, Neumaier keeps the 1
+        stats = WindowStats([3], ("mean",))
+        for x in (1e16, 1.0, -1e16):
+            stats.push(x)
+        self.assertEqual(stats.record()["3"]["mean"], 1 / 3)
+        stats.push(2.0)
+        self.assertEqual(stats.record()["3"]["mean"], math.fsum([1.0, -1e16, 2.0]) / 3)
+
+    def test_record_subset_and_validation(self):
+        stats = WindowStats([5, 2], ("count", "max"))
+        self.assertEqual(stats.sizes, [2, 5])
+        for x in (1.0, 4.0, 2.0):
+            stats.push(x)
+        self.assertEqual(stats.record([5]), {"5": {"count": 3, "max": 4.0}})
+        self.assertEqual(stats.record(), {"2": {"count": 2, "max": 4.0}, "5": {"count": 3, "max": 4.0}})
+        for sizes in ([], [0], [2.5], [True]):
+            with self.assertRaises(ValueError):
+                WindowStats(sizes)
+        with self.assertRaises(ValueError):
+            WindowStats([3], ("median",))
+
+
+if __name__ == "__main__":
+    unittest.main()